@@ -1,8 +1,11 @@
 import collections
-from itertools import chain
+from collections import OrderedDict
+from itertools import chain, islice
 from functools import partial, wraps
+from numbers import Integral
 import os.path
 from pprint import pformat
+import threading
 import warnings
 import textwrap
 
@@ -500,6 +503,249 @@ class doc_inherit(object):
         return func
 
 
+def _invoke(f):
+    # Defined at module level so that process pools are able to pickle it
+    return f()
+
+
+def _worker_pool(n_workers=None, backend='thread'):
+    r"""
+    Create a pool of workers using either threads or processes.
+
+    Parameters
+    ----------
+    n_workers : `int` or ``None``, optional
+        The number of workers in the pool. If ``None``, the number of CPUs
+        on this machine is used.
+    backend : ``{'thread', 'process'}``, optional
+        Whether the pool is made of threads or of processes.
+
+    Returns
+    -------
+    pool : `multiprocessing.pool.Pool`
+        The pool of workers. It is the responsibility of the caller to
+        terminate the pool.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    """
+    if backend == 'thread':
+        from multiprocessing.pool import ThreadPool
+        return ThreadPool(n_workers)
+    elif backend == 'process':
+        from multiprocessing import Pool
+        return Pool(n_workers)
+    else:
+        raise ValueError("backend must be one of 'thread' or 'process' "
+                         "({} provided)".format(backend))
+
+
+def _prefetch_callables(callables, n_workers=None, backend='thread',
+                        lookahead=None):
+    r"""
+    Invoke the given callables on a pool of workers, yielding the results in
+    order. At most ``lookahead`` callables are in flight at any one time, which
+    bounds the memory used by results that have been computed but not yet
+    consumed.
+
+    Parameters
+    ----------
+    callables : `iterable` of `callable`
+        The callables to invoke. Each is called without arguments.
+    n_workers : `int` or ``None``, optional
+        The number of workers. If ``None``, the number of CPUs on this
+        machine is used.
+    backend : ``{'thread', 'process'}``, optional
+        Whether the callables are invoked on threads or on processes. If
+        ``'process'``, the callables (and their results) must be picklable.
+    lookahead : `int` or ``None``, optional
+        The maximum number of callables that are evaluated ahead of the
+        consumer. If ``None``, twice the number of workers is used.
+
+    Returns
+    -------
+    results : `generator`
+        Generator yielding the result of each callable, in the order of
+        ``callables``.
+
+    Raises
+    ------
+    ValueError
+        If ``backend`` is unknown or ``n_workers`` or ``lookahead`` are not
+        positive.
+    """
+    if backend not in {'thread', 'process'}:
+        raise ValueError("backend must be one of 'thread' or 'process' "
+                         "({} provided)".format(backend))
+    if n_workers is None:
+        from multiprocessing import cpu_count
+        n_workers = cpu_count()
+    elif n_workers < 1:
+        raise ValueError('n_workers must be positive '
+                         '({} provided)'.format(n_workers))
+    if lookahead is None:
+        lookahead = 2 * n_workers
+    elif lookahead < 1:
+        raise ValueError('lookahead must be positive '
+                         '({} provided)'.format(lookahead))
+
+    def prefetcher(callables):
+        # The pool is only created once iteration begins so that a generator
+        # that is never consumed does not leak workers
+        pool = _worker_pool(n_workers=n_workers, backend=backend)
+        pending = collections.deque()
+        try:
+            for f in islice(callables, lookahead):
+                pending.append(pool.apply_async(_invoke, (f,)))
+            while pending:
+                result = pending.popleft().get()
+                # Top up the queue before handing back control so that the
+                # workers stay busy whilst the consumer handles the result
+                for f in islice(callables, 1):
+                    pending.append(pool.apply_async(_invoke, (f,)))
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
+
+    return prefetcher(iter(callables))
+
+
+def _estimate_nbytes(x, _visited=None):
+    r"""
+    Estimate the number of bytes consumed by the numpy arrays held by an
+    object. Arrays are found by walking the object's ``__dict__`` along with
+    any dictionaries, lists and tuples found within it.
+    """
+    if _visited is None:
+        _visited = set()
+    if id(x) in _visited:
+        return 0
+    _visited.add(id(x))
+    nbytes = getattr(x, 'nbytes', None)
+    if isinstance(nbytes, Integral):
+        return nbytes
+    if isinstance(x, dict):
+        children = list(x.values())
+    elif isinstance(x, (list, tuple)):
+        children = x
+    else:
+        children = list(getattr(x, '__dict__', {}).values())
+    return sum(_estimate_nbytes(c, _visited=_visited) for c in children)
+
+
+class LRUCache(object):
+    r"""
+    A thread-safe, least recently used cache of the results of callables.
+    Entries are evicted when either the number of cached items or the
+    estimated number of bytes they consume exceeds the given limits.
+
+    The number of cache hits and misses are recorded so that the
+    effectiveness of the cache can be monitored.
+
+    Parameters
+    ----------
+    max_items : `int` or ``None``, optional
+        The maximum number of items to hold. If ``None``, the number of items
+        is unbounded.
+    max_bytes : `int` or ``None``, optional
+        The maximum number of bytes (as estimated from the numpy arrays held
+        by each item) to hold. Items larger than this are never cached. If
+        ``None``, the number of bytes is unbounded.
+
+    Raises
+    ------
+    ValueError
+        If ``max_items`` or ``max_bytes`` are negative.
+    """
+
+    def __init__(self, max_items=None, max_bytes=None):
+        if max_items is not None and max_items < 0:
+            raise ValueError('max_items must be non-negative '
+                             '({} provided)'.format(max_items))
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError('max_bytes must be non-negative '
+                             '({} provided)'.format(max_bytes))
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def n_items(self):
+        r"""
+        The number of items currently held in the cache.
+
+        :type: `int`
+        """
+        return len(self._entries)
+
+    def get(self, key, f):
+        r"""
+        Return the cached result for ``key``, invoking ``f`` and caching its
+        result if it is not present.
+
+        Parameters
+        ----------
+        key : `hashable`
+            The key the result of ``f`` is stored under.
+        f : `callable`
+            Callable taking no arguments whose result is cached.
+
+        Returns
+        -------
+        result : `object`
+            The (possibly cached) result of ``f``.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                # Re-insert to mark as the most recently used entry
+                entry = self._entries.pop(key)
+                self._entries[key] = entry
+                return entry[0]
+            self.misses += 1
+        # Invoke outside the lock so that concurrent misses can proceed in
+        # parallel
+        result = f()
+        nbytes = _estimate_nbytes(result)
+        with self._lock:
+            if ((self.max_bytes is not None and nbytes > self.max_bytes) or
+                    self.max_items == 0 or key in self._entries):
+                return result
+            self._entries[key] = (result, nbytes)
+            self.n_bytes += nbytes
+            self._evict()
+        return result
+
+    def _evict(self):
+        while ((self.max_items is not None and
+                len(self._entries) > self.max_items) or
+               (self.max_bytes is not None and self.n_bytes > self.max_bytes)):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.n_bytes -= nbytes
+
+    def clear(self):
+        r"""
+        Remove all items from the cache and reset the hit and miss counts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.n_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __str__(self):
+        return ('LRUCache holding {} items ({} bytes) - {} hits, '
+                '{} misses'.format(self.n_items, self.n_bytes, self.hits,
+                                   self.misses))
+
+
 class LazyList(collections.Sequence, Copyable):
     r"""
     An immutable sequence that provides the ability to lazily access objects.
@@ -661,6 +907,107 @@ class LazyList(collections.Sequence, Copyable):
         new._callables = list(chain(*zip(*[new._callables] * n)))
         return new
 
+    def prefetch(self, n_workers=None, backend='thread', lookahead=None):
+        r"""
+        Iterate over this LazyList, evaluating upcoming items ahead of the
+        consumer on a pool of workers. Items are always returned in the order
+        of the list, and at most ``lookahead`` items are evaluated ahead of
+        the item currently being consumed, so memory remains bounded.
+
+        This is most useful when the underlying callables are expensive and
+        independent, for example decoding the images returned by
+        :map:`import_images`. To evaluate the entire list in parallel simply
+        wrap the returned generator in a Python `list`.
+
+        Parameters
+        ----------
+        n_workers : `int` or ``None``, optional
+            The number of workers used to evaluate items. If ``None``, the
+            number of CPUs on this machine is used.
+        backend : ``{'thread', 'process'}``, optional
+            If ``'thread'``, items are evaluated on a pool of threads. This is
+            only beneficial if the callables release the GIL (e.g. file IO
+            or image decoding). If ``'process'``, items are evaluated on a pool
+            of processes, in which case both the callables and the items they
+            return must be picklable.
+        lookahead : `int` or ``None``, optional
+            The maximum number of items that are evaluated ahead of the
+            consumer. If ``None``, twice the number of workers is used.
+
+        Returns
+        -------
+        items : `generator`
+            Generator yielding each item of this LazyList, in order.
+
+        Raises
+        ------
+        ValueError
+            If ``backend`` is unknown or ``n_workers`` or ``lookahead`` are
+            not positive.
+
+        Examples
+        --------
+        >>> images = menpo.io.import_images('./massive_image_db/*')
+        >>> for image in images.prefetch(n_workers=4):
+        >>>     image.view()
+        """
+        return _prefetch_callables(self._callables, n_workers=n_workers,
+                                   backend=backend, lookahead=lookahead)
+
+    def cached(self, max_items=None, max_bytes=None):
+        r"""
+        Create a new LazyList where the result of each callable is stored in a
+        shared, least recently used cache. Repeatedly indexing the same item
+        will therefore only invoke the underlying callable once, as long as the
+        item has not been evicted from the cache.
+
+        Items are evicted when either the number of cached items exceeds
+        ``max_items`` or the estimated memory consumed by the numpy arrays of
+        the cached items (e.g. the pixels of an :map:`Image` or the points of
+        a :map:`PointCloud`) exceeds ``max_bytes``. Note that items are
+        returned directly from the cache, so mutating a returned item will
+        also mutate the cached item.
+
+        The :map:`LRUCache` is available as the ``cache`` attribute of the
+        returned LazyList and records the number of cache hits and misses. The
+        cache is also shared by any LazyList derived from the returned list
+        (e.g. by slicing or mapping).
+
+        Parameters
+        ----------
+        max_items : `int` or ``None``, optional
+            The maximum number of items to cache. If ``None``, the number of
+            items is unbounded.
+        max_bytes : `int` or ``None``, optional
+            The maximum number of bytes to cache. If ``None``, the number of
+            bytes is unbounded.
+
+        Returns
+        -------
+        lazy : `LazyList`
+            A new LazyList where each element is cached.
+
+        Raises
+        ------
+        ValueError
+            If ``max_items`` or ``max_bytes`` are negative.
+
+        Examples
+        --------
+        >>> images = menpo.io.import_images('./image_db/*')
+        >>> images = images.cached(max_bytes=2 * 1024 ** 3)
+        >>> for epoch in range(10):
+        >>>     for image in images:  # images are only imported once
+        >>>         train(image)
+        >>> print(images.cache)
+        """
+        cache = LRUCache(max_items=max_items, max_bytes=max_bytes)
+        new = self.copy()
+        new._callables = [partial(cache.get, i, f)
+                          for i, f in enumerate(new._callables)]
+        new.cache = cache
+        return new
+
     def copy(self):
         r"""
         Generate an efficient copy of this LazyList - copying the underlying
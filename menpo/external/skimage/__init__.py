@@ -1,2 +1,2 @@
-from ._warps_cy import _warp_fast
+from ._warps_cy import _warp_fast, _warp_fast_multichannel
 from ._daisy import _daisy
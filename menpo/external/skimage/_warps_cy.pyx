@@ -5,10 +5,11 @@
 import numpy as np
 cimport numpy as cnp
 
+from libc.math cimport ceil, floor
 from .interpolation cimport (nearest_neighbour_interpolation,
                              bilinear_interpolation,
                              biquadratic_interpolation,
-                             bicubic_interpolation)
+                             bicubic_interpolation, coord_map)
 from menpo.cy_utils cimport dtype_from_memoryview
 
 
@@ -20,7 +21,7 @@ ctypedef fused IMAGE_TYPES:
 
 
 cdef inline void _matrix_transform(double x, double y, double* H, double *x_,
-                                   double *y_):
+                                   double *y_) nogil:
     """Apply a homography to a coordinate.
 
     Parameters
@@ -42,6 +43,29 @@ cdef inline void _matrix_transform(double x, double y, double* H, double *x_,
     y_[0] = yy / zz
 
 
+cdef inline Py_ssize_t _pixel_index(Py_ssize_t rows, Py_ssize_t cols,
+                                    Py_ssize_t r, Py_ssize_t c,
+                                    char mode) nogil:
+    """The offset of a pixel in an image, taking the wrapping mode into
+    consideration, or -1 if the pixel lies outside of the image in constant
+    mode (see ``get_pixel2d``).
+    """
+    if mode == 'C':
+        if (r < 0) or (r > rows - 1) or (c < 0) or (c > cols - 1):
+            return -1
+        else:
+            return r * cols + c
+    else:
+        return coord_map(rows, r, mode) * cols + coord_map(cols, c, mode)
+
+
+cdef inline IMAGE_TYPES _pixel_at(IMAGE_TYPES* image, Py_ssize_t index,
+                                  double cval) nogil:
+    if index < 0:
+        return <IMAGE_TYPES>cval
+    return image[index]
+
+
 def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
                int order=1, mode='constant', double cval=0):
     """Projective transformation (homography).
@@ -95,7 +119,7 @@ def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
     cdef char mode_c = ord(mode[0].upper())
 
     cdef IMAGE_TYPES (*interp_func)(IMAGE_TYPES*, Py_ssize_t, Py_ssize_t,
-                                    double, double, char, double)
+                                    double, double, char, double) nogil
     if order == 0:
         interp_func = nearest_neighbour_interpolation
     elif order == 1:
@@ -129,3 +153,138 @@ def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
                                         mode_c, cval)
 
     return np.asarray(out, dtype=dtype)
+
+
+def _warp_fast_multichannel(IMAGE_TYPES[:, :, :] image, cnp.ndarray H,
+                            output_shape=None, int order=1, mode='constant',
+                            double cval=0):
+    """Projective transformation (homography) of a multi-channel image.
+
+    Equivalent to calling :func:`_warp_fast` on every channel of the image,
+    but the source coordinate of each output pixel is computed only once and
+    all the channels are written into a single preallocated output. The GIL
+    is released while warping.
+
+    Parameters
+    ----------
+    image : 3-D array
+        Input image, with the channels on the first axis.
+    H : array of shape ``(3, 3)``
+        Transformation matrix H that defines the homography.
+    output_shape : tuple (rows, cols), optional
+        Shape of each channel of the output image (default None).
+    order : {0, 1, 2, 3}, optional
+        Order of interpolation::
+        * 0: Nearest-neighbor
+        * 1: Bi-linear (default)
+        * 2: Bi-quadratic
+        * 3: Bi-cubic
+    mode : {'constant', 'reflect', 'wrap', 'nearest'}, optional
+        How to handle values outside the image borders (default is constant).
+    cval : string, optional (default 0)
+        Used in conjunction with mode 'C' (constant), the value
+        outside the image boundaries.
+
+    Returns
+    -------
+    warped : array of shape ``(n_channels, rows, cols)``
+        The warped image.
+    """
+
+    cdef IMAGE_TYPES[:, :, ::1] img = np.ascontiguousarray(image)
+    cdef double[:, ::1] M = np.ascontiguousarray(H)
+    dtype = dtype_from_memoryview(image)
+
+    if mode not in ('constant', 'wrap', 'reflect', 'nearest'):
+        raise ValueError("Invalid mode specified.  Please use "
+                         "`constant`, `nearest`, `wrap` or `reflect`.")
+    cdef char mode_c = ord(mode[0].upper())
+
+    cdef IMAGE_TYPES (*interp_func)(IMAGE_TYPES*, Py_ssize_t, Py_ssize_t,
+                                    double, double, char, double) nogil
+    if order == 0:
+        interp_func = nearest_neighbour_interpolation
+    elif order == 1:
+        interp_func = bilinear_interpolation
+    elif order == 2:
+        interp_func = biquadratic_interpolation
+    elif order == 3:
+        interp_func = bicubic_interpolation
+    else:
+        raise ValueError('Order must be in the range [0, 3]')
+
+    cdef Py_ssize_t n_channels = img.shape[0]
+    cdef Py_ssize_t rows = img.shape[1]
+    cdef Py_ssize_t cols = img.shape[2]
+    cdef Py_ssize_t out_r, out_c
+    if output_shape is None:
+        out_r = rows
+        out_c = cols
+    else:
+        out_r = int(output_shape[0])
+        out_c = int(output_shape[1])
+
+    out_array = np.zeros((n_channels, out_r, out_c), dtype=dtype)
+    if n_channels == 0 or rows == 0 or cols == 0:
+        return out_array
+    cdef IMAGE_TYPES[:, :, ::1] out = out_array
+
+    cdef Py_ssize_t tfr, tfc, ch
+    cdef Py_ssize_t channel_stride = rows * cols
+    cdef IMAGE_TYPES *img_ptr
+    cdef IMAGE_TYPES *channel_ptr
+    cdef double top, bottom
+    # The source coordinates of a row of the output, shared by all channels
+    cdef double[::1] r = np.empty(out_c)
+    cdef double[::1] c = np.empty(out_c)
+    # For bilinear interpolation, the offsets of the 4 neighbouring pixels
+    # of each source coordinate, shared by all channels
+    cdef Py_ssize_t[:, ::1] neighbours = np.empty((out_c, 4), dtype=np.intp)
+    img_ptr = &img[0, 0, 0]
+
+    with nogil:
+        for tfr in range(out_r):
+            for tfc in range(out_c):
+                _matrix_transform(tfc, tfr, &M[0, 0], &c[tfc], &r[tfc])
+            if order == 1:
+                # Identical to bilinear_interpolation, but the neighbours and
+                # weights are only found once for all channels
+                for tfc in range(out_c):
+                    neighbours[tfc, 0] = _pixel_index(
+                        rows, cols, <Py_ssize_t>floor(r[tfc]),
+                        <Py_ssize_t>floor(c[tfc]), mode_c)
+                    neighbours[tfc, 1] = _pixel_index(
+                        rows, cols, <Py_ssize_t>floor(r[tfc]),
+                        <Py_ssize_t>ceil(c[tfc]), mode_c)
+                    neighbours[tfc, 2] = _pixel_index(
+                        rows, cols, <Py_ssize_t>ceil(r[tfc]),
+                        <Py_ssize_t>floor(c[tfc]), mode_c)
+                    neighbours[tfc, 3] = _pixel_index(
+                        rows, cols, <Py_ssize_t>ceil(r[tfc]),
+                        <Py_ssize_t>ceil(c[tfc]), mode_c)
+                    r[tfc] = r[tfc] - <Py_ssize_t>floor(r[tfc])
+                    c[tfc] = c[tfc] - <Py_ssize_t>floor(c[tfc])
+                for ch in range(n_channels):
+                    channel_ptr = img_ptr + ch * channel_stride
+                    for tfc in range(out_c):
+                        top = ((1 - c[tfc]) *
+                               _pixel_at(channel_ptr, neighbours[tfc, 0], cval)
+                               + c[tfc] *
+                               _pixel_at(channel_ptr, neighbours[tfc, 1], cval))
+                        bottom = ((1 - c[tfc]) *
+                                  _pixel_at(channel_ptr, neighbours[tfc, 2],
+                                            cval)
+                                  + c[tfc] *
+                                  _pixel_at(channel_ptr, neighbours[tfc, 3],
+                                            cval))
+                        out[ch, tfr, tfc] = <IMAGE_TYPES>(
+                            (1 - r[tfc]) * top + r[tfc] * bottom)
+            else:
+                for ch in range(n_channels):
+                    channel_ptr = img_ptr + ch * channel_stride
+                    for tfc in range(out_c):
+                        out[ch, tfr, tfc] = interp_func(
+                            channel_ptr, rows, cols, r[tfc], c[tfc], mode_c,
+                            cval)
+
+    return out_array
@@ -1,10 +1,11 @@
 from .features import (gradient, hog, lbp, es, igo, no_op, gaussian_filter,
                        daisy, normalize, normalize_norm, normalize_std,
-                       normalize_var, features_selection_widget)
+                       normalize_var, features_selection_widget,
+                       batch_gradient)
 # Optional dependencies may return nothing.
 from .optional import *
 
 from .predefined import sparse_hog, double_igo
 
-from .base import ndfeature, imgfeature
+from .base import ndfeature, imgfeature, batch_feature
 from .visualize import glyph, sum_channels
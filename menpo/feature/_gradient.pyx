@@ -11,23 +11,29 @@ ctypedef fused DOUBLE_TYPES:
 cdef extern from "cpp/central_difference.h":
     void central_difference[T](const T* input, const Py_ssize_t rows,
                                const Py_ssize_t cols, const Py_ssize_t n_channels,
-                               T* output)
+                               T* output) nogil
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef gradient_cython(np.ndarray[DOUBLE_TYPES, ndim=3] input):
+cpdef gradient_cython(np.ndarray[DOUBLE_TYPES, ndim=3] input, output=None):
 
     cdef Py_ssize_t n_channels = input.shape[0]
     cdef Py_ssize_t rows = input.shape[1]
     cdef Py_ssize_t cols = input.shape[2]
     # Maintain the dtype that was passed in (float or double)
     dtype = input.dtype
-    cdef np.ndarray[DOUBLE_TYPES, ndim=3] output = np.zeros((n_channels * 2,
-                                                            rows, cols),
-                                                            dtype=dtype)
-
-    central_difference(&input[0,0,0], rows, cols, n_channels,
-                       &output[0,0,0])
+    if output is None:
+        output = np.zeros((n_channels * 2, rows, cols), dtype=dtype)
+    elif output.shape != (n_channels * 2, rows, cols):
+        raise ValueError("The output must be of shape {}".format(
+            (n_channels * 2, rows, cols)))
+    # Any given output must be C contiguous and of the same dtype as the input
+    cdef DOUBLE_TYPES[:, :, ::1] coutput = output
+
+    # Release the GIL so that gradients can be computed concurrently
+    with nogil:
+        central_difference(&input[0,0,0], rows, cols, n_channels,
+                           &coutput[0,0,0])
 
     return output
@@ -1,6 +1,7 @@
 from __future__ import division
 from functools import wraps
 import numpy as np
+from menpo.base import _worker_pool
 from menpo.image import Image, MaskedImage, BooleanImage
 from menpo.transform import Translation, NonUniformScale
 
@@ -118,6 +119,10 @@ def winitfeature(wrapped):
 
     @wraps(wrapped)
     def wrapper(image, *args, **kwargs):
+        if kwargs.get('centres') is not None:
+            # descriptors at the given centres - there is no image to rebuild
+            pixels = image if isinstance(image, np.ndarray) else image.pixels
+            return wrapped(pixels, *args, **kwargs)[0]
         if not isinstance(image, np.ndarray):
             # Image supplied to ndarray feature -
             # extract pixels and go
@@ -128,3 +133,91 @@ def winitfeature(wrapped):
             return wrapped(image, *args, **kwargs)[0]
 
     return wrapper
+
+
+def _batch_pixels(images):
+    r"""
+    The pixels of each of a batch of equally sized images.
+    """
+    pixels = [getattr(i, 'pixels', i) for i in images]
+    if len(pixels) == 0:
+        raise ValueError("At least one image must be provided")
+    if any(p.shape != pixels[0].shape for p in pixels[1:]):
+        raise ValueError("All images must have the same shape")
+    return pixels
+
+
+def _map_batch(compute, indices, n_workers):
+    r"""
+    Call ``compute`` on each of the ``indices``, divided between
+    ``n_workers`` threads.
+    """
+    if n_workers < 1:
+        raise ValueError("Number of workers must be > 0")
+    if n_workers == 1:
+        for i in indices:
+            compute(i)
+    else:
+        pool = _worker_pool(n_workers=n_workers, backend='thread')
+        try:
+            pool.map(compute, indices)
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+def batch_feature(feature, images, n_workers=1, **kwargs):
+    r"""
+    Compute a feature for a batch of equally sized images, storing the
+    results in a single preallocated array.
+
+    Each image is passed to ``feature`` as an `ndarray` of pixels, so that no
+    intermediate feature images are built. The images are divided between
+    ``n_workers`` threads. The native features (e.g. :map:`gradient`,
+    :map:`hog` and :map:`lbp`) release the GIL, so they run concurrently.
+
+    Note that ``feature`` is still called once per image, rather than once
+    for the whole batch, and that each result is copied into the output
+    array. :map:`batch_gradient` avoids this copy for the gradient.
+
+    Parameters
+    ----------
+    feature : `callable`
+        The feature to compute, e.g. :map:`hog`. Must accept an
+        ``(C, X, Y, ..., Z)`` `ndarray` and return an `ndarray`.
+    images : ``(N, C, X, Y, ..., Z)`` `ndarray` or `list` of :map:`Image`
+        Either an array of stacked pixels or a list of images (or of pixel
+        arrays), all of the same shape.
+    n_workers : `int`, optional
+        The number of threads across which the images are divided.
+    kwargs : `dict`, optional
+        Keyword arguments passed to ``feature``.
+
+    Returns
+    -------
+    features : ``(N, C', X', Y', ..., Z')`` `ndarray`
+        The features of every image, stacked along the first axis.
+
+    Raises
+    ------
+    ValueError
+        At least one image must be provided
+    ValueError
+        All images must have the same shape
+    ValueError
+        Number of workers must be > 0
+    """
+    if n_workers < 1:
+        raise ValueError("Number of workers must be > 0")
+    pixels = _batch_pixels(images)
+
+    # The first feature tells us the shape and dtype of the output
+    first = feature(pixels[0], **kwargs)
+    output = np.empty((len(pixels),) + first.shape, dtype=first.dtype)
+    output[0] = first
+
+    def compute(i):
+        output[i] = feature(pixels[i], **kwargs)
+
+    _map_batch(compute, range(1, len(pixels)), n_workers)
+    return output
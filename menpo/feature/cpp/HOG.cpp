@@ -47,12 +47,51 @@ HOG::HOG(unsigned int windowHeight, unsigned int windowWidth,
     this->windowHeight = windowHeight;
     this->windowWidth = windowWidth;
     this->numberOfChannels = numberOfChannels;
+    this->gradientsHeight = 0;
+    this->gradientsWidth = 0;
 }
 
 HOG::~HOG() {
 }
 
 
+// Cache the gradients of the image that the windows are taken from, so that
+// they are not recomputed for every window that overlaps them. Only the
+// DalalTriggs method makes use of the cache.
+void HOG::cacheGradients(double *image, unsigned int imageHeight,
+                         unsigned int imageWidth) {
+    if (this->method != 1 || imageHeight < 2 || imageWidth < 2)
+        return;
+    this->gradients.resize(DALAL_TRIGGS_N_VARIANTS * imageHeight * imageWidth);
+    this->gradientsHeight = imageHeight;
+    this->gradientsWidth = imageWidth;
+    DalalTriggsGradients(image, this->numberOfOrientationBins,
+                         this->enableSignedGradients, imageHeight, imageWidth,
+                         this->numberOfChannels, &this->gradients[0]);
+}
+
+
+void HOG::applyAt(double *windowImage, int rowFrom, int columnFrom,
+                  double *descriptorVector) {
+    if (this->method == 1 && !this->gradients.empty())
+        DalalTriggsHOGdescriptorFromCache(windowImage, rowFrom, columnFrom,
+                                          &this->gradients[0],
+                                          this->gradientsHeight,
+                                          this->gradientsWidth,
+                                          this->numberOfOrientationBins,
+                                          this->cellHeightAndWidthInPixels,
+                                          this->blockHeightAndWidthInCells,
+                                          this->enableSignedGradients,
+                                          this->l2normClipping,
+                                          this->windowHeight,
+                                          this->windowWidth,
+                                          this->numberOfChannels,
+                                          descriptorVector);
+    else
+        apply(windowImage, descriptorVector);
+}
+
+
 void HOG::apply(double *windowImage, double *descriptorVector) {
     if (this->method == 1)
         DalalTriggsHOGdescriptor(windowImage, this->numberOfOrientationBins,
@@ -253,186 +292,195 @@ void ZhuRamananHOGdescriptor(double *inputImage,
 
 
 // DALAL & TRIGGS: Histograms of Oriented Gradients for Human Detection
-void DalalTriggsHOGdescriptor(double *inputImage,
-                              unsigned int numberOfOrientationBins,
-                              unsigned int cellHeightAndWidthInPixels,
-                              unsigned int blockHeightAndWidthInCells,
-                              bool signedOrUnsignedGradientsBool,
-                              double l2normClipping, unsigned int imageHeight,
-                              unsigned int imageWidth,
-                              unsigned int numberOfChannels,
-                              double *descriptorVector) {
-    
-    numberOfOrientationBins = (int)numberOfOrientationBins;
-    cellHeightAndWidthInPixels = (double)cellHeightAndWidthInPixels;
-    blockHeightAndWidthInCells = (int)blockHeightAndWidthInCells;
 
-    unsigned int signedOrUnsignedGradients;
-    
-    if (signedOrUnsignedGradientsBool) {
-        signedOrUnsignedGradients = 1;
-    } else {
-        signedOrUnsignedGradients = 0;
+// Compute the gradient of pixel (y, x) of an image, keeping the channel with
+// the largest magnitude. The image is treated as zero beyond the edges that
+// the pixel is flagged to lie on (e.g. leftEdge ignores the pixel to the left
+// of it). The orientation is returned as the two bins it is interpolated
+// between (bin1, bin2) and the weight of bin2 (oWeight).
+static inline void DalalTriggsPixelGradient(double *inputImage,
+                                            unsigned int y, unsigned int x,
+                                            bool leftEdge, bool rightEdge,
+                                            bool topEdge, bool bottomEdge,
+                                            unsigned int imageHeight,
+                                            unsigned int imageWidth,
+                                            unsigned int numberOfChannels,
+                                            unsigned int numberOfOrientationBins,
+                                            unsigned int signedOrUnsignedGradients,
+                                            double binsSize, float *dx,
+                                            float *dy,
+                                            float &gradientMagnitude,
+                                            int &bin1, unsigned int &bin2,
+                                            float &oWeight) {
+    float gradientOrientation, tempMagnitude;
+
+    if (leftEdge) {
+        for (unsigned int z = 0; z < numberOfChannels; z++)
+            dx[z] = inputImage[y + (x + 1) * imageHeight +
+                               z * imageHeight * imageWidth];
+    }
+    else {
+        if (rightEdge) {
+            for (unsigned int z = 0; z < numberOfChannels; z++)
+                dx[z] = -inputImage[y + (x - 1) * imageHeight +
+                                    z * imageHeight * imageWidth];
+        }
+        else {
+            for (unsigned int z = 0; z < numberOfChannels; z++)
+                dx[z] = inputImage[y + (x + 1) * imageHeight +
+                                   z * imageHeight * imageWidth] -
+                        inputImage[y + (x - 1) * imageHeight +
+                                   z * imageHeight * imageWidth];
+        }
     }
 
-    int hist1 = 2 + (imageHeight / cellHeightAndWidthInPixels);
-    int hist2 = 2 + (imageWidth / cellHeightAndWidthInPixels);
+    if (topEdge) {
+        for (unsigned int z = 0; z < numberOfChannels; z++)
+            dy[z] = -inputImage[y + 1 + x * imageHeight +
+                                z * imageHeight * imageWidth];
+    }
+    else {
+        if (bottomEdge) {
+            for (unsigned int z = 0; z < numberOfChannels; z++)
+                dy[z] = inputImage[y - 1 + x * imageHeight +
+                                   z * imageHeight * imageWidth];
+        }
+        else {
+            for (unsigned int z = 0; z < numberOfChannels; z++)
+                dy[z] = -inputImage[y + 1 + x * imageHeight +
+                                    z * imageHeight * imageWidth] +
+                         inputImage[y - 1 + x * imageHeight +
+                                    z * imageHeight * imageWidth];
+        }
+    }
 
-    double binsSize = (1 + (signedOrUnsignedGradients == 1)) *
-                      pi / numberOfOrientationBins;
+    // choose dominant channel based on magnitude
+    gradientMagnitude = sqrt(dx[0] * dx[0] + dy[0] * dy[0]);
+    gradientOrientation= atan2(dy[0], dx[0]);
+    if (numberOfChannels > 1) {
+        tempMagnitude = gradientMagnitude;
+        for (unsigned int cli = 1; cli < numberOfChannels; ++cli) {
+            tempMagnitude= sqrt(dx[cli] * dx[cli] + dy[cli] * dy[cli]);
+            if (tempMagnitude > gradientMagnitude) {
+                gradientMagnitude = tempMagnitude;
+                gradientOrientation = atan2(dy[cli], dx[cli]);
+            }
+        }
+    }
 
-    float *dx = new float[numberOfChannels];
-    float *dy = new float[numberOfChannels];
-    float gradientOrientation, gradientMagnitude, tempMagnitude, 
-          Xc, Yc, Oc, blockNorm;
-    int x1 = 0, x2 = 0, y1 = 0, y2 = 0, bin1 = 0, descriptorIndex = 0;
-    unsigned int x, y, i, j, k, bin2;
-
-    vector<vector<vector<double> > > h(hist1, vector<vector<double> >
-                                       (hist2, vector<double>
-                                        (numberOfOrientationBins, 0.0 ) ) );
-    vector<vector<vector<double> > > block(blockHeightAndWidthInCells, vector<vector<double> >
-                                           (blockHeightAndWidthInCells, vector<double>
-                                            (numberOfOrientationBins, 0.0) ) );
+    if (gradientOrientation < 0)
+        gradientOrientation += pi +
+                               (signedOrUnsignedGradients == 1) * pi;
 
-    //Calculate gradients (zero padding)
-    for(unsigned int y = 0; y < imageHeight; y++) {
-        for(unsigned int x = 0; x < imageWidth; x++) {
-            if (x == 0) {
-                for (unsigned int z = 0; z < numberOfChannels; z++)
-                    dx[z] = inputImage[y + (x + 1) * imageHeight +
-                                       z * imageHeight * imageWidth];
-            }
-            else {
-                if (x == imageWidth - 1) {
-                    for (unsigned int z = 0; z < numberOfChannels; z++)
-                        dx[z] = -inputImage[y + (x - 1) * imageHeight +
-                                            z * imageHeight * imageWidth];
-                }
-                else {
-                    for (unsigned int z = 0; z < numberOfChannels; z++)
-                        dx[z] = inputImage[y + (x + 1) * imageHeight +
-                                           z * imageHeight * imageWidth] -
-                                inputImage[y + (x - 1) * imageHeight +
-                                           z * imageHeight * imageWidth];
-                }
-            }
+    // orientation bins of the trilinear interpolation
+    bin1 = floor((gradientOrientation / binsSize) - 1);
+    bin2 = bin1 + 1;
 
-            if(y == 0) {
-                for (unsigned int z = 0; z < numberOfChannels; z++)
-                    dy[z] = -inputImage[y + 1 + x * imageHeight +
-                                        z * imageHeight * imageWidth];
-            }
-            else {
-                if (y == imageHeight - 1) {
-                    for (unsigned int z = 0; z < numberOfChannels; z++)
-                        dy[z] = inputImage[y - 1 + x * imageHeight +
-                                           z * imageHeight * imageWidth];
-                }
-                else {
-                    for (unsigned int z = 0; z < numberOfChannels; z++)
-                        dy[z] = -inputImage[y + 1 + x * imageHeight +
-                                            z * imageHeight * imageWidth] +
-                                 inputImage[y - 1 + x * imageHeight +
-                                            z * imageHeight * imageWidth];
-                }
-            }
+    if (bin2 >= numberOfOrientationBins)
+        bin2 = 0;
 
-            // choose dominant channel based on magnitude
-            gradientMagnitude = sqrt(dx[0] * dx[0] + dy[0] * dy[0]);
-            gradientOrientation= atan2(dy[0], dx[0]);
-            if (numberOfChannels > 1) {
-                tempMagnitude = gradientMagnitude;
-                for (unsigned int cli = 1; cli < numberOfChannels; ++cli) {
-                    tempMagnitude= sqrt(dx[cli] * dx[cli] + dy[cli] * dy[cli]);
-                    if (tempMagnitude > gradientMagnitude) {
-                        gradientMagnitude = tempMagnitude;
-                        gradientOrientation = atan2(dy[cli], dx[cli]);
-                    }
-                }
-            }
+    if (bin1 < 0)
+        bin1 = numberOfOrientationBins - 1;
 
-            if (gradientOrientation < 0)
-                gradientOrientation += pi +
-                                       (signedOrUnsignedGradients == 1) * pi;
-
-            // trilinear interpolation
-            bin1 = floor((gradientOrientation / binsSize) - 1);
-            bin2 = bin1 + 1;
-            x1   = x / cellHeightAndWidthInPixels;
-            x2   = x1 + 1;
-            y1   = y / cellHeightAndWidthInPixels;
-            y2   = y1 + 1;
-
-            if (bin2 >= numberOfOrientationBins)
-                bin2 = 0;
-
-            if (bin1 < 0)
-                bin1 = numberOfOrientationBins - 1;
-
-            float orientationFrac = (gradientOrientation / binsSize) - 1;
-            if (orientationFrac < 0)
-                orientationFrac += numberOfOrientationBins;
-
-            float xWeight = ((x / (float)cellHeightAndWidthInPixels)) - x1;
-            float yWeight = ((y / (float)cellHeightAndWidthInPixels)) - y1;
-            float oWeight = orientationFrac - bin1;
-
-            h[y1][x1][bin1] = h[y1][x1][bin1] + gradientMagnitude *
-                              (1-xWeight) *
-                              (1-yWeight) *
-                              (1-oWeight);
-            h[y1][x1][bin2] = h[y1][x1][bin2] + gradientMagnitude *
-                              (1-xWeight) *
-                              (1-yWeight) *
-                              (oWeight);
-            h[y2][x1][bin1] = h[y2][x1][bin1] + gradientMagnitude *
-                              (1-xWeight) *
-                              (yWeight) *
-                              (1-oWeight);
-            h[y2][x1][bin2] = h[y2][x1][bin2] + gradientMagnitude *
-                              (1-xWeight) *
-                              (yWeight) *
-                              (oWeight);
-            h[y1][x2][bin1] = h[y1][x2][bin1] + gradientMagnitude *
-                              (xWeight) *
-                              (1-yWeight) *
-                              (1-oWeight);
-            h[y1][x2][bin2] = h[y1][x2][bin2] + gradientMagnitude *
-                              (xWeight) *
-                              (1-yWeight) *
-                              (oWeight);
-            h[y2][x2][bin1] = h[y2][x2][bin1] + gradientMagnitude *
-                              (xWeight) *
-                              (yWeight) *
-                              (1-oWeight);
-            h[y2][x2][bin2] = h[y2][x2][bin2] + gradientMagnitude *
-                              (xWeight) *
-                              (yWeight) *
-                              (oWeight);
-        }
-    }
+    float orientationFrac = (gradientOrientation / binsSize) - 1;
+    if (orientationFrac < 0)
+        orientationFrac += numberOfOrientationBins;
+
+    oWeight = orientationFrac - bin1;
+}
+
+
+// The bin k of the histogram of cell (y, x), stored contiguously in h
+#define H(y, x, k) h[((y) * hist2 + (x)) * numberOfOrientationBins + (k)]
+
+
+// Add the gradient of pixel (y, x) to the histograms of the 4 cells around
+// it (trilinear interpolation).
+static inline void DalalTriggsAccumulate(double *h, int hist2,
+                                         unsigned int numberOfOrientationBins,
+                                         unsigned int y, unsigned int x,
+                                         unsigned int cellHeightAndWidthInPixels,
+                                         float gradientMagnitude, int bin1,
+                                         unsigned int bin2, float oWeight) {
+    int x1 = x / cellHeightAndWidthInPixels;
+    int x2 = x1 + 1;
+    int y1 = y / cellHeightAndWidthInPixels;
+    int y2 = y1 + 1;
+
+    float xWeight = ((x / (float)cellHeightAndWidthInPixels)) - x1;
+    float yWeight = ((y / (float)cellHeightAndWidthInPixels)) - y1;
+
+    H(y1, x1, bin1) = H(y1, x1, bin1) + gradientMagnitude *
+                      (1-xWeight) *
+                      (1-yWeight) *
+                      (1-oWeight);
+    H(y1, x1, bin2) = H(y1, x1, bin2) + gradientMagnitude *
+                      (1-xWeight) *
+                      (1-yWeight) *
+                      (oWeight);
+    H(y2, x1, bin1) = H(y2, x1, bin1) + gradientMagnitude *
+                      (1-xWeight) *
+                      (yWeight) *
+                      (1-oWeight);
+    H(y2, x1, bin2) = H(y2, x1, bin2) + gradientMagnitude *
+                      (1-xWeight) *
+                      (yWeight) *
+                      (oWeight);
+    H(y1, x2, bin1) = H(y1, x2, bin1) + gradientMagnitude *
+                      (xWeight) *
+                      (1-yWeight) *
+                      (1-oWeight);
+    H(y1, x2, bin2) = H(y1, x2, bin2) + gradientMagnitude *
+                      (xWeight) *
+                      (1-yWeight) *
+                      (oWeight);
+    H(y2, x2, bin1) = H(y2, x2, bin1) + gradientMagnitude *
+                      (xWeight) *
+                      (yWeight) *
+                      (1-oWeight);
+    H(y2, x2, bin2) = H(y2, x2, bin2) + gradientMagnitude *
+                      (xWeight) *
+                      (yWeight) *
+                      (oWeight);
+}
+
+
+// Normalize the blocks of cell histograms into the descriptor.
+static void DalalTriggsBlocks(double *h,
+                              int hist1, int hist2,
+                              unsigned int numberOfOrientationBins,
+                              unsigned int blockHeightAndWidthInCells,
+                              double l2normClipping,
+                              double *descriptorVector) {
+    float blockNorm;
+    int descriptorIndex = 0;
+    unsigned int x, y, i, j, k;
+
+    vector<double> block(blockHeightAndWidthInCells *
+                         blockHeightAndWidthInCells *
+                         numberOfOrientationBins, 0.0);
+#define BLOCK(i, j, k) block[((i) * blockHeightAndWidthInCells + (j)) * \
+                             numberOfOrientationBins + (k)]
 
-    //Block normalization
     for(x = 1; x < hist2 - blockHeightAndWidthInCells; x++) {
         for (y = 1; y < hist1 - blockHeightAndWidthInCells; y++) {
             blockNorm = 0;
             for (i = 0; i < blockHeightAndWidthInCells; i++)
                 for(j = 0; j < blockHeightAndWidthInCells; j++)
                     for(k = 0; k < numberOfOrientationBins; k++)
-                        blockNorm += h[y+i][x+j][k] * h[y+i][x+j][k];
+                        blockNorm += H(y+i, x+j, k) * H(y+i, x+j, k);
 
             blockNorm = sqrt(blockNorm);
             for (i = 0; i < blockHeightAndWidthInCells; i++) {
                 for(j = 0; j < blockHeightAndWidthInCells; j++) {
                     for(k = 0; k < numberOfOrientationBins; k++) {
                         if (blockNorm > 0) {
-                            block[i][j][k] = h[y+i][x+j][k] / blockNorm;
-                            if (block[i][j][k] > l2normClipping)
-                                block[i][j][k] = l2normClipping;
+                            BLOCK(i, j, k) = H(y+i, x+j, k) / blockNorm;
+                            if (BLOCK(i, j, k) > l2normClipping)
+                                BLOCK(i, j, k) = l2normClipping;
                         } 
                         else {
-                            block[i][j][k] = 0;
+                            BLOCK(i, j, k) = 0;
                         }
                     }
                 }
@@ -442,7 +490,7 @@ void DalalTriggsHOGdescriptor(double *inputImage,
             for (i = 0; i < blockHeightAndWidthInCells; i++)
                 for(j = 0; j < blockHeightAndWidthInCells; j++)
                     for(k = 0; k < numberOfOrientationBins; k++)
-                        blockNorm += block[i][j][k] * block[i][j][k];
+                        blockNorm += BLOCK(i, j, k) * BLOCK(i, j, k);
 
             blockNorm = sqrt(blockNorm);
             for (i = 0; i < blockHeightAndWidthInCells; i++) {
@@ -450,7 +498,7 @@ void DalalTriggsHOGdescriptor(double *inputImage,
                     for(k = 0; k < numberOfOrientationBins; k++) {
                         if (blockNorm > 0)
                             descriptorVector[descriptorIndex] =
-                                block[i][j][k] / blockNorm;
+                                BLOCK(i, j, k) / blockNorm;
                         else
                             descriptorVector[descriptorIndex] = 0.0;
                         descriptorIndex++;
@@ -459,6 +507,169 @@ void DalalTriggsHOGdescriptor(double *inputImage,
             }
         }
     }
+#undef BLOCK
+}
+#undef H
+
+
+void DalalTriggsHOGdescriptor(double *inputImage,
+                              unsigned int numberOfOrientationBins,
+                              unsigned int cellHeightAndWidthInPixels,
+                              unsigned int blockHeightAndWidthInCells,
+                              bool signedOrUnsignedGradientsBool,
+                              double l2normClipping, unsigned int imageHeight,
+                              unsigned int imageWidth,
+                              unsigned int numberOfChannels,
+                              double *descriptorVector) {
+    DalalTriggsHOGdescriptorFromCache(inputImage, 0, 0, NULL, 0, 0,
+                                      numberOfOrientationBins,
+                                      cellHeightAndWidthInPixels,
+                                      blockHeightAndWidthInCells,
+                                      signedOrUnsignedGradientsBool,
+                                      l2normClipping, imageHeight, imageWidth,
+                                      numberOfChannels, descriptorVector);
+}
+
+
+// Compute the gradients of every pixel of an image, as they are computed for
+// the pixels of a window by DalalTriggsHOGdescriptor. As the window is zero
+// padded, the pixels on its edges have one-sided gradients, so the gradients
+// are cached for pixels lying in the interior of a window
+// (DALAL_TRIGGS_INTERIOR) and on each of its edges. The gradients are
+// stored variant by variant, each as an imageHeight x imageWidth
+// (column-major) array.
+void DalalTriggsGradients(double *inputImage,
+                          unsigned int numberOfOrientationBins,
+                          bool signedOrUnsignedGradientsBool,
+                          unsigned int imageHeight, unsigned int imageWidth,
+                          unsigned int numberOfChannels,
+                          DalalTriggsGradient *gradients) {
+    unsigned int signedOrUnsignedGradients = signedOrUnsignedGradientsBool;
+    double binsSize = (1 + (signedOrUnsignedGradients == 1)) *
+                      pi / numberOfOrientationBins;
+    float *dx = new float[numberOfChannels];
+    float *dy = new float[numberOfChannels];
+
+    for (int v = 0; v < DALAL_TRIGGS_N_VARIANTS; v++) {
+        for(unsigned int x = 0; x < imageWidth; x++) {
+            for(unsigned int y = 0; y < imageHeight; y++) {
+                DalalTriggsGradient &g =
+                    gradients[(v * imageWidth + x) * imageHeight + y];
+                DalalTriggsPixelGradient(
+                    inputImage, y, x,
+                    x == 0 || v == DALAL_TRIGGS_LEFT_EDGE,
+                    x == imageWidth - 1 || v == DALAL_TRIGGS_RIGHT_EDGE,
+                    y == 0 || v == DALAL_TRIGGS_TOP_EDGE,
+                    y == imageHeight - 1 || v == DALAL_TRIGGS_BOTTOM_EDGE,
+                    imageHeight, imageWidth, numberOfChannels,
+                    numberOfOrientationBins, signedOrUnsignedGradients,
+                    binsSize, dx, dy, g.magnitude, g.bin1, g.bin2,
+                    g.oWeight);
+            }
+        }
+    }
+    delete[] dx;
+    delete[] dy;
+}
+
+
+// Compute the descriptor of the window whose top-left pixel is
+// (rowFrom, columnFrom) of an image with cached gradients (see
+// DalalTriggsGradients). The gradients of the pixels on the corners of the
+// window, or whose neighbours are outside of the image, are computed from the
+// window, all the others are read from the cache. The result is identical to
+// DalalTriggsHOGdescriptor, which is the case of no cache.
+void DalalTriggsHOGdescriptorFromCache(double *inputImage, int rowFrom,
+                                       int columnFrom,
+                                       const DalalTriggsGradient *gradients,
+                                       unsigned int gradientsHeight,
+                                       unsigned int gradientsWidth,
+                                       unsigned int numberOfOrientationBins,
+                                       unsigned int cellHeightAndWidthInPixels,
+                                       unsigned int blockHeightAndWidthInCells,
+                                       bool signedOrUnsignedGradientsBool,
+                                       double l2normClipping,
+                                       unsigned int imageHeight,
+                                       unsigned int imageWidth,
+                                       unsigned int numberOfChannels,
+                                       double *descriptorVector) {
+    unsigned int signedOrUnsignedGradients;
+    
+    if (signedOrUnsignedGradientsBool) {
+        signedOrUnsignedGradients = 1;
+    } else {
+        signedOrUnsignedGradients = 0;
+    }
+
+    int hist1 = 2 + (imageHeight / cellHeightAndWidthInPixels);
+    int hist2 = 2 + (imageWidth / cellHeightAndWidthInPixels);
+
+    double binsSize = (1 + (signedOrUnsignedGradients == 1)) *
+                      pi / numberOfOrientationBins;
+
+    float *dx = new float[numberOfChannels];
+    float *dy = new float[numberOfChannels];
+    float gradientMagnitude, oWeight;
+    int bin1 = 0, row, column, variant;
+    unsigned int bin2;
+    bool leftEdge, rightEdge, topEdge, bottomEdge;
+
+    vector<double> h(hist1 * hist2 * numberOfOrientationBins, 0.0);
+
+    //Calculate gradients (zero padding)
+    for(unsigned int y = 0; y < imageHeight; y++) {
+        for(unsigned int x = 0; x < imageWidth; x++) {
+            leftEdge = x == 0;
+            rightEdge = x == imageWidth - 1;
+            topEdge = y == 0;
+            bottomEdge = y == imageHeight - 1;
+            row = rowFrom + (int)y;
+            column = columnFrom + (int)x;
+
+            // Find which of the cached gradients this pixel has, if any
+            variant = -1;
+            if (gradients != NULL && row > 0 &&
+                row < (int)gradientsHeight - 1 && column > 0 &&
+                column < (int)gradientsWidth - 1) {
+                if (!leftEdge && !rightEdge && !topEdge && !bottomEdge)
+                    variant = DALAL_TRIGGS_INTERIOR;
+                else if (!topEdge && !bottomEdge)
+                    variant = leftEdge ? DALAL_TRIGGS_LEFT_EDGE :
+                              DALAL_TRIGGS_RIGHT_EDGE;
+                else if (!leftEdge && !rightEdge)
+                    variant = topEdge ? DALAL_TRIGGS_TOP_EDGE :
+                              DALAL_TRIGGS_BOTTOM_EDGE;
+            }
+
+            if (variant >= 0) {
+                const DalalTriggsGradient &g =
+                    gradients[(variant * gradientsWidth + column) *
+                              gradientsHeight + row];
+                gradientMagnitude = g.magnitude;
+                bin1 = g.bin1;
+                bin2 = g.bin2;
+                oWeight = g.oWeight;
+            }
+            else {
+                DalalTriggsPixelGradient(inputImage, y, x, leftEdge,
+                                         rightEdge, topEdge, bottomEdge,
+                                         imageHeight, imageWidth,
+                                         numberOfChannels,
+                                         numberOfOrientationBins,
+                                         signedOrUnsignedGradients, binsSize,
+                                         dx, dy, gradientMagnitude, bin1,
+                                         bin2, oWeight);
+            }
+            DalalTriggsAccumulate(&h[0], hist2, numberOfOrientationBins, y, x,
+                                  cellHeightAndWidthInPixels,
+                                  gradientMagnitude, bin1, bin2, oWeight);
+        }
+    }
+
+    //Block normalization
+    DalalTriggsBlocks(&h[0], hist1, hist2, numberOfOrientationBins,
+                      blockHeightAndWidthInCells, l2normClipping,
+                      descriptorVector);
     delete[] dx;
     delete[] dy;
 }
@@ -19,6 +19,22 @@ static inline double max(double x, double y) { return (x <= y ? y : x); }
 static inline int min(int x, int y) { return (x <= y ? x : y); }
 static inline int max(int x, int y) { return (x <= y ? y : x); }
 
+// The gradients that are cached per pixel, according to whether the pixel is
+// in the interior of a window or on one of its (zero padded) edges.
+enum {
+    DALAL_TRIGGS_INTERIOR, DALAL_TRIGGS_LEFT_EDGE, DALAL_TRIGGS_RIGHT_EDGE,
+    DALAL_TRIGGS_TOP_EDGE, DALAL_TRIGGS_BOTTOM_EDGE, DALAL_TRIGGS_N_VARIANTS
+};
+
+// The gradient of a pixel, as used by the DalalTriggs descriptor: its
+// magnitude and the two orientation bins it is interpolated between, with
+// the weight of the second bin.
+struct DalalTriggsGradient {
+    float magnitude, oWeight;
+    int bin1;
+    unsigned int bin2;
+};
+
 class HOG: public WindowFeature {
 public:
 	HOG(unsigned int windowHeight, unsigned int windowWidth,
@@ -29,6 +45,10 @@ public:
 	    double l2normClipping);
 	virtual ~HOG();
 	void apply(double *windowImage, double *descriptorVector);
+	void applyAt(double *windowImage, int rowFrom, int columnFrom,
+	             double *descriptorVector);
+	void cacheGradients(double *image, unsigned int imageHeight,
+	                    unsigned int imageWidth);
 	unsigned int descriptorLengthPerBlock, numberOfBlocksPerWindowHorizontally,
 	             numberOfBlocksPerWindowVertically;
 private:
@@ -37,6 +57,8 @@ private:
                  numberOfChannels;
     bool enableSignedGradients;
     double l2normClipping;
+    vector<DalalTriggsGradient> gradients;
+    unsigned int gradientsHeight, gradientsWidth;
 };
 
 void ZhuRamananHOGdescriptor(double *inputImage,
@@ -53,3 +75,23 @@ void DalalTriggsHOGdescriptor(double *inputImage,
                               unsigned int imageWidth,
                               unsigned int numberOfChannels,
                               double *descriptorVector);
+void DalalTriggsGradients(double *inputImage,
+                          unsigned int numberOfOrientationBins,
+                          bool signedOrUnsignedGradientsBool,
+                          unsigned int imageHeight, unsigned int imageWidth,
+                          unsigned int numberOfChannels,
+                          DalalTriggsGradient *gradients);
+void DalalTriggsHOGdescriptorFromCache(double *inputImage, int rowFrom,
+                                       int columnFrom,
+                                       const DalalTriggsGradient *gradients,
+                                       unsigned int gradientsHeight,
+                                       unsigned int gradientsWidth,
+                                       unsigned int numberOfOrientationBins,
+                                       unsigned int cellHeightAndWidthInPixels,
+                                       unsigned int blockHeightAndWidthInCells,
+                                       bool signedOrUnsignedGradientsBool,
+                                       double l2normClipping,
+                                       unsigned int imageHeight,
+                                       unsigned int imageWidth,
+                                       unsigned int numberOfChannels,
+                                       double *descriptorVector);
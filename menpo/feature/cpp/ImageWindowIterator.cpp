@@ -36,51 +36,45 @@ ImageWindowIterator::~ImageWindowIterator() {
 
 
 void ImageWindowIterator::apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature) {
-	int rowCenter, rowFrom, rowTo, columnCenter, columnFrom, columnTo, i, j, k;
+	apply(outputImage, windowsCenters, windowFeature, 0, _numberOfWindowsVertically);
+}
+
+
+// Compute the descriptors of the rows of windows in the range
+// [windowIndexVerticalFrom, windowIndexVerticalTo). Each call only writes
+// to the rows of the outputs that correspond to its range and uses its own
+// temporary buffers, so disjoint ranges can be computed concurrently.
+void ImageWindowIterator::apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+		unsigned int windowIndexVerticalFrom, unsigned int windowIndexVerticalTo) {
+	int rowCenter, rowFrom, columnCenter, columnFrom;
 	unsigned int windowIndexHorizontal, windowIndexVertical, d;
-	int imageHeight = (int)_imageHeight;
-	int imageWidth = (int)_imageWidth;
-	int numberOfChannels = (int)_numberOfChannels;
 
     // Initialize temporary matrices
 	double* windowImage = new double[_windowHeight*_windowWidth*_numberOfChannels];
 	double* descriptorVector = new double[windowFeature->descriptorLengthPerWindow];
 
     // Main loop
-    for (windowIndexVertical = 0; windowIndexVertical < _numberOfWindowsVertically; windowIndexVertical++) {
+    for (windowIndexVertical = windowIndexVerticalFrom; windowIndexVertical < windowIndexVerticalTo; windowIndexVertical++) {
         for (windowIndexHorizontal = 0; windowIndexHorizontal < _numberOfWindowsHorizontally; windowIndexHorizontal++) {
             // Find window limits
             if (!_enablePadding) {
                 rowFrom = windowIndexVertical*_windowStepVertical;
-                rowTo = rowFrom + _windowHeight - 1;
                 rowCenter = rowFrom + (int)round((double)_windowHeight / 2.0) - 1;
                 columnFrom = windowIndexHorizontal*_windowStepHorizontal;
-                columnTo = columnFrom + _windowWidth - 1;
                 columnCenter = columnFrom + (int)round((double)_windowWidth / 2.0) - 1;
             }
             else {
                 rowCenter = windowIndexVertical*_windowStepVertical;
                 rowFrom = rowCenter - (int)round((double)_windowHeight / 2.0) + 1;
-                rowTo = rowFrom + _windowHeight - 1;
                 columnCenter = windowIndexHorizontal*_windowStepHorizontal;
                 columnFrom = columnCenter - (int)ceil((double)_windowWidth / 2.0) + 1;
-                columnTo = columnFrom + _windowWidth - 1;
             }
 
             // Copy window image
-			for (i = rowFrom; i <= rowTo; i++) {
-				for (j = columnFrom; j <= columnTo; j++) {
-					if (i < 0 || i > imageHeight-1 || j < 0 || j > imageWidth-1)
-						for (k = 0; k < numberOfChannels; k++)
-							windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = 0;
-					else
-						for (k=0; k < numberOfChannels; k++)
-							windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = _image[i+imageHeight*(j+imageWidth*k)];
-				}
-			}
+            copyWindow(windowImage, rowFrom, columnFrom);
 
             // Compute descriptor of window
-            windowFeature->apply(windowImage, descriptorVector);
+            windowFeature->applyAt(windowImage, rowFrom, columnFrom, descriptorVector);
 
             // Store results
             for (d = 0; d < windowFeature->descriptorLengthPerWindow; d++)
@@ -95,3 +89,49 @@ void ImageWindowIterator::apply(double *outputImage, int *windowsCenters, Window
     delete[] descriptorVector;
 }
 
+
+// Compute the descriptors of the windows centred at the (row, column) pairs
+// of windowsCenters in the range [centerIndexFrom, centerIndexTo). The
+// windows are positioned exactly as in the padded case of apply, so the
+// descriptor of each centre is identical to the dense one at that pixel. The
+// descriptors are stored row-wise (C order) in outputDescriptors.
+void ImageWindowIterator::applyAtCenters(double *outputDescriptors, int *windowsCenters, WindowFeature *windowFeature,
+		unsigned int centerIndexFrom, unsigned int centerIndexTo) {
+	int rowFrom, columnFrom;
+	unsigned int c;
+	unsigned int descriptorLength = windowFeature->descriptorLengthPerWindow;
+
+	double* windowImage = new double[_windowHeight*_windowWidth*_numberOfChannels];
+
+	for (c = centerIndexFrom; c < centerIndexTo; c++) {
+		rowFrom = windowsCenters[2*c] - (int)round((double)_windowHeight / 2.0) + 1;
+		columnFrom = windowsCenters[2*c+1] - (int)ceil((double)_windowWidth / 2.0) + 1;
+		copyWindow(windowImage, rowFrom, columnFrom);
+		windowFeature->applyAt(windowImage, rowFrom, columnFrom, outputDescriptors + c*descriptorLength);
+	}
+
+	delete[] windowImage;
+}
+
+
+// Copy the window whose top-left pixel is (rowFrom, columnFrom) into
+// windowImage, filling the parts that fall outside the image with zeros.
+void ImageWindowIterator::copyWindow(double *windowImage, int rowFrom, int columnFrom) {
+	int i, j, k;
+	int imageHeight = (int)_imageHeight;
+	int imageWidth = (int)_imageWidth;
+	int numberOfChannels = (int)_numberOfChannels;
+	int rowTo = rowFrom + _windowHeight - 1;
+	int columnTo = columnFrom + _windowWidth - 1;
+
+	for (i = rowFrom; i <= rowTo; i++) {
+		for (j = columnFrom; j <= columnTo; j++) {
+			if (i < 0 || i > imageHeight-1 || j < 0 || j > imageWidth-1)
+				for (k = 0; k < numberOfChannels; k++)
+					windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = 0;
+			else
+				for (k=0; k < numberOfChannels; k++)
+					windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = _image[i+imageHeight*(j+imageWidth*k)];
+		}
+	}
+}
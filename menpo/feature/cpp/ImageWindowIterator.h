@@ -13,6 +13,11 @@ public:
 			unsigned int windowStepVertical, bool enablePadding);
 	virtual ~ImageWindowIterator();
 	void apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature);
+	void apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+	        unsigned int windowIndexVerticalFrom, unsigned int windowIndexVerticalTo);
+	void applyAtCenters(double *outputDescriptors, int *windowsCenters, WindowFeature *windowFeature,
+	        unsigned int centerIndexFrom, unsigned int centerIndexTo);
 private:
 	double *_image;
+	void copyWindow(double *windowImage, int rowFrom, int columnFrom);
 };
@@ -6,3 +6,11 @@ WindowFeature::WindowFeature() {
 
 WindowFeature::~WindowFeature() {
 }
+
+// Compute the descriptor of the window whose top-left pixel in the image is
+// (rowFrom, columnFrom). Features that cache computations over the whole
+// image can use the position, by default it is ignored.
+void WindowFeature::applyAt(double *windowImage, int rowFrom, int columnFrom,
+                            double *descriptorVector) {
+    apply(windowImage, descriptorVector);
+}
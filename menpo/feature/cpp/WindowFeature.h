@@ -9,5 +9,7 @@ public:
 	WindowFeature();
 	virtual ~WindowFeature();
 	virtual void apply(double *windowImage, double *descriptorVector) = 0;
+	virtual void applyAt(double *windowImage, int rowFrom, int columnFrom,
+	                     double *descriptorVector);
 	unsigned int descriptorLengthPerWindow;
 };
@@ -4,7 +4,8 @@ import warnings
 import numpy as np
 scipy_gaussian_filter = None  # expensive
 
-from .base import ndfeature, winitfeature, imgfeature
+from .base import (ndfeature, winitfeature, imgfeature, batch_feature,
+                   _batch_pixels, _map_batch)
 from ._gradient import gradient_cython
 from .windowiterator import WindowIterator, WindowIteratorResult
 
@@ -75,6 +76,52 @@ def gradient(pixels):
         return _np_gradient(pixels)
 
 
+def batch_gradient(images, n_workers=1):
+    r"""
+    Calculates the :map:`gradient` of a batch of equally sized images,
+    writing the gradient of each 2D image directly into a single
+    preallocated array rather than allocating and copying a result per image
+    (as :map:`batch_feature` does).
+
+    Parameters
+    ----------
+    images : ``(N, C, X, Y, ..., Z)`` `ndarray` or `list` of :map:`Image`
+        Either an array of stacked pixels or a list of images (or of pixel
+        arrays), all of the same shape.
+    n_workers : `int`, optional
+        The number of threads across which the images are divided.
+
+    Returns
+    -------
+    gradients : ``(N, 2 * C, X, Y)`` `ndarray`
+        The gradient of every image, stacked along the first axis. See
+        :map:`gradient` for the ordering of the channels.
+
+    Raises
+    ------
+    ValueError
+        At least one image must be provided
+    ValueError
+        All images must have the same shape
+    ValueError
+        Number of workers must be > 0
+    """
+    pixels = _batch_pixels(images)
+    dtype = pixels[0].dtype
+    if pixels[0].ndim != 3 or dtype not in (np.float32, np.float64):
+        # Only the native 2D gradient can write into the output
+        return batch_feature(gradient, pixels, n_workers=n_workers)
+    pixels = [np.require(p, dtype=dtype, requirements='C') for p in pixels]
+    output = np.empty((len(pixels), 2 * pixels[0].shape[0]) +
+                      pixels[0].shape[1:], dtype=dtype)
+
+    def compute(i):
+        gradient_cython(pixels[i], output=output[i])
+
+    _map_batch(compute, range(len(pixels)), n_workers)
+    return output
+
+
 @ndfeature
 def gaussian_filter(pixels, sigma):
     r"""
@@ -106,12 +153,23 @@ def gaussian_filter(pixels, sigma):
     return output
 
 
+def _centres_array(centres):
+    r"""
+    The ``(n_centres, 2)`` `ndarray` of window centres given either a
+    :map:`PointCloud` or an array, or ``None`` if ``centres`` is ``None``.
+    """
+    if centres is None:
+        return None
+    return np.asarray(getattr(centres, 'points', centres))
+
+
 @winitfeature
 def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         cell_size=8, block_size=2, signed_gradient=True, l2_norm_clip=0.2,
         window_height=1, window_width=1, window_unit='blocks',
         window_step_vertical=1, window_step_horizontal=1,
-        window_step_unit='pixels', padding=True, verbose=False):
+        window_step_unit='pixels', padding=True, verbose=False, n_threads=1,
+        centres=None, cache_gradients=None):
     r"""
     Extracts Histograms of Oriented Gradients (HOG) features from the input
     image.
@@ -182,6 +240,23 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         valid only for the ``dalaltriggs`` algorithm.
     verbose : `bool`, optional
         Flag to print HOG related information.
+    n_threads : `int`, optional
+        The number of threads across which the rows of windows (or the
+        ``centres``) are partitioned. The GIL is released while the
+        descriptors are computed, so other Python threads can run in the
+        meantime.
+    centres : :map:`PointCloud` or ``(n_centres, 2)`` `ndarray`, optional
+        If not ``None``, the descriptors are computed only for the windows
+        centred at these (rounded) pixel coordinates, rather than for every
+        window of the ``mode``. Each descriptor equals the one found at the
+        same location of the ``dense`` features image with ``padding=True``.
+    cache_gradients : `bool` or ``None``, optional
+        If ``True``, the gradients of every pixel of the image are computed
+        once, before the descriptors, rather than once for every window that
+        contains the pixel. This only applies to the ``dalaltriggs``
+        algorithm and is only worthwhile if the windows overlap. If ``None``,
+        the gradients are cached only when computing every window and the
+        windows cover the image more than once, and never for ``centres``.
 
     Returns
     -------
@@ -189,7 +264,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         The HOG features image. It has the same type as the input ``pixels``.
         The output number of channels in the case of ``dalaltriggs`` is
         ``K = num_bins * block_size *block_size`` and ``K = 31`` in the case of
-        ``zhuramanan``.
+        ``zhuramanan``. If ``centres`` is not ``None``, an
+        ``(n_centres, K)`` `ndarray` of descriptors is returned instead.
 
     Raises
     ------
@@ -217,6 +293,10 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         Vertical window step must be > 0
     ValueError
         Window step unit must be either pixels or cells
+    ValueError
+        Number of threads must be > 0
+    ValueError
+        The window centres must be an (n_centres, 2) array.
 
     References
     ----------
@@ -244,6 +324,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         raise ValueError("Block size (in cells) must be > 0")
     if l2_norm_clip <= 0.0:
         raise ValueError("Value for L2-norm clipping must be > 0.0")
+    if n_threads < 1:
+        raise ValueError("Number of threads must be > 0")
     if mode == 'dense':
         if window_unit not in ['pixels', 'blocks']:
             raise ValueError("Window unit must be either pixels or blocks")
@@ -317,7 +399,12 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         print(iterator)
     # Compute HOG
     hog_descriptor = iterator.HOG(algorithm, num_bins, cell_size, block_size,
-                                  signed_gradient, l2_norm_clip, verbose)
+                                  signed_gradient, l2_norm_clip, verbose,
+                                  n_threads=n_threads,
+                                  centres=_centres_array(centres),
+                                  cache_gradients=cache_gradients)
+    if centres is not None:
+        return hog_descriptor
     # TODO: This is a temporal fix
     # flip axis
     hog_descriptor = WindowIteratorResult(
@@ -603,7 +690,7 @@ def daisy(pixels, step=1, radius=15, rings=2, histograms=2, orientations=8,
 def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         window_step_vertical=1, window_step_horizontal=1,
         window_step_unit='pixels', padding=True, verbose=False,
-        skip_checks=False):
+        skip_checks=False, n_threads=1, centres=None):
     r"""
     Extracts Local Binary Pattern (LBP) features from the input image. The
     output image has ``N * C`` number of channels, where ``N`` is the number of
@@ -649,13 +736,24 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         Flag to print LBP related information.
     skip_checks : `bool`, optional
         If ``True``, do not perform any validation of the parameters.
+    n_threads : `int`, optional
+        The number of threads across which the rows of windows (or the
+        ``centres``) are partitioned. The GIL is released while the
+        descriptors are computed, so other Python threads can run in the
+        meantime.
+    centres : :map:`PointCloud` or ``(n_centres, 2)`` `ndarray`, optional
+        If not ``None``, the descriptors are computed only for the windows
+        centred at these (rounded) pixel coordinates. Each descriptor equals
+        the one found at the same location of the features image computed
+        with ``padding=True``.
 
     Returns
     -------
     lbp : :map:`Image` or subclass or ``(X, Y, ..., Z, C)`` `ndarray`
         The ES features image. It has the same type and shape as the input
         ``pixels``. The output number of channels is
-        ``C = len(radius) * len(samples)``.
+        ``C = len(radius) * len(samples)``. If ``centres`` is not ``None``,
+        an ``(n_centres, C)`` `ndarray` of descriptors is returned instead.
 
     Raises
     ------
@@ -677,6 +775,10 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         Vertical window step must be > 0
     ValueError
         Window step unit must be either pixels or window
+    ValueError
+        Number of threads must be > 0
+    ValueError
+        The window centres must be an (n_centres, 2) array.
 
     References
     ----------
@@ -729,6 +831,9 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
             raise ValueError("Window step unit must be either pixels or "
                              "window")
 
+        if n_threads < 1:
+            raise ValueError("Number of threads must be > 0")
+
     # Correct input image_data
     pixels = np.asfortranarray(pixels)
 
@@ -760,7 +865,11 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         print(iterator)
 
     # Compute LBP
-    lbp_descriptor = iterator.LBP(radius, samples, mapping_type, verbose)
+    lbp_descriptor = iterator.LBP(radius, samples, mapping_type, verbose,
+                                  n_threads=n_threads,
+                                  centres=_centres_array(centres))
+    if centres is not None:
+        return lbp_descriptor
 
     # TODO: This is a temporary fix
     # flip axis
@@ -9,8 +9,10 @@ from pytest import raises
 
 import menpo.io as mio
 from menpo.feature import (hog, lbp, es, igo, daisy, no_op, normalize,
-                           normalize_norm, normalize_std, normalize_var)
+                           normalize_norm, normalize_std, normalize_var,
+                           batch_feature, batch_gradient, gradient)
 from menpo.image import Image, MaskedImage
+from menpo.shape import PointCloud
 from menpo.testing import is_same_array
 
 
@@ -295,6 +297,52 @@ def test_lbp_values():
     assert_allclose(lbp_img.pixels, 4.)
 
 
+def test_hog_n_threads():
+    image = Image(np.random.randn(2, 73, 61))
+    for algorithm in ['dalaltriggs', 'zhuramanan']:
+        hog_img = hog(image, algorithm=algorithm, cell_size=4,
+                      window_step_vertical=3)
+        hog_img_threaded = hog(image, algorithm=algorithm, cell_size=4,
+                               window_step_vertical=3, n_threads=4)
+        assert_allclose(hog_img_threaded.pixels, hog_img.pixels)
+
+
+def test_lbp_n_threads():
+    image = Image(np.random.randn(1, 41, 37))
+    lbp_img = lbp(image, window_step_vertical=2)
+    # more threads than rows of windows
+    lbp_img_threaded = lbp(image, window_step_vertical=2, n_threads=64)
+    assert_allclose(lbp_img_threaded.pixels, lbp_img.pixels)
+
+
+def test_hog_n_threads_invalid():
+    with raises(ValueError):
+        hog(Image(np.random.randn(1, 30, 30)), n_threads=0)
+
+
+def test_hog_centres():
+    image = Image(np.random.randn(2, 40, 50))
+    dense = hog(image, cell_size=4).pixels
+    centres = np.array([[0, 0], [10, 20], [39, 49], [21.2, 7.8]])
+    descriptors = hog(image, cell_size=4, centres=centres)
+    assert descriptors.shape == (4, dense.shape[0])
+    assert_allclose(descriptors, dense[:, [0, 10, 39, 21], [0, 20, 49, 8]].T)
+
+
+def test_lbp_centres_pointcloud():
+    image = Image(np.random.randn(1, 30, 30))
+    dense = lbp(image.pixels, radius=2, samples=8)
+    centres = PointCloud(np.array([[5., 5.], [0., 29.], [17., 12.]]))
+    descriptors = lbp(image, radius=2, samples=8, centres=centres,
+                      n_threads=2)
+    assert_allclose(descriptors, dense[:, [5, 0, 17], [5, 29, 12]].T)
+
+
+def test_hog_centres_invalid():
+    with raises(ValueError):
+        hog(Image(np.random.randn(1, 30, 30)), centres=np.zeros((3, 3)))
+
+
 def test_constrain_landmarks():
     breaking_bad = mio.import_builtin_asset('breakingbad.jpg').as_masked()
     breaking_bad = breaking_bad.crop_to_landmarks(boundary=20)
@@ -434,3 +482,63 @@ def test_normalize_0_variance_warning():
                               mode='per_channel')
     assert_allclose(new_image.pixels[0], [[-0.75, -0.25], [0.25, 0.75]])
     assert_allclose(new_image.pixels[1], [[-1.5, -0.5], [0.5, 1.5]])
+
+
+def test_batch_feature_ndarray():
+    pixels = np.random.randn(4, 2, 20, 25)
+    features = batch_feature(igo, pixels, n_workers=2, double_angles=True)
+    assert features.shape == (4, 8, 20, 25)
+    for f, p in zip(features, pixels):
+        assert_allclose(f, igo(p, double_angles=True))
+
+
+def test_batch_feature_images():
+    images = [Image(np.random.randn(1, 30, 30)) for _ in range(3)]
+    features = batch_feature(hog, images, n_workers=3, cell_size=4)
+    for f, i in zip(features, images):
+        assert_allclose(f, hog(i, cell_size=4).pixels)
+
+
+def test_batch_gradient():
+    for dtype in [np.float32, np.float64]:
+        pixels = np.random.randn(3, 2, 20, 25).astype(dtype)
+        for n_workers in [1, 2]:
+            features = batch_gradient(pixels, n_workers=n_workers)
+            assert features.dtype == dtype
+            for f, p in zip(features, pixels):
+                assert_allclose(f, gradient(p))
+    # 3D images fall back to computing the gradient of each image in turn
+    pixels = np.random.randn(2, 1, 6, 7, 8)
+    assert_allclose(batch_gradient(pixels)[1], gradient(pixels[1]))
+
+
+def test_batch_feature_different_shapes():
+    images = [Image(np.random.randn(1, 30, 30)),
+              Image(np.random.randn(1, 30, 31))]
+    with raises(ValueError):
+        batch_feature(no_op, images)
+
+
+def test_hog_cached_gradients_identical():
+    from menpo.feature.windowiterator import WindowIterator
+    pixels = np.random.randn(30, 35, 3) * 255
+    pixels[:4, :] = 0  # exercise the signs of zero gradients
+    for padding, step in [(True, 1), (False, 3)]:
+        iterator = WindowIterator(pixels, 16, 16, step, step, padding)
+        for signed in [True, False]:
+            cached = iterator.HOG(1, 9, 8, 2, signed, 0.2, False,
+                                  cache_gradients=True)
+            uncached = iterator.HOG(1, 9, 8, 2, signed, 0.2, False,
+                                    cache_gradients=False)
+            assert_allclose(cached.pixels, uncached.pixels, rtol=0, atol=0)
+
+
+def test_hog_cache_gradients_option():
+    image = Image(np.random.randn(3, 40, 45))
+    centres = np.array([[10, 12], [20, 30]])
+    expected = hog(image, centres=centres, cache_gradients=False)
+    assert_allclose(hog(image, centres=centres), expected)
+    assert_allclose(hog(image, centres=centres, cache_gradients=True),
+                    expected)
+    assert_allclose(hog(image, cache_gradients=True).pixels,
+                    hog(image, cache_gradients=False).pixels)
@@ -1,3 +1,4 @@
+from threading import Thread
 import numpy as np
 cimport numpy as np
 from libcpp cimport bool
@@ -17,7 +18,15 @@ cdef extern from "cpp/ImageWindowIterator.h":
                             unsigned int windowStepVertical,
                             bool enablePadding)
         void apply(double *outputImage, int *windowsCenters,
-                   WindowFeature *windowFeature)
+                   WindowFeature *windowFeature) nogil
+        void apply(double *outputImage, int *windowsCenters,
+                   WindowFeature *windowFeature,
+                   unsigned int windowIndexVerticalFrom,
+                   unsigned int windowIndexVerticalTo) nogil
+        void applyAtCenters(double *outputDescriptors, int *windowsCenters,
+                            WindowFeature *windowFeature,
+                            unsigned int centerIndexFrom,
+                            unsigned int centerIndexTo) nogil
         unsigned int _numberOfWindowsHorizontally, \
             _numberOfWindowsVertically, _numberOfWindows, _imageWidth, \
             _imageHeight, _numberOfChannels, _windowHeight, _windowWidth, \
@@ -38,6 +47,8 @@ cdef extern from "cpp/HOG.h":
             unsigned int blockHeightAndWidthInCells,
             bool enableSignedGradients, double l2normClipping)
         void apply(double *windowImage, double *descriptorVector)
+        void cacheGradients(double *image, unsigned int imageHeight,
+                            unsigned int imageWidth) nogil
         unsigned int descriptorLengthPerBlock, \
             numberOfBlocksPerWindowHorizontally, \
             numberOfBlocksPerWindowVertically
@@ -54,6 +65,8 @@ cdef extern from "cpp/LBP.h":
 
 cdef class WindowIterator:
     cdef ImageWindowIterator* iterator
+    # The iterator only holds a pointer to the pixels, so keep them alive
+    cdef np.ndarray image
 
     def __cinit__(self, np.ndarray[np.float64_t, ndim=3] image,
                   unsigned int windowHeight, unsigned int windowWidth,
@@ -61,6 +74,7 @@ cdef class WindowIterator:
                   unsigned int windowStepVertical, bool enablePadding):
         cdef np.ndarray[np.float64_t, ndim=3, mode='fortran'] image_f = \
             np.require(image, requirements='F')
+        self.image = image_f
         self.iterator = new ImageWindowIterator(&image_f[0, 0, 0],
                                                 image.shape[0], image.shape[1],
                                                 image.shape[2], windowHeight,
@@ -73,6 +87,104 @@ cdef class WindowIterator:
             raise ValueError("The window-related options are wrong. "
                              "The number of windows is 0.")
 
+    def __dealloc__(self):
+        del self.iterator
+
+    def _apply_range(self, size_t output, size_t windowsCenters,
+                     size_t windowFeature, unsigned int indexFrom,
+                     unsigned int indexTo, bool atCenters):
+        # The pointers are passed as integers so that this can be the target
+        # of a Python thread
+        with nogil:
+            if atCenters:
+                self.iterator.applyAtCenters(
+                    <double *>output, <int *>windowsCenters,
+                    <WindowFeature *>windowFeature, indexFrom, indexTo)
+            else:
+                self.iterator.apply(
+                    <double *>output, <int *>windowsCenters,
+                    <WindowFeature *>windowFeature, indexFrom, indexTo)
+
+    cdef _apply(self, double *output, int *windowsCenters,
+                WindowFeature *windowFeature, unsigned int n_threads,
+                bool atCenters=False, unsigned int n_centres=0):
+        # Partition the rows of windows (or the centres) across n_threads
+        # threads. The GIL is released while the windows are computed, so the
+        # threads run concurrently (as do any other Python threads).
+        cdef unsigned int n = (n_centres if atCenters else
+                               self.iterator._numberOfWindowsVertically)
+        n_threads = max(1, min(n_threads, n))
+        bounds = np.linspace(0, n, n_threads + 1).astype(np.uint32)
+        args = [(<size_t>output, <size_t>windowsCenters,
+                 <size_t>windowFeature, bounds[i], bounds[i + 1], atCenters)
+                for i in range(n_threads)]
+        threads = [Thread(target=self._apply_range, args=a)
+                   for a in args[1:]]
+        for t in threads:
+            t.start()
+        # the calling thread computes the first partition itself
+        self._apply_range(*args[0])
+        for t in threads:
+            t.join()
+
+    cdef _apply_at_centres(self, WindowFeature *windowFeature, centres,
+                           unsigned int n_threads):
+        centres = np.require(np.round(centres), dtype=np.int32,
+                             requirements='C')
+        if centres.ndim != 2 or centres.shape[1] != 2:
+            raise ValueError("The window centres must be an (n_centres, 2) "
+                             "array.")
+        descriptors = np.zeros([centres.shape[0],
+                                windowFeature.descriptorLengthPerWindow])
+        cdef double[:, ::1] cdescriptors = descriptors
+        cdef int[:, ::1] ccentres = centres
+        if centres.shape[0] > 0:
+            self._apply(&cdescriptors[0, 0], &ccentres[0, 0], windowFeature,
+                        n_threads, atCenters=True,
+                        n_centres=centres.shape[0])
+        return WindowIteratorResult(descriptors, centres)
+
+    cdef _compute(self, WindowFeature *windowFeature, unsigned int n_threads,
+                  centres):
+        # Compute the descriptors of either all the windows or only those
+        # centred at the given centres
+        if centres is not None:
+            return self._apply_at_centres(windowFeature, centres, n_threads)
+        cdef double[:, :, :] outputImage = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             windowFeature.descriptorLengthPerWindow], order='F')
+        cdef int[:, :, :] windowsCenters = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             2], order='F', dtype=np.int32)
+        self._apply(&outputImage[0,0,0], &windowsCenters[0,0,0],
+                    windowFeature, n_threads)
+        return WindowIteratorResult(np.ascontiguousarray(outputImage),
+                                    np.ascontiguousarray(windowsCenters))
+
+    cdef bint _windows_overlap(self):
+        # Whether the dense windows cover the image more than once, so that
+        # computing the gradients of every pixel once is cheaper than
+        # computing them once per window
+        cdef double n_windows = (
+            <double>self.iterator._numberOfWindowsVertically *
+            self.iterator._numberOfWindowsHorizontally)
+        return (n_windows * self.iterator._windowHeight *
+                self.iterator._windowWidth >
+                <double>self.iterator._imageHeight *
+                self.iterator._imageWidth)
+
+    cdef _output_str(self, info_str, WindowFeature *windowFeature, centres):
+        if centres is not None:
+            return "{}Output descriptors {} x {}.".format(
+                info_str, len(centres),
+                <int>windowFeature.descriptorLengthPerWindow)
+        return "{}Output image size {}W x {}H x {}.".format(
+            info_str, <int>self.iterator._numberOfWindowsHorizontally,
+            <int>self.iterator._numberOfWindowsVertically,
+            <int>windowFeature.descriptorLengthPerWindow)
+
     def __str__(self):
         info_str = "Window Iterator:\n" \
                    "  - Input image is {}W x {}H with {} channels.\n" \
@@ -95,7 +207,9 @@ cdef class WindowIterator:
 
     def HOG(self, method, numberOfOrientationBins, cellHeightAndWidthInPixels,
             blockHeightAndWidthInCells, enableSignedGradients,
-            l2normClipping, verbose):
+            l2normClipping, verbose, n_threads=1, centres=None,
+            cache_gradients=None):
+        cdef double *image = <double *>np.PyArray_DATA(self.image)
         cdef HOG *hog = new HOG(self.iterator._windowHeight,
                                 self.iterator._windowWidth,
                                 self.iterator._numberOfChannels, method,
@@ -107,14 +221,6 @@ cdef class WindowIterator:
                 hog.numberOfBlocksPerWindowHorizontally == 0:
             raise ValueError("The window-related options are wrong. "
                              "The number of blocks per window is 0.")
-        cdef double[:, :, :] outputImage = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             hog.descriptorLengthPerWindow], order='F')
-        cdef int[:, :, :] windowsCenters = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             2], order='F', dtype=np.int32)
         if verbose:
             info_str = "HOG features:\n"
             if method == 1:
@@ -153,17 +259,24 @@ cdef class WindowIterator:
                     <int>hog.numberOfBlocksPerWindowVertically,
                     <int>hog.descriptorLengthPerBlock,
                     <int>hog.descriptorLengthPerWindow)
-            info_str = "{}Output image size {}W x {}H x {}.".format(
-                info_str, <int>self.iterator._numberOfWindowsHorizontally,
-                <int>self.iterator._numberOfWindowsVertically,
-                <int>hog.descriptorLengthPerWindow)
+            info_str = self._output_str(info_str, hog, centres)
             print(info_str)
-        self.iterator.apply(&outputImage[0,0,0], &windowsCenters[0,0,0], hog)
-        del hog
-        return WindowIteratorResult(np.ascontiguousarray(outputImage),
-                                    np.ascontiguousarray(windowsCenters))
+        if cache_gradients is None:
+            cache_gradients = (centres is None and
+                               self._windows_overlap())
+        try:
+            if cache_gradients:
+                # Compute the gradients of the whole image once, rather than
+                # once for every window that contains them
+                with nogil:
+                    hog.cacheGradients(image, self.iterator._imageHeight,
+                                       self.iterator._imageWidth)
+            return self._compute(hog, n_threads, centres)
+        finally:
+            del hog
 
-    def LBP(self, radius, samples, mapping_type, verbose):
+    def LBP(self, radius, samples, mapping_type, verbose, n_threads=1,
+            centres=None):
         # find unique samples (thus lbp codes mappings)
         uniqueSamples, whichMappingTable = np.unique(samples,
                                                      return_inverse=True)
@@ -182,14 +295,6 @@ cdef class WindowIterator:
                                 &csamples[0], radius.size, mapping_type,
                                 &cuniqueSamples[0], &cwhichMappingTable[0],
                                 numberOfUniqueSamples)
-        cdef double[:, :, :] outputImage = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             lbp.descriptorLengthPerWindow], order='F')
-        cdef int[:, :, :] windowsCenters = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             2], order='F', dtype=np.int32)
         if verbose:
             info_str = "LBP features:\n"
             if radius.size == 1:
@@ -225,15 +330,12 @@ cdef class WindowIterator:
             info_str = "{0}  - Descriptor length per window = " \
                        "{1} x 1.\n".format(info_str,
                                            <int>lbp.descriptorLengthPerWindow)
-            info_str = "{}Output image size {}W x {}H x {}.".format(
-                info_str, <int>self.iterator._numberOfWindowsHorizontally,
-                <int>self.iterator._numberOfWindowsVertically,
-                <int>lbp.descriptorLengthPerWindow)
+            info_str = self._output_str(info_str, lbp, centres)
             print(info_str)
-        self.iterator.apply(&outputImage[0,0,0], &windowsCenters[0,0,0], lbp)
-        del lbp
-        return WindowIteratorResult(np.ascontiguousarray(outputImage),
-                                    np.ascontiguousarray(windowsCenters))
+        try:
+            return self._compute(lbp, n_threads, centres)
+        finally:
+            del lbp
 
 def _lbp_mapping_table(n_samples, mapping_type='riu2'):
     r"""
@@ -1,3 +1,5 @@
-from .base import Image, ImageBoundaryError
+from .base import Image, ImageBoundaryError, extract_patches_batch
 from .boolean import BooleanImage
 from .masked import MaskedImage, OutOfMaskSampleError
+from .warp_plan import WarpPlan
+from .pyramid import GaussianPyramid, LaplacianPyramid
@@ -0,0 +1,106 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+ctypedef fused FLOAT_TYPES:
+    float
+    double
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _resample_channel(FLOAT_TYPES[:, :] pixels,
+                            Py_ssize_t[:, ::1] row_indices,
+                            double[:, ::1] row_weights,
+                            Py_ssize_t[:, ::1] col_indices,
+                            double[:, ::1] col_weights,
+                            double[:, ::1] rows_buffer,
+                            double[::1] accumulator,
+                            FLOAT_TYPES[:, :] out) nogil:
+    cdef:
+        Py_ssize_t n_rows = pixels.shape[0]
+        Py_ssize_t n_out_rows = row_indices.shape[0]
+        Py_ssize_t n_out_cols = col_indices.shape[0]
+        Py_ssize_t n_row_taps = row_indices.shape[1]
+        Py_ssize_t n_col_taps = col_indices.shape[1]
+        Py_ssize_t r, i, j, t, source_row
+        double total, weight
+
+    # Horizontal pass - every input row is resampled to the output columns
+    for r in range(n_rows):
+        for j in range(n_out_cols):
+            total = 0
+            for t in range(n_col_taps):
+                total += col_weights[j, t] * pixels[r, col_indices[j, t]]
+            rows_buffer[r, j] = total
+
+    # Vertical pass - each output row is a weighted sum of whole rows of the
+    # buffer, so the inner loop runs along contiguous memory
+    for i in range(n_out_rows):
+        for j in range(n_out_cols):
+            accumulator[j] = 0
+        for t in range(n_row_taps):
+            weight = row_weights[i, t]
+            source_row = row_indices[i, t]
+            for j in range(n_out_cols):
+                accumulator[j] += weight * rows_buffer[source_row, j]
+        for j in range(n_out_cols):
+            out[i, j] = <FLOAT_TYPES> accumulator[j]
+
+
+def separable_resample(FLOAT_TYPES[:, :, :] pixels,
+                       Py_ssize_t[:, ::1] row_indices,
+                       double[:, ::1] row_weights,
+                       Py_ssize_t[:, ::1] col_indices,
+                       double[:, ::1] col_weights,
+                       FLOAT_TYPES[:, :, :] out):
+    r"""
+    Resample every channel of an image with a separable filter, first along
+    the columns and then along the rows. Output pixel ``(i, j)`` of a channel
+    is::
+
+        sum_a sum_b row_weights[i, a] * col_weights[j, b] *
+            pixels[row_indices[i, a], col_indices[j, b]]
+
+    Therefore, any combination of separable filtering and interpolation can
+    be computed in a single pass by choosing the taps appropriately. The
+    GIL is released for the duration of the resampling.
+
+    Parameters
+    ----------
+    pixels : ``(n_channels, n_rows, n_cols)`` `ndarray`
+        The image to resample.
+    row_indices : ``(n_out_rows, n_row_taps)`` `ndarray`
+        The input rows that contribute to each output row.
+    row_weights : ``(n_out_rows, n_row_taps)`` `ndarray`
+        The weight of each of the ``row_indices``.
+    col_indices : ``(n_out_cols, n_col_taps)`` `ndarray`
+        The input columns that contribute to each output column.
+    col_weights : ``(n_out_cols, n_col_taps)`` `ndarray`
+        The weight of each of the ``col_indices``.
+    out : ``(n_channels, n_out_rows, n_out_cols)`` `ndarray`
+        The array to write the result to.
+    """
+    cdef:
+        Py_ssize_t n_channels = pixels.shape[0]
+        Py_ssize_t c
+        double[:, ::1] rows_buffer = np.empty(
+            (pixels.shape[1], col_indices.shape[0]))
+        double[::1] accumulator = np.empty(col_indices.shape[0])
+
+    if (out.shape[0] != n_channels or out.shape[1] != row_indices.shape[0] or
+            out.shape[2] != col_indices.shape[0]):
+        raise ValueError('The output must be of shape '
+                         '(n_channels, n_out_rows, n_out_cols).')
+    if (row_weights.shape[0] != row_indices.shape[0] or
+            row_weights.shape[1] != row_indices.shape[1] or
+            col_weights.shape[0] != col_indices.shape[0] or
+            col_weights.shape[1] != col_indices.shape[1]):
+        raise ValueError('Each index must have exactly one weight.')
+
+    with nogil:
+        for c in range(n_channels):
+            _resample_channel(pixels[c], row_indices, row_weights,
+                              col_indices, col_weights, rows_buffer,
+                              accumulator, out[c])
@@ -7,7 +7,7 @@ import PIL.Image as PILImage
 
 from menpo.compatibility import basestring
 from menpo.base import (Vectorizable, MenpoDeprecationWarning,
-                        copy_landmarks_and_path)
+                        copy_landmarks_and_path, _worker_pool)
 from menpo.shape import PointCloud, bounding_box
 from menpo.landmark import Landmarkable
 from menpo.transform import (Translation, NonUniformScale, Rotation,
@@ -16,7 +16,8 @@ from menpo.transform import (Translation, NonUniformScale, Rotation,
 from menpo.visualize.base import ImageViewer, LandmarkableViewable, Viewable
 
 from .interpolation import scipy_interpolation, cython_interpolation
-from .patches import extract_patches, set_patches
+from .patches import (extract_patches_into, extract_patches_bilinear_into,
+                      set_patches)
 
 
 # Cache the greyscale luminosity coefficients as they are invariant.
@@ -68,7 +69,8 @@ def indices_for_image_of_shape(shape):
     return np.indices(shape).reshape([len(shape), -1]).T
 
 
-def normalize_pixels_range(pixels, error_on_unknown_type=True):
+def normalize_pixels_range(pixels, error_on_unknown_type=True,
+                           out_dtype=np.float64):
     r"""
     Normalize the given pixels to the Menpo valid floating point range, [0, 1].
     This is a single place to handle normalising pixels ranges. At the moment
@@ -82,6 +84,8 @@ def normalize_pixels_range(pixels, error_on_unknown_type=True):
         If ``True``, this method throws a ``ValueError`` if the given pixels
         array is an unknown type. If ``False``, this method performs no
         operation.
+    out_dtype : `np.dtype`, optional
+        The floating point dtype of the normalized pixels.
 
     Returns
     -------
@@ -105,9 +109,10 @@ def normalize_pixels_range(pixels, error_on_unknown_type=True):
         else:
             # Do nothing
             return pixels
-    # This multiplication is quite a bit faster than just dividing - will
-    # automatically cast it up to float64
-    return pixels * (1.0 / max_range)
+    # This multiplication is quite a bit faster than just dividing. The
+    # output is computed directly in the requested dtype, so no float64
+    # intermediate is created for float32 output.
+    return np.multiply(pixels, 1.0 / max_range, dtype=out_dtype)
 
 
 def denormalize_pixels_range(pixels, out_dtype):
@@ -1380,7 +1385,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return bounded_points
 
     def extract_patches(self, patch_centers, patch_shape=(16, 16),
-                        sample_offsets=None, as_single_array=True):
+                        sample_offsets=None, as_single_array=True,
+                        interpolation='nearest', patch_transforms=None):
         r"""
         Extract a set of patches from an image. Given a set of patch centers
         and a patch size, patches are extracted from within the image, centred
@@ -1411,6 +1417,17 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             `ndarray`, thus a single numpy array is returned containing each
             patch. If ``False``, a `list` of ``n_center * n_offset``
             :map:`Image` objects is returned representing each patch.
+        interpolation : ``{nearest, bilinear}``, optional
+            If ``nearest``, the centers are truncated to integers and the
+            patches are copied from the image. If ``bilinear``, the patches
+            are sampled with bilinear interpolation at the exact (sub-pixel)
+            centers and offsets.
+        patch_transforms : ``(n_center, 2, 2)`` or ``(2, 2)`` `ndarray`, optional
+            Only for ``bilinear`` interpolation, the linear map (for instance
+            a rotation and a scale) from the frame of each patch to the image.
+            Pixel ``(i, j)`` of the patch around center ``c`` with offset
+            ``o`` is sampled from ``c + A (o + (i, j) - patch_shape // 2)``.
+            If ``None``, the identity is used.
 
         Returns
         -------
@@ -1423,21 +1440,19 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         ------
         ValueError
             If image is not 2D
+        ValueError
+            If the interpolation is not ``nearest`` or ``bilinear``
+        ValueError
+            If patch transforms are provided with ``nearest`` interpolation
         """
         if self.n_dims != 2:
             raise ValueError('Only two dimensional patch extraction is '
                              'currently supported.')
 
-        if sample_offsets is None:
-            sample_offsets = np.zeros([1, 2], dtype=np.intp)
-        else:
-            sample_offsets = np.require(sample_offsets, dtype=np.intp)
-
-        patch_centers = np.require(patch_centers.points, dtype=np.float,
-                                   requirements=['C'])
-        single_array = extract_patches(self.pixels, patch_centers,
-                                       np.asarray(patch_shape, dtype=np.intp),
-                                       sample_offsets)
+        single_array = _extract_patches(self.pixels, patch_centers.points,
+                                        patch_shape, sample_offsets,
+                                        interpolation=interpolation,
+                                        patch_transforms=patch_transforms)
 
         if as_single_array:
             return single_array
@@ -1446,7 +1461,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
 
     def extract_patches_around_landmarks(
             self, group=None, patch_shape=(16, 16),
-            sample_offsets=None, as_single_array=True):
+            sample_offsets=None, as_single_array=True,
+            interpolation='nearest', patch_transforms=None):
         r"""
         Extract patches around landmarks existing on this image. Provided the
         group label and optionally the landmark label extract a set of patches.
@@ -1471,6 +1487,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             `ndarray`, thus a single numpy array is returned containing each
             patch. If ``False``, a `list` of ``n_center * n_offset``
             :map:`Image` objects is returned representing each patch.
+        interpolation : ``{nearest, bilinear}``, optional
+            Whether the centres are truncated to integers or the patches are
+            sampled at sub-pixel accuracy. See `extract_patches`.
+        patch_transforms : ``(n_center, 2, 2)`` or ``(2, 2)`` `ndarray`, optional
+            Only for ``bilinear`` interpolation, the linear map from the frame
+            of each patch to the image. See `extract_patches`.
 
         Returns
         -------
@@ -1487,7 +1509,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.extract_patches(self.landmarks[group],
                                     patch_shape=patch_shape,
                                     sample_offsets=sample_offsets,
-                                    as_single_array=as_single_array)
+                                    as_single_array=as_single_array,
+                                    interpolation=interpolation,
+                                    patch_transforms=patch_transforms)
 
     def set_patches(self, patches, patch_centers, offset=None,
                     offset_index=None):
@@ -1606,7 +1630,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
 
     def warp_to_mask(self, template_mask, transform, warp_landmarks=True,
                      order=1, mode='constant', cval=0.0, batch_size=None,
-                     return_transform=False):
+                     return_transform=False, engine='sample'):
         r"""
         Return a copy of this image warped into a different reference space.
 
@@ -1655,6 +1679,15 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            If ``sample``, the transform is applied to every pixel of the
+            template and the image is sampled at the resulting points. If
+            ``raster``, which requires a :map:`PiecewiseAffine` transform,
+            bilinear interpolation (``order=1``) with the ``constant`` or
+            ``nearest`` modes and a 2D image with floating point pixels,
+            each triangle of the transform is scanned over the template and
+            the image is sampled directly, without finding the triangle of
+            each pixel or creating any intermediate points.
 
         Returns
         -------
@@ -1668,11 +1701,16 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             raise ValueError(
                 "Trying to warp a {}D image with a {}D transform "
                 "(they must match)".format(self.n_dims, transform.n_dims))
-        template_points = template_mask.true_indices()
-        points_to_sample = transform.apply(template_points,
-                                           batch_size=batch_size)
-        sampled = self.sample(points_to_sample,
-                              order=order, mode=mode, cval=cval)
+        if _raster_engine(engine):
+            warped = _raster_warp(self, template_mask.mask, transform,
+                                  order, mode, cval)
+            sampled = warped[:, template_mask.mask]
+        else:
+            template_points = template_mask.true_indices()
+            points_to_sample = transform.apply(template_points,
+                                               batch_size=batch_size)
+            sampled = self.sample(points_to_sample,
+                                  order=order, mode=mode, cval=cval)
 
         # set any nan values to 0
         sampled[np.isnan(sampled)] = 0
@@ -1704,9 +1742,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             Sampled value to rebuild the masked image from.
         """
         from menpo.image import MaskedImage
-        warped_image = MaskedImage.init_blank(template_mask.shape,
-                                              n_channels=self.n_channels,
-                                              mask=template_mask)
+        warped_image = MaskedImage.init_blank(
+            template_mask.shape, n_channels=self.n_channels,
+            dtype=sampled_pixel_values.dtype, mask=template_mask)
         warped_image._from_vector_inplace(sampled_pixel_values.ravel())
         return warped_image
 
@@ -1748,7 +1786,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
 
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
                       order=1, mode='constant', cval=0.0, batch_size=None,
-                      return_transform=False):
+                      return_transform=False, engine='sample'):
         """
         Return a copy of this image warped into a different reference space.
 
@@ -1794,6 +1832,15 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            If ``sample``, the transform is applied to every pixel of the
+            template and the image is sampled at the resulting points. If
+            ``raster``, which requires a :map:`PiecewiseAffine` transform,
+            bilinear interpolation (``order=1``) with the ``constant`` or
+            ``nearest`` modes and a 2D image with floating point pixels,
+            each triangle of the transform is scanned over the template and
+            the image is sampled directly, without finding the triangle of
+            each pixel or creating any intermediate points.
 
         Returns
         -------
@@ -1804,6 +1851,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             `return_transform` is ``True``.
         """
         template_shape = np.array(template_shape, dtype=np.int)
+        if _raster_engine(engine):
+            warped_pixels = _raster_warp(
+                self, np.ones(template_shape, dtype=np.bool), transform,
+                order, mode, cval)
+            return self._build_warp_to_shape(warped_pixels, transform,
+                                             warp_landmarks, return_transform)
         if (isinstance(transform, Affine) and order in range(4) and
             self.n_dims == 2):
 
@@ -2462,6 +2515,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         image_pyramid: `generator`
             Generator yielding pyramid layers as :map:`Image` objects.
         """
+        if self._has_native_pyramid():
+            from .pyramid import GaussianPyramid
+            for image in GaussianPyramid(self, n_levels=n_levels,
+                                         downscale=downscale, sigma=0):
+                yield image
+            return
         image = self.copy()
         yield image
         for _ in range(n_levels - 1):
@@ -2474,6 +2533,10 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         pyramid will be a copy of the original, unmodified, image, and counts
         as level 1.
 
+        The levels of 2D :map:`Image` objects are computed by a
+        :map:`GaussianPyramid`, which smooths and decimates each level in a
+        single native pass and stores all the levels in one buffer.
+
         Parameters
         ----------
         n_levels : `int`, optional
@@ -2491,6 +2554,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         image_pyramid: `generator`
             Generator yielding pyramid layers as :map:`Image` objects.
         """
+        if self._has_native_pyramid():
+            from .pyramid import GaussianPyramid
+            for image in GaussianPyramid(self, n_levels=n_levels,
+                                         downscale=downscale, sigma=sigma):
+                yield image
+            return
         from menpo.feature import gaussian_filter
         if sigma is None:
             sigma = downscale / 3.
@@ -2500,6 +2569,93 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             image = gaussian_filter(image, sigma).rescale(1.0 / downscale)
             yield image
 
+    def laplacian_pyramid(self, n_levels=3, downscale=2, sigma=None):
+        r"""
+        Return the laplacian pyramid of this image. Every level but the last
+        is the difference between the corresponding level of the
+        :meth:`gaussian_pyramid` and the next level upsampled to its shape.
+        The last level is the last level of the gaussian pyramid. The image
+        must be 2D.
+
+        Parameters
+        ----------
+        n_levels : `int`, optional
+            Total number of levels in the pyramid.
+        downscale : `float`, optional
+            Downscale factor.
+        sigma : `float`, optional
+            Sigma for gaussian filter. Default is ``downscale / 3.``.
+
+        Returns
+        -------
+        pyramid : :map:`LaplacianPyramid`
+            The pyramid, whose levels are computed when they are first
+            accessed. Iterating it yields the levels as :map:`Image` objects.
+        """
+        from .pyramid import LaplacianPyramid
+        return LaplacianPyramid(self, n_levels=n_levels, downscale=downscale,
+                                sigma=sigma)
+
+    def _has_native_pyramid(self):
+        # Pyramids of 2D images are computed by GaussianPyramid, but masked
+        # and boolean images (and any other subclass) need their own rescale
+        return (type(self) is Image and self.n_dims == 2 and
+                self.pixels.dtype in (np.float32, np.float64))
+
+    def as_float(self, dtype=None):
+        r"""
+        Returns a version of this image with floating point pixels in the
+        range ``[0, 1]``, as produced by the importers with
+        ``normalize=True``. Integer (``uint8`` and ``uint16``) pixels are
+        normalized and ``bool`` pixels become ``0`` or ``1``.
+
+        Images can therefore be imported with ``normalize=False``, kept in
+        their (much smaller) native dtype through operations that preserve it
+        (such as cropping, mirroring, patch extraction and nearest neighbour
+        resizing) and only converted when floating point data is required.
+
+        Parameters
+        ----------
+        dtype : `np.dtype`, optional
+            The floating point dtype of the pixels. If ``None``, floating
+            point images keep their dtype and other images become
+            ``float64``.
+
+        Returns
+        -------
+        float_image : :map:`Image` or :map:`MaskedImage`
+            A copy of this image with floating point pixels. It is a
+            :map:`MaskedImage` (with a copy of the mask) if this image is a
+            :map:`MaskedImage`.
+
+        Raises
+        ------
+        ValueError
+            If the dtype of the pixels is not floating point, uint8, uint16 or
+            bool.
+        ValueError
+            If ``dtype`` is not a floating point dtype.
+        """
+        in_dtype = self.pixels.dtype
+        if dtype is None:
+            dtype = in_dtype if in_dtype.kind == 'f' else np.float64
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'f':
+            raise ValueError('Unexpected dtype ({}) - only floating point '
+                             'dtypes are supported'.format(dtype))
+        if in_dtype.kind == 'f' or in_dtype == np.bool:
+            # astype always copies, even if the dtype is unchanged
+            pixels = self.pixels.astype(dtype)
+        else:
+            pixels = normalize_pixels_range(self.pixels, out_dtype=dtype)
+        from menpo.image import MaskedImage
+        if isinstance(self, MaskedImage):
+            float_image = MaskedImage(pixels, mask=self.mask.copy(),
+                                      copy=False)
+        else:
+            float_image = Image(pixels, copy=False)
+        return copy_landmarks_and_path(self, float_image)
+
     def as_greyscale(self, mode='luminosity', channel=None):
         r"""
         Returns a greyscale version of the image. If the image does *not*
@@ -2947,6 +3103,162 @@ def round_image_shape(shape, round):
     return tuple(getattr(np, round)(shape).astype(np.int))
 
 
+def _raster_engine(engine):
+    r"""
+    Whether the ``raster`` warp engine was requested, validating the engine.
+    """
+    if engine not in ('sample', 'raster'):
+        raise ValueError("engine must be either 'sample' or 'raster'")
+    return engine == 'raster'
+
+
+def _raster_warp(image, template_mask, transform, order, mode, cval):
+    r"""
+    Warp a 2D image into the pixels of ``template_mask`` by scanning the
+    triangles of a piecewise affine transform. See :meth:`Image.warp_to_mask`.
+    """
+    from menpo.transform.piecewiseaffine.base import AbstractPWA
+    if not isinstance(transform, AbstractPWA):
+        raise ValueError("The 'raster' engine only supports piecewise affine "
+                         "transforms")
+    if order != 1 or mode not in ('constant', 'nearest'):
+        raise ValueError("The 'raster' engine only supports bilinear "
+                         "interpolation (order=1) with the 'constant' or "
+                         "'nearest' modes")
+    if (hasattr(image, 'mask') or image.n_dims != 2 or
+            image.pixels.dtype not in (np.float32, np.float64)):
+        raise ValueError("The 'raster' engine only supports unmasked 2D "
+                         "images with floating point pixels")
+    warped = transform._warp_pixels(image.pixels, template_mask, mode=mode,
+                                    cval=cval)
+    # set any nan values to 0
+    warped[np.isnan(warped)] = 0
+    return warped
+
+
+def _extract_patches(pixels, centres, patch_shape, sample_offsets,
+                     interpolation='nearest', patch_transforms=None, out=None):
+    r"""
+    Extract patches from the pixels of a 2D image with the native extractors.
+    See :meth:`Image.extract_patches` for the arguments. If `out` is
+    provided, it must be zero-initialised and the patches are written to it.
+    """
+    if interpolation not in ('nearest', 'bilinear'):
+        raise ValueError("interpolation must be either 'nearest' or "
+                         "'bilinear'")
+    if patch_transforms is not None and interpolation != 'bilinear':
+        raise ValueError("Patch transforms require 'bilinear' interpolation")
+    if sample_offsets is None:
+        sample_offsets = np.zeros([1, 2])
+    patch_shape = np.asarray(patch_shape, dtype=np.intp)
+    centres = np.require(centres, dtype=np.float, requirements=['C'])
+    if out is None:
+        out = np.zeros((centres.shape[0], len(sample_offsets),
+                        pixels.shape[0]) + tuple(patch_shape),
+                       dtype=pixels.dtype)
+
+    if interpolation == 'nearest':
+        extract_patches_into(pixels, centres, patch_shape,
+                             np.require(sample_offsets, dtype=np.intp), out)
+    else:
+        if patch_transforms is None:
+            patch_transforms = np.eye(2)
+        patch_transforms = np.array(
+            np.broadcast_to(patch_transforms, (centres.shape[0], 2, 2)),
+            dtype=np.float)
+        extract_patches_bilinear_into(
+            pixels, centres, patch_shape,
+            np.require(sample_offsets, dtype=np.float), patch_transforms, out)
+    return out
+
+
+def extract_patches_batch(images, centres_list, patch_shape=(16, 16),
+                          sample_offsets=None, n_workers=1,
+                          interpolation='nearest'):
+    r"""
+    Extract the same number of patches from each of a set of images, as
+    :meth:`Image.extract_patches` with ``as_single_array=True``, directly
+    into a single preallocated array. The patches are copied with the GIL
+    released, so multiple workers extract from different images in parallel.
+
+    Parameters
+    ----------
+    images : `list` of :map:`Image`
+        The 2D images to extract patches from. All the images must have the
+        same number of channels and dtype, but may differ in shape.
+    centres_list : `list` of :map:`PointCloud` or ``(n_centres, 2)`` `ndarray`
+        The centres to extract patches around, one set per image. Each set
+        must contain the same number of centres.
+    patch_shape : ``(1, n_dims)`` `tuple` or `ndarray`, optional
+        The size of the patch to extract
+    sample_offsets : ``(n_offsets, n_dims)`` `ndarray` or ``None``, optional
+        The offsets to sample from within a patch. See
+        :meth:`Image.extract_patches`.
+    n_workers : `int`, optional
+        The number of threads that extract patches.
+    interpolation : ``{nearest, bilinear}``, optional
+        Whether the centres are truncated to integers or the patches are
+        sampled at sub-pixel accuracy. See :meth:`Image.extract_patches`.
+
+    Returns
+    -------
+    patches : ``(n_images, n_centres, n_offsets, n_channels, patch_shape)`` `ndarray`
+        The patches of every image.
+
+    Raises
+    ------
+    ValueError
+        Number of workers must be > 0
+    ValueError
+        One set of centres must be provided per image
+    ValueError
+        Only two dimensional patch extraction is currently supported.
+    ValueError
+        All images must have the same number of channels and dtype
+    ValueError
+        All sets of centres must have the same number of centres
+    """
+    if n_workers < 1:
+        raise ValueError("Number of workers must be > 0")
+    if len(images) != len(centres_list) or len(images) == 0:
+        raise ValueError("One set of centres must be provided per image")
+    if any(i.n_dims != 2 for i in images):
+        raise ValueError('Only two dimensional patch extraction is '
+                         'currently supported.')
+    pixels = [i.pixels for i in images]
+    if any(p.shape[0] != pixels[0].shape[0] or p.dtype != pixels[0].dtype
+           for p in pixels[1:]):
+        raise ValueError("All images must have the same number of channels "
+                         "and dtype")
+    centres_list = [getattr(c, 'points', c) for c in centres_list]
+    n_centres = centres_list[0].shape[0]
+    if any(c.shape[0] != n_centres for c in centres_list[1:]):
+        raise ValueError("All sets of centres must have the same number of "
+                         "centres")
+    n_offsets = 1 if sample_offsets is None else len(sample_offsets)
+
+    patches = np.zeros((len(images), n_centres, n_offsets,
+                        pixels[0].shape[0]) + tuple(patch_shape),
+                       dtype=pixels[0].dtype)
+
+    def extract(i):
+        _extract_patches(pixels[i], centres_list[i], patch_shape,
+                         sample_offsets, interpolation=interpolation,
+                         out=patches[i])
+
+    if n_workers == 1:
+        for i in range(len(images)):
+            extract(i)
+    else:
+        pool = _worker_pool(n_workers=n_workers, backend='thread')
+        try:
+            pool.map(extract, range(len(images)))
+        finally:
+            pool.terminate()
+            pool.join()
+    return patches
+
+
 def _convert_patches_list_to_single_array(patches_list, n_center):
     r"""
     Converts patches from a `list` of :map:`Image` objects to a single `ndarray`
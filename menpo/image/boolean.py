@@ -442,7 +442,7 @@ class BooleanImage(Image):
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=True,
                      mode='constant', cval=False, batch_size=None,
-                     return_transform=False):
+                     return_transform=False, engine='sample'):
         r"""
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -478,6 +478,9 @@ class BooleanImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            The warp engine (see :meth:`Image.warp_to_mask`). Only ``sample``
+            supports boolean images, so ``raster`` raises a ``ValueError``.
 
         Returns
         -------
@@ -491,12 +494,13 @@ class BooleanImage(Image):
         return Image.warp_to_mask(
             self, template_mask, transform, warp_landmarks=warp_landmarks,
             order=0, mode=mode, cval=cval, batch_size=batch_size,
-            return_transform=return_transform)
+            return_transform=return_transform, engine=engine)
 
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
                       mode='constant', cval=False, order=None,
-                      batch_size=None, return_transform=False):
+                      batch_size=None, return_transform=False,
+                      engine='sample'):
         """
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -533,6 +537,9 @@ class BooleanImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            The warp engine (see :meth:`Image.warp_to_mask`). Only ``sample``
+            supports boolean images, so ``raster`` raises a ``ValueError``.
 
         Returns
         -------
@@ -547,7 +554,7 @@ class BooleanImage(Image):
         warped = Image.warp_to_shape(self, template_shape, transform,
                                      warp_landmarks=warp_landmarks, order=0,
                                      mode=mode, cval=cval,
-                                     batch_size=batch_size)
+                                     batch_size=batch_size, engine=engine)
         # unfortunately we can't escape copying here, let BooleanImage
         # convert us to np.bool
         boolean_image = BooleanImage(warped.pixels.reshape(template_shape))
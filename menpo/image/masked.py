@@ -884,7 +884,7 @@ class MaskedImage(Image):
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=False,
                      order=1, mode='constant', cval=0., batch_size=None,
-                     return_transform=False):
+                     return_transform=False, engine='sample'):
         r"""
         Warps this image into a different reference space.
 
@@ -929,6 +929,9 @@ class MaskedImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            The warp engine (see :meth:`Image.warp_to_mask`). Only ``sample``
+            supports masked images, so ``raster`` raises a ``ValueError``.
 
         Returns
         -------
@@ -943,7 +946,8 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_mask(self, template_mask, transform,
                                           warp_landmarks=warp_landmarks,
                                           order=order, mode=mode, cval=cval,
-                                          batch_size=batch_size)
+                                          batch_size=batch_size,
+                                          engine=engine)
         # Set the template mask as our mask
         warped_image.mask = template_mask
         # optionally return the transform
@@ -955,7 +959,7 @@ class MaskedImage(Image):
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=False,
                       order=1, mode='constant', cval=0., batch_size=None,
-                      return_transform=False):
+                      return_transform=False, engine='sample'):
         """
         Return a copy of this :map:`MaskedImage` warped into a different
         reference space.
@@ -1002,6 +1006,9 @@ class MaskedImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        engine : ``{sample, raster}``, optional
+            The warp engine (see :meth:`Image.warp_to_mask`). Only ``sample``
+            supports masked images, so ``raster`` raises a ``ValueError``.
 
         Returns
         -------
@@ -1015,7 +1022,8 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_shape(self, template_shape, transform,
                                            warp_landmarks=warp_landmarks,
                                            order=order, mode=mode, cval=cval,
-                                           batch_size=batch_size)
+                                           batch_size=batch_size,
+                                           engine=engine)
         # warp the mask separately and reattach.
         mask = self.mask.warp_to_shape(template_shape, transform,
                                        warp_landmarks=warp_landmarks,
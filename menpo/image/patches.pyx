@@ -20,7 +20,7 @@ ctypedef fused CENTRE_TYPES:
 @cython.wraparound(False)
 cdef void calc_augmented_centers(CENTRE_TYPES[:, :] centres,
                                  Py_ssize_t[:, :] offsets,
-                                 Py_ssize_t[:, :] augmented_centers):
+                                 Py_ssize_t[:, :] augmented_centers) nogil:
     cdef Py_ssize_t total_index = 0, i = 0, j = 0
 
     for i in range(centres.shape[0]):
@@ -44,8 +44,9 @@ cdef void calc_slices(Py_ssize_t[:, :] centres,
                       Py_ssize_t[:, :] ext_s_min,
                       Py_ssize_t[:, :] ext_s_max,
                       Py_ssize_t[:, :] ins_s_min,
-                      Py_ssize_t[:, :] ins_s_max):
+                      Py_ssize_t[:, :] ins_s_max) nogil:
     cdef Py_ssize_t i = 0
+    cdef Py_ssize_t c_min_new0, c_min_new1, c_max_new0, c_max_new1
 
     for i in range(centres.shape[0]):
         c_min_new0 = centres[i, 0] - half_patch_shape0
@@ -89,10 +90,49 @@ cdef void calc_slices(Py_ssize_t[:, :] centres,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef extract_patches(IMAGE_TYPES[:, :, :] image,
-                      CENTRE_TYPES[:, :] centres,
-                      Py_ssize_t[:] patch_shape, Py_ssize_t[:, :] offsets):
-    dtype = dtype_from_memoryview(image)
+cdef void copy_patches(IMAGE_TYPES[:, :, :] image,
+                       Py_ssize_t n_offsets,
+                       Py_ssize_t[:, :] ext_s_min,
+                       Py_ssize_t[:, :] ext_s_max,
+                       Py_ssize_t[:, :] ins_s_min,
+                       Py_ssize_t[:, :] ins_s_max,
+                       IMAGE_TYPES[:, :, :, :, :] patches) nogil:
+    cdef:
+        Py_ssize_t n_channels = image.shape[0]
+        Py_ssize_t total_index = 0, i = 0, j = 0, c = 0, y = 0, x = 0
+        Py_ssize_t height, width
+
+    for total_index in range(ext_s_min.shape[0]):
+        i = total_index / n_offsets
+        j = total_index % n_offsets
+        height = min(ext_s_max[total_index, 0] - ext_s_min[total_index, 0],
+                     ins_s_max[total_index, 0] - ins_s_min[total_index, 0])
+        width = min(ext_s_max[total_index, 1] - ext_s_min[total_index, 1],
+                    ins_s_max[total_index, 1] - ins_s_min[total_index, 1])
+        for c in range(n_channels):
+            for y in range(height):
+                for x in range(width):
+                    patches[i, j, c,
+                            ins_s_min[total_index, 0] + y,
+                            ins_s_min[total_index, 1] + x] = \
+                        image[c,
+                              ext_s_min[total_index, 0] + y,
+                              ext_s_min[total_index, 1] + x]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef extract_patches_into(IMAGE_TYPES[:, :, :] image,
+                           CENTRE_TYPES[:, :] centres,
+                           Py_ssize_t[:] patch_shape, Py_ssize_t[:, :] offsets,
+                           IMAGE_TYPES[:, :, :, :, :] patches):
+    r"""
+    Extract patches from an image into a preallocated
+    ``(n_centres, n_offsets, n_channels, patch_shape[0], patch_shape[1])``
+    array. Only the parts of the patches that lie within the image are
+    written, so the array should be initialised (typically to zero). The GIL
+    is released while the patches are copied.
+    """
     cdef:
         Py_ssize_t n_centres = centres.shape[0]
         Py_ssize_t n_offsets = offsets.shape[0]
@@ -107,9 +147,6 @@ cpdef extract_patches(IMAGE_TYPES[:, :, :] image,
         Py_ssize_t patch_shape1 = patch_shape[1]
         Py_ssize_t image_shape0 = image.shape[1]
         Py_ssize_t image_shape1 = image.shape[2]
-        Py_ssize_t n_channels = image.shape[0]
-
-        Py_ssize_t total_index = 0, i = 0, j = 0
 
         # Although it is faster to use malloc in this case, the change in syntax
         # and the mental overhead of handling freeing memory is not considered
@@ -123,27 +160,113 @@ cpdef extract_patches(IMAGE_TYPES[:, :, :] image,
         Py_ssize_t[:, :] ins_s_max = np.empty(extents_size, dtype=np.intp)
         Py_ssize_t[:, :] ins_s_min = np.empty(extents_size, dtype=np.intp)
 
-        np.ndarray[IMAGE_TYPES, ndim=5] patches = np.zeros(
-            [n_centres, n_offsets, n_channels, patch_shape0, patch_shape1],
-            dtype=dtype)
+    if (patches.shape[0] != n_centres or patches.shape[1] != n_offsets or
+            patches.shape[2] != image.shape[0] or
+            patches.shape[3] != patch_shape0 or
+            patches.shape[4] != patch_shape1):
+        raise ValueError('The patches must be of shape (n_centres, n_offsets, '
+                         'n_channels, patch_shape[0], patch_shape[1]).')
 
-    calc_augmented_centers(centres, offsets, augmented_centers)
-    calc_slices(augmented_centers, image_shape0, image_shape1, patch_shape0,
-                patch_shape1, half_patch_shape0, half_patch_shape1,
-                add_to_patch0, add_to_patch1, ext_s_min, ext_s_max, ins_s_min,
-                ins_s_max)
+    with nogil:
+        calc_augmented_centers(centres, offsets, augmented_centers)
+        calc_slices(augmented_centers, image_shape0, image_shape1,
+                    patch_shape0, patch_shape1, half_patch_shape0,
+                    half_patch_shape1, add_to_patch0, add_to_patch1,
+                    ext_s_min, ext_s_max, ins_s_min, ins_s_max)
+        copy_patches(image, n_offsets, ext_s_min, ext_s_max, ins_s_min,
+                     ins_s_max, patches)
 
-    for i in range(n_centres):
-        for j in range(n_offsets):
-            patches[i, j, :,
-                ins_s_min[total_index, 0]:ins_s_max[total_index, 0],
-                ins_s_min[total_index, 1]:ins_s_max[total_index, 1]
-            ] = \
-                image[:,
-                    ext_s_min[total_index, 0]:ext_s_max[total_index, 0],
-                    ext_s_min[total_index, 1]:ext_s_max[total_index, 1]]
-            total_index += 1
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef extract_patches_bilinear_into(IMAGE_TYPES[:, :, :] image,
+                                    double[:, :] centres,
+                                    Py_ssize_t[:] patch_shape,
+                                    double[:, :] offsets,
+                                    double[:, :, :] linear_maps,
+                                    IMAGE_TYPES[:, :, :, :, :] patches):
+    r"""
+    Extract patches from an image into a preallocated
+    ``(n_centres, n_offsets, n_channels, patch_shape[0], patch_shape[1])``
+    array, sampling the image with bilinear interpolation so that the centres
+    (and offsets) need not be integral.
+
+    Pixel ``(y, x)`` of the patch around centre ``c`` with offset ``o`` is
+    sampled at ``c + A (o + (y - patch_shape[0] / 2, x - patch_shape[1] / 2))``
+    where ``A`` is the centre's ``(2, 2)`` linear map (e.g. a rotation and a
+    scale). With integral centres and identity maps, the patches are the same
+    as those of :func:`extract_patches`. Samples outside the image are not
+    written, so the array should be initialised (typically to zero). The GIL
+    is released while sampling.
+    """
+    cdef:
+        Py_ssize_t n_centres = centres.shape[0]
+        Py_ssize_t n_offsets = offsets.shape[0]
+        Py_ssize_t n_channels = image.shape[0]
+        Py_ssize_t image_shape0 = image.shape[1]
+        Py_ssize_t image_shape1 = image.shape[2]
+        Py_ssize_t patch_shape0 = patch_shape[0]
+        Py_ssize_t patch_shape1 = patch_shape[1]
+        Py_ssize_t half_patch_shape0 = patch_shape[0] / 2
+        Py_ssize_t half_patch_shape1 = patch_shape[1] / 2
+        Py_ssize_t i, j, y, x, c, y0, x0, y1, x1
+        double a00, a01, a10, a11, d0, d1, p0, p1, w0, w1, value
+
+    if (patches.shape[0] != n_centres or patches.shape[1] != n_offsets or
+            patches.shape[2] != n_channels or
+            patches.shape[3] != patch_shape0 or
+            patches.shape[4] != patch_shape1):
+        raise ValueError('The patches must be of shape (n_centres, n_offsets, '
+                         'n_channels, patch_shape[0], patch_shape[1]).')
+    if (linear_maps.shape[0] != n_centres or linear_maps.shape[1] != 2 or
+            linear_maps.shape[2] != 2):
+        raise ValueError('The linear maps must be of shape (n_centres, 2, 2).')
+
+    with nogil:
+        for i in range(n_centres):
+            a00 = linear_maps[i, 0, 0]
+            a01 = linear_maps[i, 0, 1]
+            a10 = linear_maps[i, 1, 0]
+            a11 = linear_maps[i, 1, 1]
+            for j in range(n_offsets):
+                for y in range(patch_shape0):
+                    for x in range(patch_shape1):
+                        d0 = offsets[j, 0] + y - half_patch_shape0
+                        d1 = offsets[j, 1] + x - half_patch_shape1
+                        p0 = centres[i, 0] + a00 * d0 + a01 * d1
+                        p1 = centres[i, 1] + a10 * d0 + a11 * d1
+                        if (p0 < 0 or p1 < 0 or p0 > image_shape0 - 1 or
+                                p1 > image_shape1 - 1):
+                            continue
+                        y0 = <Py_ssize_t> p0
+                        x0 = <Py_ssize_t> p1
+                        y1 = min(y0 + 1, image_shape0 - 1)
+                        x1 = min(x0 + 1, image_shape1 - 1)
+                        w0 = p0 - y0
+                        w1 = p1 - x0
+                        for c in range(n_channels):
+                            value = (
+                                (image[c, y0, x0] * (1 - w1) +
+                                 image[c, y0, x1] * w1) * (1 - w0) +
+                                (image[c, y1, x0] * (1 - w1) +
+                                 image[c, y1, x1] * w1) * w0)
+                            if IMAGE_TYPES is float or IMAGE_TYPES is double:
+                                patches[i, j, c, y, x] = <IMAGE_TYPES> value
+                            else:
+                                # Round, rather than truncate, integral images
+                                patches[i, j, c, y, x] = \
+                                    <IMAGE_TYPES> (value + 0.5)
+
+
+cpdef extract_patches(IMAGE_TYPES[:, :, :] image,
+                      CENTRE_TYPES[:, :] centres,
+                      Py_ssize_t[:] patch_shape, Py_ssize_t[:, :] offsets):
+    dtype = dtype_from_memoryview(image)
+    patches = np.zeros([centres.shape[0], offsets.shape[0], image.shape[0],
+                        patch_shape[0], patch_shape[1]], dtype=dtype)
+    cdef IMAGE_TYPES[:, :, :, :, :] patches_view = patches
+    extract_patches_into(image, centres, patch_shape, offsets, patches_view)
     return patches
 
 
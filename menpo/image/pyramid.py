@@ -0,0 +1,305 @@
+from __future__ import division
+import numpy as np
+
+from menpo.transform import NonUniformScale
+
+from .base import Image
+from ._pyramid import separable_resample
+
+
+def _gaussian_kernel(sigma, truncate=4.0):
+    r"""
+    The normalised 1D gaussian kernel used by
+    :func:`scipy.ndimage.gaussian_filter`. A ``sigma`` of ``0`` gives the
+    identity kernel.
+    """
+    if sigma <= 0:
+        return np.ones(1)
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * x ** 2 / sigma ** 2)
+    return kernel / kernel.sum()
+
+
+def _reflect(indices, n):
+    r"""
+    Map indices outside ``[0, n - 1]`` back inside by reflecting about the
+    edges, as the ``reflect`` mode of :mod:`scipy.ndimage`.
+    """
+    indices = np.mod(indices, 2 * n)
+    return np.where(indices >= n, 2 * n - 1 - indices, indices)
+
+
+def _axis_taps(n, positions, kernel):
+    r"""
+    The taps that filter an axis of length ``n`` with ``kernel`` and then
+    linearly interpolate the result at ``positions``, clamping positions
+    outside the axis to its edges.
+
+    Returns
+    -------
+    indices : ``(n_positions, 2 * len(kernel))`` `ndarray`
+        The input indices that contribute to each position.
+    weights : ``(n_positions, 2 * len(kernel))`` `ndarray`
+        The weight of each of the ``indices``.
+    """
+    positions = np.clip(positions, 0, n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    w = (positions - lower)[:, None]
+    radius = kernel.shape[0] // 2
+    offsets = np.arange(-radius, radius + 1)
+    indices = np.hstack([_reflect(lower[:, None] + offsets, n),
+                         _reflect(upper[:, None] + offsets, n)])
+    weights = np.hstack([(1 - w) * kernel, w * kernel])
+    return (np.ascontiguousarray(indices, dtype=np.intp),
+            np.ascontiguousarray(weights, dtype=np.float64))
+
+
+def _resample(pixels, steps, shape, kernel, out):
+    r"""
+    Filter ``pixels`` with the separable ``kernel`` and sample the result on
+    a grid of the given ``shape``, where output pixel ``i`` of each axis lies
+    at input position ``i * step``.
+    """
+    taps = []
+    for n, n_out, step in zip(pixels.shape[1:], shape, steps):
+        if n_out > 1:
+            positions = np.arange(n_out) * step
+        else:
+            positions = np.zeros(n_out)
+        taps.extend(_axis_taps(n, positions, kernel))
+    separable_resample(pixels, taps[0], taps[1], taps[2], taps[3], out)
+    return out
+
+
+class _Pyramid(object):
+    r"""
+    The levels of a pyramid of a 2D image, stored consecutively in a single
+    preallocated buffer and computed on first access.
+    """
+    def __init__(self, image, n_levels, downscale):
+        if n_levels < 1:
+            raise ValueError('The number of levels must be > 0')
+        if downscale <= 0:
+            raise ValueError('The downscale factor must be > 0')
+        if image.n_dims != 2:
+            raise ValueError('Pyramids can only be built for 2D images')
+        self.image = image
+        self.n_levels = n_levels
+        self.downscale = downscale
+
+        # Replicate the shapes and index mappings of Image.rescale
+        scale = 1.0 / downscale
+        shapes = [image.shape]
+        scale_factors = [np.ones(2)]
+        for _ in range(n_levels - 1):
+            shape = np.array(shapes[-1], dtype=np.float)
+            shapes.append(tuple(np.ceil(scale * shape).astype(np.int)))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scale_factors.append((scale * shape - 1) / (shape - 1))
+        self.shapes = shapes
+        self._scale_factors = scale_factors
+        with np.errstate(divide='ignore'):
+            self._steps = [1.0 / s for s in scale_factors]
+
+        pixels = image.pixels
+        if pixels.dtype not in (np.float32, np.float64):
+            pixels = pixels.astype(np.float64)
+        self._buffer, self._levels = self._allocate(pixels.dtype)
+        self._computed = [False] * n_levels
+        self._source_pixels = pixels
+
+    def _allocate(self, dtype):
+        n_channels = self.image.n_channels
+        sizes = [n_channels * s[0] * s[1] for s in self.shapes]
+        buffer = np.empty(sum(sizes), dtype=dtype)
+        offsets = np.cumsum([0] + sizes)
+        levels = [buffer[o:o + n].reshape((n_channels,) + s)
+                  for o, n, s in zip(offsets, sizes, self.shapes)]
+        return buffer, levels
+
+    def __len__(self):
+        return self.n_levels
+
+    def __getitem__(self, level):
+        return self.level(level)
+
+    def __iter__(self):
+        for level in range(self.n_levels):
+            yield self.level(level)
+
+    def _check_level(self, level):
+        if level < 0:
+            level += self.n_levels
+        if not 0 <= level < self.n_levels:
+            raise IndexError('Level {} is out of range for a pyramid of {} '
+                             'levels'.format(level, self.n_levels))
+        return level
+
+    def _compute(self, level):
+        raise NotImplementedError()
+
+    def level_pixels(self, level):
+        r"""
+        The pixels of a level of the pyramid, computing the level (and any
+        level it depends on) if needed. The pixels are a view of the
+        pyramid's buffer.
+
+        Parameters
+        ----------
+        level : `int`
+            The level, where ``0`` is the original resolution.
+
+        Returns
+        -------
+        pixels : ``(n_channels, height, width)`` `ndarray`
+            The pixels of the level.
+        """
+        level = self._check_level(level)
+        if not self._computed[level]:
+            self._compute(level)
+            self._computed[level] = True
+        return self._levels[level]
+
+    def level(self, level):
+        r"""
+        A level of the pyramid as an :map:`Image`, whose landmarks are
+        scaled to the resolution of the level. The pixels of the image are a
+        view of the pyramid's buffer.
+
+        Parameters
+        ----------
+        level : `int`
+            The level, where ``0`` is the original resolution.
+
+        Returns
+        -------
+        image : :map:`Image`
+            The level of the pyramid.
+        """
+        level = self._check_level(level)
+        image = Image(self.level_pixels(level), copy=False)
+        if self.image.has_landmarks:
+            image.landmarks = self.image.landmarks
+            if level > 0:
+                scale = np.prod(self._scale_factors[1:level + 1], axis=0)
+                NonUniformScale(scale)._apply_inplace(image.landmarks)
+        if hasattr(self.image, 'path'):
+            image.path = self.image.path
+        return image
+
+
+class GaussianPyramid(_Pyramid):
+    r"""
+    The gaussian pyramid of a 2D image. Each level is the previous level
+    smoothed with a gaussian filter and then rescaled by ``1 / downscale``,
+    as :meth:`Image.gaussian_pyramid`. However, the smoothing and the
+    decimation are computed together as a single separable native pass per
+    level, all the levels are written into one preallocated buffer and
+    levels are only computed when they are first accessed.
+
+    Parameters
+    ----------
+    image : :map:`Image`
+        The 2D image, which is the first level of the pyramid.
+    n_levels : `int`, optional
+        Total number of levels in the pyramid, including the original image.
+    downscale : `float`, optional
+        Downscale factor between consecutive levels.
+    sigma : `float`, optional
+        Sigma of the gaussian filter. Default is ``downscale / 3.`` which
+        corresponds to a filter mask twice the size of the scale factor that
+        covers more than 99% of the gaussian distribution. If ``0``, the
+        levels are rescaled without smoothing, as :meth:`Image.pyramid`.
+
+    Raises
+    ------
+    ValueError
+        If the image is not 2D, ``n_levels < 1`` or ``downscale <= 0``.
+    """
+    def __init__(self, image, n_levels=3, downscale=2, sigma=None):
+        super(GaussianPyramid, self).__init__(image, n_levels, downscale)
+        if sigma is None:
+            sigma = downscale / 3.
+        self.sigma = sigma
+        self._kernel = _gaussian_kernel(sigma)
+
+    def _compute(self, level):
+        if level == 0:
+            self._levels[0][...] = self._source_pixels
+        else:
+            _resample(self.level_pixels(level - 1),
+                      self._steps[level], self.shapes[level],
+                      self._kernel, self._levels[level])
+
+
+class LaplacianPyramid(_Pyramid):
+    r"""
+    The laplacian pyramid of a 2D image. Every level but the last is the
+    difference between the level of the :map:`GaussianPyramid` and the next
+    level of the gaussian pyramid upsampled to its shape. The last level is
+    the last level of the gaussian pyramid. Therefore, the image can be
+    recovered with :meth:`reconstruct`.
+
+    All the levels are written into one preallocated buffer and are only
+    computed when they are first accessed.
+
+    Parameters
+    ----------
+    image : :map:`Image`
+        The 2D image.
+    n_levels : `int`, optional
+        Total number of levels in the pyramid.
+    downscale : `float`, optional
+        Downscale factor between consecutive levels.
+    sigma : `float`, optional
+        Sigma of the gaussian filter. Default is ``downscale / 3.``.
+
+    Raises
+    ------
+    ValueError
+        If the image is not 2D, ``n_levels < 1`` or ``downscale <= 0``.
+    """
+    def __init__(self, image, n_levels=3, downscale=2, sigma=None):
+        super(LaplacianPyramid, self).__init__(image, n_levels, downscale)
+        self.gaussian = GaussianPyramid(image, n_levels=n_levels,
+                                        downscale=downscale, sigma=sigma)
+        self.sigma = self.gaussian.sigma
+
+    def _expand(self, pixels, level, out):
+        # Upsample from level + 1 to level by inverting the index mapping of
+        # the downsampling
+        return _resample(pixels, self._scale_factors[level + 1],
+                         self.shapes[level], np.ones(1), out)
+
+    def _compute(self, level):
+        out = self._levels[level]
+        gaussian = self.gaussian.level_pixels(level)
+        if level == self.n_levels - 1:
+            out[...] = gaussian
+        else:
+            self._expand(self.gaussian.level_pixels(level + 1), level, out)
+            np.subtract(gaussian, out, out=out)
+
+    def reconstruct(self):
+        r"""
+        Collapse the pyramid, recovering the first level of the gaussian
+        pyramid (up to floating point error).
+
+        Returns
+        -------
+        image : :map:`Image`
+            The reconstructed image, with the landmarks of the original image.
+        """
+        pixels = self.level_pixels(self.n_levels - 1)
+        for level in range(self.n_levels - 2, -1, -1):
+            expanded = np.empty_like(self._levels[level])
+            self._expand(pixels, level, expanded)
+            pixels = expanded + self.level_pixels(level)
+        image = Image(np.array(pixels, copy=True), copy=False)
+        if self.image.has_landmarks:
+            image.landmarks = self.image.landmarks
+        if hasattr(self.image, 'path'):
+            image.path = self.image.path
+        return image
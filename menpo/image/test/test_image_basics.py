@@ -60,6 +60,56 @@ def test_boolean_image_as_masked_raises_not_implemented_error():
         b_img.as_masked()
 
 
+def test_image_as_float_uint8():
+    uint8 = menpo.io.import_builtin_asset.breakingbad_jpg(normalize=False)
+    normalized = menpo.io.import_builtin_asset.breakingbad_jpg()
+    as_float = uint8.as_float()
+    assert as_float.pixels.dtype == np.float64
+    assert_allclose(as_float.pixels, normalized.pixels)
+    assert as_float.path == uint8.path
+    assert_allclose(as_float.landmarks['PTS'].points,
+                    uint8.landmarks['PTS'].points)
+    assert uint8.pixels.dtype == np.uint8
+
+
+def test_image_as_float_float32():
+    uint8 = Image(np.array([[[0, 51], [255, 102]]], dtype=np.uint8))
+    as_float = uint8.as_float(dtype=np.float32)
+    assert as_float.pixels.dtype == np.float32
+    assert_allclose(as_float.pixels, [[[0, 0.2], [1, 0.4]]])
+
+
+def test_image_as_float_copies():
+    image = Image(np.random.rand(1, 5, 5))
+    as_float = image.as_float()
+    assert as_float is not image
+    as_float.pixels[0, 0, 0] = 7
+    assert image.pixels[0, 0, 0] != 7
+
+
+def test_masked_image_as_float():
+    mask = np.zeros((5, 5), dtype=np.bool)
+    mask[1:4, 1:4] = True
+    image = MaskedImage(np.full((1, 5, 5), 255, dtype=np.uint8), mask=mask)
+    as_float = image.as_float()
+    assert isinstance(as_float, MaskedImage)
+    assert_allclose(as_float.pixels, 1)
+    assert as_float.n_true_pixels() == 9
+    assert as_float.mask is not image.mask
+
+
+def test_image_as_float_int_dtype_raises():
+    with raises(ValueError):
+        Image(np.random.rand(1, 5, 5)).as_float(dtype=np.uint8)
+
+
+def test_warp_to_mask_preserves_dtype():
+    uint8 = menpo.io.import_builtin_asset.breakingbad_jpg(normalize=False)
+    warped = uint8.warp_to_mask(BooleanImage.init_blank((10, 10)),
+                                UniformScale(1.0, n_dims=2))
+    assert warped.pixels.dtype == np.uint8
+
+
 def test_warp_to_shape_preserves_path():
     bb = menpo.io.import_builtin_asset.breakingbad_jpg()
     bb2 = bb.rescale(0.1)
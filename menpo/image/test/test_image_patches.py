@@ -1,9 +1,10 @@
 import numpy as np
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_allclose
+from pytest import raises
 
 import menpo.io as mio
 from menpo.image.base import (Image, _convert_patches_list_to_single_array,
-                              _create_patches_image)
+                              _create_patches_image, extract_patches_batch)
 from menpo.shape import PointCloud
 
 
@@ -139,6 +140,80 @@ def test_squared_even_patches_sample_offsets():
     assert len(patches) == 136
 
 
+def test_extract_patches_batch():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    flipped = image.mirror()
+    # The second set of centres puts some patches partially outside
+    centres = [image.landmarks['PTS'].lms,
+               PointCloud(image.landmarks['PTS'].lms.points - 300)]
+    sample_offsets = np.array([[0, 0], [3, -2]])
+    patches = extract_patches_batch([image, flipped], centres,
+                                    patch_shape=(15, 16),
+                                    sample_offsets=sample_offsets,
+                                    n_workers=2)
+    assert patches.shape == (2, 68, 2, 3, 15, 16)
+    for i, (im, c) in enumerate(zip([image, flipped], centres)):
+        assert_array_equal(patches[i],
+                           im.extract_patches(c, patch_shape=(15, 16),
+                                              sample_offsets=sample_offsets))
+
+
+def test_extract_patches_batch_different_n_centres():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    with raises(ValueError):
+        extract_patches_batch([image, image],
+                              [image.landmarks['PTS'].lms,
+                               PointCloud(np.zeros((3, 2)))])
+
+
+def test_bilinear_patches_integral_centres_match_nearest():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    centres = PointCloud(np.round(image.landmarks['PTS'].lms.points))
+    sample_offsets = np.array([[0, 0], [1, -3]])
+    for patch_shape in [(16, 16), (15, 17)]:
+        nearest = image.extract_patches(centres, patch_shape=patch_shape,
+                                        sample_offsets=sample_offsets)
+        bilinear = image.extract_patches(centres, patch_shape=patch_shape,
+                                         sample_offsets=sample_offsets,
+                                         interpolation='bilinear')
+        assert_allclose(bilinear, nearest)
+
+
+def test_bilinear_patches_sub_pixel():
+    # A linear ramp is reproduced exactly by bilinear interpolation
+    ramp = np.arange(50, dtype=np.float)[None, :, None] * np.ones((1, 50, 40))
+    image = Image(ramp)
+    patches = image.extract_patches(PointCloud(np.array([[20.25, 20.]])),
+                                    patch_shape=(5, 5),
+                                    interpolation='bilinear')
+    assert_allclose(patches[0, 0, 0, :, 0], np.arange(18.25, 23.25))
+
+
+def test_bilinear_patches_transform():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    centres = PointCloud(np.round(image.landmarks['PTS'].lms.points))
+    # A rotation by 180 degrees flips the patches about their centre
+    rotated = image.extract_patches(centres, patch_shape=(15, 15),
+                                    interpolation='bilinear',
+                                    patch_transforms=-np.eye(2))
+    expected = image.extract_patches(centres, patch_shape=(15, 15))
+    assert_allclose(rotated, expected[..., ::-1, ::-1])
+
+
+def test_bilinear_patches_uint8():
+    image = mio.import_builtin_asset('breakingbad.jpg', normalize=False)
+    patches = image.extract_patches(image.landmarks['PTS'].lms,
+                                    interpolation='bilinear')
+    assert patches.dtype == np.uint8
+
+
+def test_nearest_patches_with_transforms_raises():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    with raises(ValueError):
+        image.extract_patches(image.landmarks['PTS'].lms,
+                              patch_transforms=np.eye(2))
+
+
 #######################
 # SET PATCHES TESTS
 #######################
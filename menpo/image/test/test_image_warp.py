@@ -1,10 +1,11 @@
 import numpy as np
 import menpo
 from pytest import raises
-from numpy.testing import assert_allclose, assert_almost_equal
+from numpy.testing import (assert_allclose, assert_almost_equal,
+                           assert_equal)
 from menpo.image import BooleanImage, Image, MaskedImage, OutOfMaskSampleError
 from menpo.shape import PointCloud, bounding_box
-from menpo.transform import Affine, UniformScale, Rotation
+from menpo.transform import Affine, UniformScale, Rotation, PiecewiseAffine
 import menpo.io as mio
 
 # do the import to generate the expected outputs
@@ -344,3 +345,75 @@ def test_maskedimage_retain_shape():
     rotated_img = image.rotate_ccw_about_centre(theta=77, retain_shape=True)
     assert(image.shape == rotated_img.shape)
     assert(type(rotated_img) == MaskedImage)
+
+
+def test_warp_fast_multichannel_matches_per_channel():
+    from menpo.external.skimage import _warp_fast, _warp_fast_multichannel
+    h = np.array([[0.9, 0.2, -3.5], [-0.1, 1.1, 2.25], [0., 0., 1.]])
+    for dtype in [np.float64, np.float32, np.uint8]:
+        pixels = (np.random.rand(4, 23, 31) * 255).astype(dtype)
+        for order in range(4):
+            for mode in ['constant', 'nearest', 'reflect', 'wrap']:
+                warped = _warp_fast_multichannel(
+                    pixels, h, output_shape=(17, 29), order=order, mode=mode,
+                    cval=2.)
+                assert warped.dtype == dtype
+                for w, p in zip(warped, pixels):
+                    assert_equal(w, _warp_fast(p, h, output_shape=(17, 29),
+                                               order=order, mode=mode,
+                                               cval=2.))
+
+
+def _pwa_into_template():
+    src = np.array([[0., 0.], [0., 85.], [45., 40.], [90., 0.], [90., 85.]])
+    tgt = src * 1.3 + np.array([[20., 15.], [25., 10.], [30., 40.],
+                                [18., 22.], [40., 30.]])
+    return PiecewiseAffine(PointCloud(src), PointCloud(tgt))
+
+
+def test_warp_to_mask_raster_engine():
+    pwa = _pwa_into_template()
+    mask = BooleanImage.init_blank((100, 100), fill=False)
+    mask.pixels[0, 10:85, 10:85] = True
+    for mode in ['constant', 'nearest']:
+        expected = rgb_image.warp_to_mask(mask, pwa, mode=mode, cval=0.5,
+                                          warp_landmarks=False)
+        warped = rgb_image.warp_to_mask(mask, pwa, mode=mode, cval=0.5,
+                                        warp_landmarks=False, engine='raster')
+        assert_allclose(warped.pixels, expected.pixels)
+        assert_equal(warped.mask.pixels, mask.pixels)
+
+
+def test_warp_to_shape_raster_engine():
+    pwa = _pwa_into_template()
+    image = Image(rgb_image.pixels.astype(np.float32))
+    expected = image.warp_to_shape((91, 86), pwa, order=1)
+    warped = image.warp_to_shape((91, 86), pwa, order=1, engine='raster')
+    assert warped.pixels.dtype == np.float32
+    assert_allclose(warped.pixels, expected.pixels, rtol=1e-5)
+
+
+def test_warp_raster_engine_invalid():
+    with raises(ValueError):
+        rgb_image.warp_to_shape((50, 50), _pwa_into_template(),
+                                engine='other')
+    with raises(ValueError):
+        rgb_image.warp_to_shape((50, 50), UniformScale(2, 2),
+                                engine='raster')
+    with raises(ValueError):
+        rgb_image.warp_to_shape((50, 50), _pwa_into_template(), order=3,
+                                engine='raster')
+
+
+def test_warp_raster_engine_masked_image_invalid():
+    pwa = _pwa_into_template()
+    masked = rgb_image.as_masked()
+    mask = BooleanImage.init_blank((50, 50))
+    for image in [masked, masked.mask]:
+        with raises(ValueError):
+            image.warp_to_shape((50, 50), pwa, engine='raster')
+        with raises(ValueError):
+            image.warp_to_mask(mask, pwa, engine='raster')
+    # the default engine still works
+    warped = masked.warp_to_shape((50, 50), pwa, engine='sample')
+    assert warped.shape == (50, 50)
@@ -0,0 +1,71 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from pytest import raises
+
+from menpo.image import Image, MaskedImage, GaussianPyramid, LaplacianPyramid
+from menpo.feature import gaussian_filter
+from menpo.shape import PointCloud
+
+
+def _image(shape=(61, 47), n_channels=3):
+    pixels = np.random.RandomState(1).rand(n_channels, *shape)
+    image = Image(pixels)
+    image.landmarks['test'] = PointCloud(np.array([[10., 12.], [50., 40.]]))
+    return image
+
+
+def test_gaussian_pyramid_matches_rescale():
+    image = _image()
+    expected = image.copy()
+    for level in GaussianPyramid(image, n_levels=4, downscale=2):
+        assert level.shape == expected.shape
+        assert_allclose(level.pixels, expected.pixels, atol=1e-10)
+        assert_allclose(level.landmarks['test'].lms.points,
+                        expected.landmarks['test'].lms.points)
+        expected = gaussian_filter(expected, 2 / 3.).rescale(0.5)
+
+
+def test_pyramid_non_integer_downscale_matches_rescale():
+    image = _image(shape=(40, 31), n_channels=1)
+    levels = list(image.pyramid(n_levels=3, downscale=1.7))
+    expected = image.rescale(1 / 1.7).rescale(1 / 1.7)
+    assert_allclose(levels[-1].pixels, expected.pixels, atol=1e-10)
+
+
+def test_gaussian_pyramid_float32():
+    image = Image(np.random.rand(2, 30, 30).astype(np.float32))
+    levels = list(image.gaussian_pyramid(n_levels=3))
+    assert all(l.pixels.dtype == np.float32 for l in levels)
+    assert levels[-1].shape == (8, 8)
+
+
+def test_gaussian_pyramid_lazy():
+    pyramid = GaussianPyramid(_image(), n_levels=3)
+    assert not any(pyramid._computed)
+    pyramid.level_pixels(1)
+    assert pyramid._computed == [True, True, False]
+
+
+def test_gaussian_pyramid_masked_image():
+    image = MaskedImage(np.random.rand(1, 20, 20))
+    levels = list(image.gaussian_pyramid(n_levels=2))
+    assert isinstance(levels[-1], MaskedImage)
+    assert levels[-1].shape == (10, 10)
+
+
+def test_laplacian_pyramid_reconstruct():
+    image = _image()
+    pyramid = LaplacianPyramid(image, n_levels=4)
+    assert [l.shape for l in pyramid] == pyramid.gaussian.shapes
+    assert_allclose(pyramid.reconstruct().pixels, image.pixels, atol=1e-10)
+
+
+def test_laplacian_pyramid_last_level_is_gaussian():
+    image = _image()
+    pyramid = image.laplacian_pyramid(n_levels=3)
+    assert_allclose(pyramid[-1].pixels, pyramid.gaussian[2].pixels)
+
+
+def test_gaussian_pyramid_invalid_n_levels():
+    with raises(ValueError):
+        GaussianPyramid(_image(), n_levels=0)
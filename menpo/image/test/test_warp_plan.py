@@ -0,0 +1,87 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+import menpo.io as mio
+from menpo.image import BooleanImage, Image, MaskedImage, WarpPlan
+from menpo.shape import PointCloud
+from menpo.transform import PiecewiseAffine
+
+
+takeo = mio.import_builtin_asset('takeo.ppm')
+target = takeo.landmarks['PTS'].lms
+# The source lives in a 100x100 reference frame
+source = PointCloud(target.points - target.bounds()[0] + 5)
+# A mask of the centre of the face, which lies within the source triangles
+template_mask = BooleanImage.init_blank(
+    np.ceil(source.bounds()[1]).astype(int) + 5, fill=False)
+centre = np.round(source.centre()).astype(int)
+template_mask.pixels[0, centre[0] - 20:centre[0] + 20,
+                     centre[1] - 25:centre[1] + 25] = True
+
+
+def test_warp_plan_sample_points():
+    plan = WarpPlan(template_mask, source)
+    pwa = PiecewiseAffine(source, target)
+    assert_allclose(plan.sample_points(target),
+                    pwa.apply(template_mask.true_indices()))
+    assert plan.n_points == template_mask.n_true()
+
+
+def test_warp_plan_warp_to_mask():
+    plan = WarpPlan(template_mask, source)
+    pwa = PiecewiseAffine(source, target)
+    expected = takeo.warp_to_mask(template_mask, pwa)
+    warped = plan.warp(takeo, target)
+    assert type(warped) == MaskedImage
+    assert_allclose(warped.pixels, expected.pixels)
+    assert_allclose(warped.mask.pixels, expected.mask.pixels)
+    assert_allclose(warped.landmarks['PTS'].lms.points,
+                    expected.landmarks['PTS'].lms.points)
+
+
+def test_warp_plan_warp_to_mask_out_of_bounds():
+    # Move the target partly outside of the image
+    shifted = PointCloud(target.points - [150, 0])
+    pwa = PiecewiseAffine(source, shifted)
+    expected = takeo.warp_to_mask(template_mask, pwa, cval=0.5,
+                                  warp_landmarks=False)
+    warped = WarpPlan(template_mask, source, cval=0.5).warp(
+        takeo, shifted, warp_landmarks=False)
+    assert np.any(warped.pixels == 0.5)
+    assert_allclose(warped.pixels, expected.pixels)
+
+
+def test_warp_plan_warp_to_shape():
+    # the template must lie within the source, so shrink the source's frame
+    shape = (40, 50)
+    offset = centre - [20, 25]
+    plan = WarpPlan(shape, PointCloud(source.points - offset))
+    pwa = PiecewiseAffine(PointCloud(source.points - offset), target)
+    expected = takeo.warp_to_shape(shape, pwa)
+    warped = plan.warp(takeo, target)
+    assert type(warped) == Image
+    assert_allclose(warped.pixels, expected.pixels)
+    assert_allclose(warped.landmarks['PTS'].lms.points,
+                    expected.landmarks['PTS'].lms.points)
+
+
+def test_warp_plan_masked_image_falls_back():
+    image = takeo.as_masked()
+    plan = WarpPlan(template_mask, source, order=0)
+    expected = image.warp_to_mask(template_mask,
+                                  PiecewiseAffine(source, target), order=0)
+    warped = plan.warp(image, target, warp_landmarks=False)
+    assert_allclose(warped.pixels, expected.pixels)
+
+
+def test_warp_plan_warp_keeps_dtype():
+    pwa = PiecewiseAffine(source, target)
+    plan = WarpPlan(template_mask, source)
+    for image in [mio.import_builtin_asset('takeo.ppm', normalize=False),
+                  takeo.as_float(np.float32)]:
+        expected = image.warp_to_mask(template_mask, pwa,
+                                      warp_landmarks=False)
+        warped = plan.warp(image, target, warp_landmarks=False)
+        assert warped.pixels.dtype == image.pixels.dtype
+        # rounding of halfway values can differ by floating point error
+        assert_allclose(warped.pixels, expected.pixels, atol=1)
@@ -0,0 +1,237 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from menpo.shape import PointCloud, TriMesh
+from menpo.transform import PiecewiseAffine
+
+from .base import indices_for_image_of_shape
+from .boolean import BooleanImage
+
+
+def _bilinear_sample(pixels, points, mode, cval):
+    r"""
+    Sample every channel of a 2D image at the given points with bilinear
+    interpolation, gathering all the channels at once. Matches
+    :func:`scipy_interpolation` with ``order=1``.
+
+    Parameters
+    ----------
+    pixels : ``(n_channels, M, N)`` `ndarray`
+        The image to be sampled from.
+    points : ``(n_points, 2)`` `ndarray`
+        The points to sample.
+    mode : ``{constant, nearest}``
+        Points outside the boundaries of the image are either set to ``cval``
+        or take the value of the nearest pixel.
+    cval : `float`
+        The value of points outside the image if ``mode`` is ``constant``.
+
+    Returns
+    -------
+    sampled : ``(n_channels, n_points)`` `ndarray`
+        The values of each channel at each point.
+    """
+    max_index = np.array(pixels.shape[1:]) - 1
+    if mode == 'nearest':
+        points = np.clip(points, 0, max_index)
+        outside = None
+    else:
+        outside = np.any((points < 0) | (points > max_index), axis=1)
+        points = np.clip(points, 0, max_index)
+    lower = np.floor(points).astype(np.intp)
+    upper = np.minimum(lower + 1, max_index)
+    w = points - lower
+    r0, c0 = lower.T
+    r1, c1 = upper.T
+    wr, wc = w.T
+    sampled = ((pixels[:, r0, c0] * (1 - wc) + pixels[:, r0, c1] * wc) *
+               (1 - wr) +
+               (pixels[:, r1, c0] * (1 - wc) + pixels[:, r1, c1] * wc) * wr)
+    if outside is not None:
+        sampled[:, outside] = cval
+    return sampled
+
+
+class WarpPlan(object):
+    r"""
+    A plan for repeatedly warping images into a fixed template with a
+    :map:`PiecewiseAffine` transform whose source is fixed but whose target
+    changes from warp to warp, as in the fitting of deformable models.
+
+    The pixels of the template, the triangle of the `source` that contains
+    each of them and their barycentric coordinates within it are found once,
+    when the plan is built. As the barycentric coordinates do not change, the
+    points to sample for a new target are a fixed linear combination of the
+    target's vertices, which is stored as a sparse matrix. Every warp is
+    therefore one sparse product followed by one gather of all the channels
+    of the image.
+
+    Parameters
+    ----------
+    template : :map:`BooleanImage` or `tuple`
+        Either the mask that defines the pixels to sample (as for
+        :meth:`Image.warp_to_mask`) or the shape of the result (as for
+        :meth:`Image.warp_to_shape`).
+    source : :map:`PointCloud` or :map:`TriMesh`
+        The source of the piecewise affine transforms, in the frame of the
+        template. If a :map:`PointCloud` is provided, a Delaunay
+        triangulation of it is used.
+    order : `int`, optional
+        The order of interpolation. See :meth:`Image.warp_to_mask`.
+    mode : ``{constant, nearest, reflect, wrap}``, optional
+        Points outside the boundaries of the image are filled according to
+        the given mode.
+    cval : `float`, optional
+        Used in conjunction with mode ``constant``, the value outside the
+        image boundaries.
+
+    Raises
+    ------
+    TriangleContainmentError
+        All the pixels of the template must be contained in a triangle of
+        the `source`.
+    """
+    def __init__(self, template, source, order=1, mode='constant', cval=0.):
+        if not isinstance(source, TriMesh):
+            source = TriMesh(source.points)
+        if isinstance(template, BooleanImage):
+            self.template_mask = template
+            self.template_shape = template.shape
+            template_points = template.true_indices()
+        else:
+            self.template_mask = None
+            self.template_shape = tuple(int(s) for s in template)
+            template_points = indices_for_image_of_shape(self.template_shape)
+        self.source = source
+        self.order = order
+        self.mode = mode
+        self.cval = cval
+
+        # Each point is (1 - alpha - beta) * i + alpha * j + beta * k of the
+        # vertices (i, j, k) of its triangle
+        pwa = PiecewiseAffine(source, source)
+        tri_index, alpha, beta = pwa.index_alpha_beta(template_points)
+        n_points = template_points.shape[0]
+        weights = np.vstack([1 - alpha - beta, alpha, beta]).T
+        self._barycentric_map = csr_matrix(
+            (weights.ravel(), source.trilist[tri_index].ravel(),
+             np.arange(0, 3 * n_points + 1, 3)),
+            shape=(n_points, source.n_points))
+
+    @property
+    def n_points(self):
+        r"""
+        The number of pixels of the template that are sampled.
+
+        :type: `int`
+        """
+        return self._barycentric_map.shape[0]
+
+    def transform(self, target):
+        r"""
+        The :map:`PiecewiseAffine` transform from the `source` to the given
+        target.
+
+        Parameters
+        ----------
+        target : :map:`PointCloud`
+            The target of the transform.
+
+        Returns
+        -------
+        transform : :map:`PiecewiseAffine`
+            The transform from the template to the image.
+        """
+        return PiecewiseAffine(self.source, target)
+
+    def sample_points(self, target):
+        r"""
+        The points of the image that the pixels of the template are sampled
+        from, for the given target. Identical (up to floating point error)
+        to applying :meth:`transform` to the pixels of the template.
+
+        Parameters
+        ----------
+        target : :map:`PointCloud` or ``(n_points, 2)`` `ndarray`
+            The target of the transform.
+
+        Returns
+        -------
+        points : ``(n_template_pixels, 2)`` `ndarray`
+            The points to sample.
+        """
+        if isinstance(target, PointCloud):
+            target = target.points
+        return self._barycentric_map.dot(target)
+
+    def warp(self, image, target, warp_landmarks=True):
+        r"""
+        Warp an image into the template, equivalent to
+        ``image.warp_to_mask(template, self.transform(target))`` (or
+        ``warp_to_shape``) with this plan's interpolation options.
+
+        Bilinear interpolation of :map:`Image` (but not
+        :map:`MaskedImage` or :map:`BooleanImage`) with the ``constant`` or
+        ``nearest`` modes is computed with a single gather over all the
+        channels. In any other case, the image's own warp method is used.
+        Either way, the warped image keeps the dtype of ``image``.
+
+        Parameters
+        ----------
+        image : :map:`Image`
+            The 2D image to warp.
+        target : :map:`PointCloud`
+            The target of the transform, i.e. the position of the `source`
+            within the image.
+        warp_landmarks : `bool`, optional
+            If ``True``, the result will have the same landmark dictionary as
+            ``image``, but with each landmark updated to the warped position.
+
+        Returns
+        -------
+        warped_image : :map:`Image` or :map:`MaskedImage`
+            The warped image. It is a :map:`MaskedImage` if the template is
+            a mask.
+        """
+        if (hasattr(image, 'mask') or self.order != 1 or
+                self.mode not in ('constant', 'nearest') or
+                image.n_dims != 2):
+            return self._warp_with_transform(image, target, warp_landmarks)
+
+        sampled = _bilinear_sample(image.pixels, self.sample_points(target),
+                                   self.mode, self.cval)
+        # set any nan values to 0
+        sampled[np.isnan(sampled)] = 0
+        dtype = image.pixels.dtype
+        if dtype.kind in 'iu':
+            # match the rounding of integer pixels by map_coordinates
+            sampled = np.round(sampled)
+        sampled = sampled.astype(dtype, copy=False)
+        if self.template_mask is not None:
+            warped_image = image._build_warp_to_mask(self.template_mask,
+                                                     sampled)
+            if warp_landmarks and image.has_landmarks:
+                warped_image.landmarks = image.landmarks
+                self.transform(target).pseudoinverse()._apply_inplace(
+                    warped_image.landmarks)
+            if hasattr(image, 'path'):
+                warped_image.path = image.path
+            return warped_image
+        else:
+            warped_pixels = sampled.reshape((image.n_channels,) +
+                                            self.template_shape)
+            transform = self.transform(target) if warp_landmarks else None
+            return image._build_warp_to_shape(warped_pixels, transform,
+                                              warp_landmarks, False)
+
+    def _warp_with_transform(self, image, target, warp_landmarks):
+        kwargs = dict(warp_landmarks=warp_landmarks, mode=self.mode,
+                      cval=self.cval)
+        if not isinstance(image, BooleanImage):
+            kwargs['order'] = self.order
+        transform = self.transform(target)
+        if self.template_mask is not None:
+            return image.warp_to_mask(self.template_mask, transform, **kwargs)
+        else:
+            return image.warp_to_shape(self.template_shape, transform,
+                                       **kwargs)
@@ -3,10 +3,11 @@ from .input import (
     import_video, import_videos, video_paths,
     import_landmark_file, import_landmark_files, landmark_file_paths,
     import_pickle, import_pickles, pickle_paths,
+    import_image_dataset,
     import_builtin_asset, data_dir_path, data_path_to, ls_builtin_assets,
     register_image_importer, register_landmark_importer,
     register_pickle_importer, register_video_importer
 )
 from .output import (export_image, export_video,
-                     export_landmark_file, export_pickle)
+                     export_landmark_file, export_pickle, export_image_dataset)
 from .exceptions import OverwriteError
@@ -3,6 +3,7 @@ from .base import (
     import_video, import_videos, video_paths,
     import_landmark_file, import_landmark_files, landmark_file_paths,
     import_pickle, import_pickles, pickle_paths,
+    import_image_dataset,
     import_builtin_asset,
     menpo_data_path_to as data_path_to,
     menpo_data_dir_path as data_dir_path,
@@ -11,3 +12,4 @@ from .base import (
     register_pickle_importer, register_video_importer,
     same_name, same_name_video, resolve_from_paths
 )
+from .directory_index import DirectoryIndex, directory_index
@@ -15,7 +15,8 @@ from menpo.visualize import print_progress
 from ..utils import (_norm_path, _possible_extensions_from_filepath,
                      _normalize_extension)
 from .extensions import (image_landmark_types, image_types, pickle_types,
-                         ffmpeg_video_types)
+                         ffmpeg_video_types, image_dataset_types)
+from .directory_index import directory_index
 
 
 # TODO: Remove once deprecated
@@ -224,29 +225,73 @@ def merge_all_dicts(dicts):
     return new_dict
 
 
-def same_name(path, paths_callable=landmark_file_paths):
+def _indexed_landmark_file_paths(directory, stem, index=None):
+    r"""
+    Return the landmark file filepaths that Menpo can import in the given
+    directory that match the glob ``'{stem}.*'``. The directory is listed once
+    and then cached by the `DirectoryIndex` rather than globbed per call.
+    """
+    if index is None:
+        index = directory_index
+    paths = sorted(index.paths_with_stem(directory, stem).values())
+    return [p for p in paths if _has_suffix(p, image_landmark_types)]
+
+
+def same_name(path, paths_callable=None, index=None):
     r"""
     Default image landmark resolver. Returns all landmarks found to have
     the same stem as the asset.
+
+    If ``paths_callable`` is ``None``, the landmark files are found via an
+    index of the asset's directory, which is only rebuilt when the directory
+    is modified. Otherwise, ``paths_callable`` is called with the glob
+    pattern finding all files with the same stem as the asset.
+
+    The index used is ``index`` or, if ``None``, the shared index
+    ``menpo.io.input.directory_index``. To cache the listings of large
+    directories on disk across sessions, provide an index with a
+    ``cache_dir`` when importing, e.g. ::
+
+        from functools import partial
+        from menpo.io.input import DirectoryIndex, same_name
+        index = DirectoryIndex(cache_dir='~/.menpo_index_cache')
+        images = mio.import_images(
+            path, landmark_resolver=partial(same_name, index=index))
     """
-    # pattern finding all landmarks with the same stem
-    pattern = path.with_suffix('.*')
+    if paths_callable is None:
+        lmark_paths = _indexed_landmark_file_paths(path.parent, path.stem,
+                                                   index=index)
+    else:
+        # pattern finding all landmarks with the same stem
+        lmark_paths = paths_callable(path.with_suffix('.*'))
     # find all the assets we can with this name
-    lmarks = [import_landmark_file(p) for p in paths_callable(pattern)]
+    lmarks = [import_landmark_file(p) for p in lmark_paths]
     # now we have to merge all the dictionaries into a single dictionary
     return merge_all_dicts(lmarks)
 
 
-def same_name_video(path, frame_number,
-                    paths_callable=landmark_file_paths):
+def same_name_video(path, frame_number, paths_callable=None, index=None):
     r"""
     Default video landmark resolver. Returns all landmarks found to have
     the same stem as the asset.
+
+    If ``paths_callable`` is ``None``, the landmark files are found via an
+    index of the asset's directory, which is only rebuilt when the directory
+    is modified. Otherwise, ``paths_callable`` is called with the glob
+    pattern finding all files with the same stem as the frame.
+
+    The index used is ``index`` or, if ``None``, the shared index
+    ``menpo.io.input.directory_index`` (see :func:`same_name`).
     """
-    # pattern finding all landmarks with the same stem
-    pattern = path.with_name('{}_{}.*'.format(path.stem, frame_number))
+    stem = '{}_{}'.format(path.stem, frame_number)
+    if paths_callable is None:
+        lmark_paths = _indexed_landmark_file_paths(path.parent, stem,
+                                                   index=index)
+    else:
+        # pattern finding all landmarks with the same stem
+        lmark_paths = paths_callable(path.with_name(stem + '.*'))
     # find all the assets we can with this name
-    lmarks = [import_landmark_file(p) for p in paths_callable(pattern)]
+    lmarks = [import_landmark_file(p) for p in lmark_paths]
     # now we have to merge all the dictionaries into a single dictionary
     return merge_all_dicts(lmarks)
 
@@ -328,9 +373,10 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
         to floating point. If false, the native datatype of the image will be
         maintained (commonly `uint8`). Note that in general Menpo assumes
         :map:`Image` instances contain floating point data - if you disable
-        this flag you will have to manually convert the images you import to
-        floating point before doing most Menpo operations. This however can be
-        useful to save on memory usage if you only wish to view or crop images.
+        this flag you will have to convert the images you import to
+        floating point (see :meth:`Image.as_float`) before doing most Menpo
+        operations. This however can be useful to save on memory usage if you
+        only wish to view, crop or extract patches from images.
     normalise: `bool`, optional
         Deprecated version of normalize. Please use the normalize arg.
 
@@ -484,8 +530,49 @@ def import_pickle(filepath, **kwargs):
     return _import(filepath, pickle_types, importer_kwargs=kwargs)
 
 
+def import_image_dataset(filepath, mmap_mode='r'):
+    r"""Import a Menpo image dataset, as exported by
+    :map:`export_image_dataset`.
+
+    Returns a :map:`LazyList` of images whose pixels are ``np.memmap`` views
+    directly into the dataset file - no pixel data is copied. Therefore,
+    indexing into the returned list is very cheap and many processes reading
+    the same dataset share a single copy of it in the OS page cache. Any
+    landmarks exported with the images are attached.
+
+    Parameters
+    ----------
+    filepath : `pathlib.Path` or `str`
+        A relative or absolute filepath to a ``.mds`` file.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode the dataset is memory mapped with. If ``'r'``, the pixels are
+        read-only. If ``'r+'``, changes to the pixels are written back to the
+        dataset. If ``'c'`` (copy-on-write), changes to the pixels are only
+        held in memory.
+
+    Returns
+    -------
+    images : :map:`LazyList` of :map:`Image`
+        A lazy list of the images in the dataset.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a Menpo image dataset.
+
+    Examples
+    --------
+    >>> images = menpo.io.import_images('./massive_image_db/*')
+    >>> menpo.io.export_image_dataset(images, './massive_image_db.mds')
+    >>> images = menpo.io.import_image_dataset('./massive_image_db.mds')
+    """
+    return _import(filepath, image_dataset_types,
+                   importer_kwargs={'mmap_mode': mmap_mode})
+
+
 def import_pickles(pattern, max_pickles=None, shuffle=False,
-                   as_generator=False, verbose=False, **kwargs):
+                   as_generator=False, verbose=False, n_workers=None,
+                   **kwargs):
     r"""Multiple pickle importer.
 
     Menpo unambiguously uses ``.pkl`` as it's choice of extension for Pickle
@@ -519,6 +606,13 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    n_workers : `int`, optional
+        If not ``None``, the pickles are imported concurrently by this
+        number of threads. A bounded number of pickles are imported
+        ahead of the consumer and they are always yielded in the same order as
+        a serial import. Only valid if ``as_generator`` is ``True`` - the
+        items of a :map:`LazyList` can be imported concurrently by iterating
+        over :map:`LazyList.prefetch`.
 
     Returns
     -------
@@ -537,13 +631,15 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
         max_assets=max_pickles, shuffle=shuffle,
         as_generator=as_generator,
         verbose=verbose,
+        n_workers=n_workers,
         importer_kwargs=kwargs
     )
 
 
 def import_images(pattern, max_images=None, shuffle=False,
                   landmark_resolver=same_name, normalize=None,
-                  normalise=None, as_generator=False, verbose=False):
+                  normalise=None, as_generator=False, verbose=False,
+                  n_workers=None):
     r"""Multiple image (and associated landmarks) importer.
 
     For each image found creates an importer than returns a :map:`Image` or
@@ -582,9 +678,10 @@ def import_images(pattern, max_images=None, shuffle=False,
         to floating point. If false, the native datatype of the image will be
         maintained (commonly `uint8`). Note that in general Menpo assumes
         :map:`Image` instances contain floating point data - if you disable
-        this flag you will have to manually convert the images you import to
-        floating point before doing most Menpo operations. This however can be
-        useful to save on memory usage if you only wish to view or crop images.
+        this flag you will have to convert the images you import to
+        floating point (see :meth:`Image.as_float`) before doing most Menpo
+        operations. This however can be useful to save on memory usage if you
+        only wish to view, crop or extract patches from images.
     normalise : `bool`, optional
         Deprecated version of normalize. Please use the normalize arg.
     as_generator : `bool`, optional
@@ -593,6 +690,13 @@ def import_images(pattern, max_images=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    n_workers : `int`, optional
+        If not ``None``, the images are imported concurrently by this
+        number of threads (including resolving their landmarks). A bounded
+        number of images are imported ahead of the consumer and they are
+        always yielded in the same order as a serial import. Only valid if
+        ``as_generator`` is ``True`` - the items of a :map:`LazyList` can be
+        imported concurrently by iterating over :map:`LazyList.prefetch`.
 
     Returns
     -------
@@ -625,6 +729,7 @@ def import_images(pattern, max_images=None, shuffle=False,
         landmark_attach_func=_import_object_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
+        n_workers=n_workers,
         importer_kwargs=kwargs
     )
 
@@ -632,7 +737,8 @@ def import_images(pattern, max_images=None, shuffle=False,
 def import_videos(pattern, max_videos=None, shuffle=False,
                   landmark_resolver=same_name_video, normalize=None,
                   normalise=None, importer_method='ffmpeg',
-                  exact_frame_count=True, as_generator=False, verbose=False):
+                  exact_frame_count=True, as_generator=False, verbose=False,
+                  n_workers=None):
     r"""Multiple video (and associated landmarks) importer.
 
     For each video found yields a :map:`LazyList`. By default, landmark files
@@ -698,6 +804,13 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    n_workers : `int`, optional
+        If not ``None``, the videos are imported concurrently by this
+        number of threads (including resolving their landmarks). A bounded
+        number of videos are imported ahead of the consumer and they are
+        always yielded in the same order as a serial import. Only valid if
+        ``as_generator`` is ``True`` - the items of a :map:`LazyList` can be
+        imported concurrently by iterating over :map:`LazyList.prefetch`.
 
     Returns
     -------
@@ -738,12 +851,13 @@ def import_videos(pattern, max_videos=None, shuffle=False,
         landmark_attach_func=_import_lazylist_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
+        n_workers=n_workers,
         importer_kwargs=kwargs
     )
 
 
 def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
-                          as_generator=False, verbose=False):
+                          as_generator=False, verbose=False, n_workers=None):
     r"""Import Multiple landmark files.
 
     For each landmark file found returns an importer then
@@ -773,6 +887,13 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
         one after another when the generator is iterated over.
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported.
+    n_workers : `int`, optional
+        If not ``None``, the landmark files are imported concurrently by this
+        number of threads. A bounded number of landmark files are imported
+        ahead of the consumer and they are always yielded in the same order as
+        a serial import. Only valid if ``as_generator`` is ``True`` - the
+        items of a :map:`LazyList` can be imported concurrently by iterating
+        over :map:`LazyList.prefetch`.
 
     Returns
     -------
@@ -788,14 +909,19 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
     """
     return _import_glob_lazy_list(pattern, image_landmark_types,
                                   max_assets=max_landmarks, shuffle=shuffle,
-                                  as_generator=as_generator, verbose=verbose)
+                                  as_generator=as_generator, verbose=verbose,
+                                  n_workers=n_workers)
 
 
 def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
                            landmark_resolver=same_name, shuffle=False,
                            as_generator=False, landmark_ext_map=None,
                            landmark_attach_func=None, importer_kwargs=None,
-                           verbose=False):
+                           verbose=False, n_workers=None):
+    if n_workers is not None and not as_generator:
+        raise ValueError('n_workers is only supported when as_generator is '
+                         'True - use LazyList.prefetch to concurrently import '
+                         'the items of a LazyList.')
     filepaths = list(glob_with_suffix(pattern, extension_map,
                                       sort=(not shuffle)))
     if shuffle:
@@ -817,6 +943,10 @@ def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
                                   importer_kwargs=importer_kwargs)
                           for f in filepaths])
 
+    if n_workers is not None:
+        # import concurrently, but always yield in the order of the glob
+        lazy_list = lazy_list.prefetch(n_workers=n_workers)
+
     if verbose and as_generator:
         # wrap the generator with the progress reporter
         lazy_list = print_progress(lazy_list, prefix='Importing assets',
@@ -1023,11 +1153,19 @@ def glob_with_suffix(pattern, extensions_map, sort=True):
         The list of filepaths that have valid extensions.
     """
     for path in _pathlib_glob_for_pattern(pattern, sort=sort):
-        possible_exts = _possible_extensions_from_filepath(path)
-        if any([ext in extensions_map for ext in possible_exts]):
+        if _has_suffix(path, extensions_map):
             yield path
 
 
+def _has_suffix(filepath, extensions_map):
+    r"""
+    Whether any of the possible extensions of the filepath have an importer
+    given in `extensions_map`.
+    """
+    possible_exts = _possible_extensions_from_filepath(filepath)
+    return any([ext in extensions_map for ext in possible_exts])
+
+
 def importer_for_filepath(filepath, extensions_map):
     r"""
     Given a filepath, return the appropriate importer as mapped by the
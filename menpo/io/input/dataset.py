@@ -0,0 +1,146 @@
+import json
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+from pathlib import Path
+
+from menpo.base import LazyList
+from menpo.image import Image, MaskedImage, BooleanImage
+from menpo.shape import PointUndirectedGraph, PointDirectedGraph, TriMesh
+from ..utils import _DATASET_MAGIC
+from .landmark import _ljson_group_to_shape
+
+
+_FOOTER_SIZE = 8 + len(_DATASET_MAGIC)
+_GRAPH_TYPES = {'PointUndirectedGraph': PointUndirectedGraph,
+                'PointDirectedGraph': PointDirectedGraph}
+
+
+class _MappedDataset(object):
+    r"""
+    A lazily created memory map of an entire image dataset file. The map is
+    only created on first access (and is never pickled) so that every process
+    using a dataset maps the file itself and shares the OS page cache.
+    """
+
+    def __init__(self, filepath, mmap_mode):
+        self.filepath = filepath
+        self.mmap_mode = mmap_mode
+        self._buffer = None
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            self._buffer = np.memmap(str(self.filepath), dtype=np.uint8,
+                                     mode=self.mmap_mode)
+        return self._buffer
+
+    def array(self, block):
+        r"""
+        A zero-copy ``np.memmap`` view of an array stored in the dataset.
+        """
+        dtype = np.dtype(block['dtype'])
+        shape = tuple(block['shape'])
+        start = block['offset']
+        stop = start + dtype.itemsize * int(np.prod(shape))
+        return self.buffer[start:stop].view(dtype).reshape(shape)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_buffer'] = None
+        return state
+
+
+def _read_dataset_header(filepath):
+    with open(str(filepath), 'rb') as f:
+        magic = f.read(len(_DATASET_MAGIC))
+        f.seek(-_FOOTER_SIZE, 2)
+        footer = f.read(_FOOTER_SIZE)
+        if magic != _DATASET_MAGIC or footer[8:] != _DATASET_MAGIC:
+            raise ValueError('{} is not a Menpo image dataset'.format(filepath))
+        header_size = int(np.frombuffer(footer[:8], dtype='<u8')[0])
+        f.seek(-(_FOOTER_SIZE + header_size), 2)
+        header = f.read(header_size)
+    return json.loads(header.decode('utf-8'), object_pairs_hook=OrderedDict)
+
+
+def _structure_to_shape(points, structure):
+    shape_type = structure['type']
+    landmarks = structure['landmarks']
+    if shape_type == 'TriMesh':
+        trilist = np.array(landmarks['trilist']).reshape(-1, 3)
+        return TriMesh(points, trilist=trilist, copy=False)
+    elif shape_type in _GRAPH_TYPES:
+        edges = np.array(landmarks['connectivity'],
+                         dtype=np.int64).reshape(-1, 2)
+        return _GRAPH_TYPES[shape_type].init_from_edges(points, edges,
+                                                        copy=False)
+    else:
+        # PointCloud and LabelledPointUndirectedGraph are stored exactly as
+        # in LJSON
+        return _ljson_group_to_shape(points, structure)
+
+
+def _image_from_entry(dataset, structures, entry):
+    pixels = dataset.array(entry['pixels'])
+    image_class = entry['class']
+    if image_class == 'BooleanImage':
+        image = BooleanImage(pixels[0], copy=False)
+    elif image_class == 'MaskedImage':
+        image = MaskedImage(pixels, mask=dataset.array(entry['mask']),
+                            copy=False)
+    else:
+        image = Image(pixels, copy=False)
+    for group, lms in entry['landmarks'].items():
+        # Landmarks are tiny, so they are copied into memory rather than
+        # left mapped
+        points = np.array(dataset.array(lms['points']))
+        image.landmarks[group] = _structure_to_shape(
+            points, structures[lms['structure']])
+    if entry['path'] is not None:
+        image.path = Path(entry['path'])
+    return image
+
+
+def image_dataset_importer(filepath, asset=None, mmap_mode='r', **kwargs):
+    r"""
+    Imports a Menpo image dataset, as exported by :map:`export_image_dataset`.
+
+    The pixels of every image are ``np.memmap`` views directly into the file,
+    so no pixel data is read or copied until it is accessed, and processes
+    reading the same dataset share a single copy of it in the OS page cache.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the dataset.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode the dataset is memory mapped with. If ``'r'``, the pixels are
+        read-only. If ``'r+'``, changes to the pixels are written back to the
+        dataset. If ``'c'`` (copy-on-write), changes to the pixels are only
+        held in memory.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    images : :map:`LazyList` of :map:`Image`
+        A lazy list of the images (with their landmarks) in the dataset.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a Menpo image dataset or is of an unknown version.
+    """
+    header = _read_dataset_header(filepath)
+    if header.get('version') != 1:
+        raise ValueError('{} has unknown version {} - must be '
+                         '1.'.format(filepath, header.get('version')))
+    dataset = _MappedDataset(filepath, mmap_mode)
+    structures = header['structures']
+    return LazyList([partial(_image_from_entry, dataset, structures, entry)
+                     for entry in header['images']])
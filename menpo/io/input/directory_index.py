@@ -0,0 +1,145 @@
+import hashlib
+import os
+import pickle
+import threading
+
+from ..utils import _norm_path
+
+
+def _list_files(directory):
+    r"""
+    List the names of the files (not sub-directories) in a directory with a
+    single call to the filesystem, where possible.
+    """
+    try:
+        scandir = os.scandir
+    except AttributeError:
+        # Python 2 - os.listdir cannot distinguish files from directories
+        # without a stat per entry, so we accept directories in the index.
+        return os.listdir(directory)
+    else:
+        return [e.name for e in scandir(directory) if e.is_file()]
+
+
+def _directory_mtime(directory):
+    stat = os.stat(directory)
+    return getattr(stat, 'st_mtime_ns', stat.st_mtime)
+
+
+class DirectoryIndex(object):
+    r"""
+    An index of the files within directories, keyed by filename stem. Each
+    directory is listed once and then every file is indexed by each of the
+    prefixes of its name that end before a ``'.'``. Therefore, the file
+    ``'image.pts'`` can be found via the stem ``'image'`` and the file
+    ``'image.pkl.gz'`` can be found via both the stems ``'image'`` and
+    ``'image.pkl'``. This mirrors the results of globbing for ``'{stem}.*'``
+    but only requires a single listing of the directory, rather than one glob
+    per query.
+
+    The index of a directory is automatically rebuilt if the modification time
+    of the directory changes (i.e. files are added, removed or renamed). If a
+    ``cache_dir`` is provided, the listing of each directory is also cached to
+    disk, keyed by the directory's modification time, so that very large
+    directories only need to be listed once across sessions.
+
+    Parameters
+    ----------
+    cache_dir : `pathlib.Path` or `str`, optional
+        If not ``None``, the directory in which directory listings are cached.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, directory):
+        key = hashlib.sha1(str(directory).encode('utf-8')).hexdigest()
+        return _norm_path(self.cache_dir) / '{}.pkl'.format(key)
+
+    def _list_files_cached(self, directory, mtime):
+        if self.cache_dir is None:
+            return _list_files(str(directory))
+        cache_path = self._cache_path(directory)
+        try:
+            with cache_path.open('rb') as f:
+                cached_mtime, names = pickle.load(f)
+            if cached_mtime == mtime:
+                return names
+        except (IOError, OSError, EOFError, ValueError, pickle.PickleError):
+            pass  # Missing or corrupt cache - rebuild it
+        names = _list_files(str(directory))
+        if not cache_path.parent.is_dir():
+            cache_path.parent.mkdir(parents=True)
+        with cache_path.open('wb') as f:
+            pickle.dump((mtime, names), f, protocol=2)
+        return names
+
+    def _build_index(self, directory, mtime):
+        index = {}
+        for name in self._list_files_cached(directory, mtime):
+            # Index the file by every prefix of its name that ends before a
+            # '.', storing the remainder of the name as the extension.
+            start = name.find('.', 1)
+            while start != -1:
+                stem, ext = name[:start], name[start:]
+                index.setdefault(stem, {})[ext] = directory / name
+                start = name.find('.', start + 1)
+        return index
+
+    def _index_for_directory(self, directory):
+        directory = _norm_path(directory)
+        mtime = _directory_mtime(str(directory))
+        with self._lock:
+            entry = self._indexes.get(directory)
+            if entry is None or entry[0] != mtime:
+                entry = (mtime, self._build_index(directory, mtime))
+                self._indexes[directory] = entry
+        return entry[1]
+
+    def paths_with_stem(self, directory, stem):
+        r"""
+        The files in ``directory`` whose name is ``stem`` followed by an
+        extension.
+
+        Parameters
+        ----------
+        directory : `pathlib.Path` or `str`
+            The directory to search.
+        stem : `str`
+            The stem of the filenames to find.
+
+        Returns
+        -------
+        paths : `dict` {`str`: `pathlib.Path`}
+            Mapping from extension (with leading ``'.'``) to path, for every
+            file in ``directory`` that matches the glob ``'{stem}.*'``.
+            Empty if ``directory`` does not exist.
+        """
+        try:
+            index = self._index_for_directory(directory)
+        except OSError:
+            return {}
+        return dict(index.get(stem, {}))
+
+    def invalidate(self, directory=None):
+        r"""
+        Remove directories from the index, forcing them to be listed again
+        on the next query.
+
+        Parameters
+        ----------
+        directory : `pathlib.Path` or `str`, optional
+            The directory to remove. If ``None``, all directories are
+            removed.
+        """
+        with self._lock:
+            if directory is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(_norm_path(directory), None)
+
+
+# The index consulted by the default landmark resolvers.
+directory_index = DirectoryIndex()
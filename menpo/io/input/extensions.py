@@ -3,6 +3,7 @@ from .image import pillow_importer, abs_importer, flo_importer
 from .video import ffmpeg_types, ffmpeg_importer
 from .landmark_image import asf_image_importer, pts_image_importer
 from .pickle import pickle_importer, pickle_gzip_importer
+from .dataset import image_dataset_importer
 
 
 image_types = {'.bmp': pillow_importer,
@@ -43,3 +44,5 @@ image_landmark_types = {'.asf': asf_image_importer,
 
 pickle_types = {'.pkl': pickle_importer,
                 '.pkl.gz': pickle_gzip_importer}
+
+image_dataset_types = {'.mds': image_dataset_importer}
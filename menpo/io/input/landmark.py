@@ -338,28 +338,32 @@ def _parse_ljson_v2(lms_dict):
     return {'LJSON': lmarks}
 
 
+def _ljson_group_to_shape(points, lms_dict_group):
+    connectivity = lms_dict_group['landmarks'].get('connectivity')
+    # TODO: create the metadata label!
+
+    if connectivity is None and len(lms_dict_group['labels']) == 0:
+        return PointCloud(points)
+    else:
+        # masks into the pointcloud per label
+        labels_to_mask = OrderedDict()
+        n_points = points.shape[0]
+        for label in lms_dict_group['labels']:
+            mask = np.zeros(n_points, dtype=np.bool)
+            mask[label['mask']] = True
+            labels_to_mask[label['label']] = mask
+
+        # Note that we can pass connectivity as None here and the edges
+        # will be empty.
+        return LabelledPointUndirectedGraph.init_from_edges(
+            points, connectivity, labels_to_mask)
+
+
 def _parse_ljson_v3(lms_dict):
     all_lms = {}
     for key, lms_dict_group in lms_dict['groups'].items():
         points = _ljson_parse_null_values(lms_dict_group['landmarks']['points'])
-        connectivity = lms_dict_group['landmarks'].get('connectivity')
-        # TODO: create the metadata label!
-
-        if connectivity is None and len(lms_dict_group['labels']) == 0:
-            all_lms[key] = PointCloud(points)
-        else:
-            # masks into the pointcloud per label
-            labels_to_mask = OrderedDict()
-            n_points = points.shape[0]
-            for label in lms_dict_group['labels']:
-                mask = np.zeros(n_points, dtype=np.bool)
-                mask[label['mask']] = True
-                labels_to_mask[label['label']] = mask
-
-            # Note that we can pass connectivity as None here and the edges
-            # will be empty.
-            all_lms[key] = LabelledPointUndirectedGraph.init_from_edges(
-                    points, connectivity, labels_to_mask)
+        all_lms[key] = _ljson_group_to_shape(points, lms_dict_group)
     return all_lms
 
 
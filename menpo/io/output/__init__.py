@@ -1,2 +1,2 @@
 from .base import (export_landmark_file, export_image, export_pickle,
-                   export_video)
+                   export_video, export_image_dataset)
@@ -4,7 +4,8 @@ from functools import partial
 from pathlib import Path
 
 from menpo.compatibility import basestring, str
-from .extensions import landmark_types, image_types, pickle_types, video_types
+from .extensions import (landmark_types, image_types, pickle_types,
+                         video_types, image_dataset_types)
 from ..exceptions import OverwriteError
 from ..utils import (_norm_path, _possible_extensions_from_filepath,
                      _normalize_extension)
@@ -227,6 +228,45 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
                 exporter_kwargs=exporter_kwargs)
 
 
+def export_image_dataset(images, fp, overwrite=False):
+    r"""
+    Exports a collection of images, and their landmarks, as a Menpo image
+    dataset. Menpo uses ``.mds`` as the extension for image datasets.
+
+    Unlike pickling a list of images, an image dataset stores every pixel
+    array contiguously and aligned on disk. Therefore, on import (see
+    :map:`import_image_dataset`) the pixels of each image are memory mapped
+    directly from the file without being copied, and many processes can share
+    a dataset through the OS page cache.
+
+    The ``fp`` argument can be either a `Path` or any Python type that acts
+    like a file. The images are iterated over only once, so a
+    :map:`LazyList` of images can be exported without loading every image
+    into memory at the same time.
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image`
+        The images to export. :map:`MaskedImage` and :map:`BooleanImage`
+        instances are also supported.
+    fp : `Path` or `file`-like object
+        The Path or file-like object to save the dataset at/into.
+    overwrite : `bool`, optional
+        Whether or not to overwrite a file if it already exists.
+
+    Raises
+    ------
+    ValueError
+        File already exists and ``overwrite`` != ``True``
+    ValueError
+        ``fp`` is a `str` and the extension is not ``.mds``
+    ValueError
+        An item of ``images`` is not an :map:`Image`, :map:`MaskedImage` or
+        :map:`BooleanImage`.
+    """
+    _export(images, fp, image_dataset_types, '.mds', overwrite)
+
+
 def _extension_to_export_function(extension, extensions_map):
     r"""
     Simple function that wraps the extensions map indexing and raises
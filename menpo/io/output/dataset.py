@@ -0,0 +1,130 @@
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from menpo.image import Image, MaskedImage, BooleanImage
+from menpo.shape import (PointCloud, PointUndirectedGraph, PointDirectedGraph,
+                         LabelledPointUndirectedGraph, TriMesh)
+from ..utils import _DATASET_MAGIC, _DATASET_ALIGNMENT
+
+
+class _BlockWriter(object):
+    r"""
+    Writes aligned arrays to a file handle, keeping track of the offset at
+    which each array is written so that they can later be memory mapped.
+    """
+
+    def __init__(self, file_handle):
+        self.file_handle = file_handle
+        self.offset = 0
+
+    def write(self, data):
+        self.file_handle.write(data)
+        self.offset += len(data)
+
+    def align(self):
+        self.write(b'\x00' * (-self.offset % _DATASET_ALIGNMENT))
+
+    def write_array(self, array):
+        array = np.ascontiguousarray(array)
+        self.align()
+        block = OrderedDict([('offset', self.offset),
+                             ('shape', list(array.shape)),
+                             ('dtype', array.dtype.str)])
+        self.write(array.tobytes())
+        return block
+
+
+def _image_class_name(image):
+    # Check subclasses first, as BooleanImage and MaskedImage are both Images
+    for cls in (BooleanImage, MaskedImage, Image):
+        if isinstance(image, cls):
+            return cls.__name__
+    raise ValueError('Only Image, MaskedImage and BooleanImage instances can '
+                     'be exported to an image dataset - '
+                     '{} provided'.format(type(image)))
+
+
+def _landmark_structure(lms):
+    # The exact shape type is stored so that it can be rebuilt on import -
+    # subclasses (e.g. textured meshes) carry state we cannot store here.
+    shape_type = type(lms)
+    if shape_type in (PointCloud, LabelledPointUndirectedGraph,
+                      PointUndirectedGraph, PointDirectedGraph):
+        structure = lms.tojson()
+        del structure['landmarks']['points']
+    elif shape_type is TriMesh:
+        structure = OrderedDict([('labels', []),
+                                 ('landmarks',
+                                  {'trilist': lms.trilist.tolist()})])
+    else:
+        raise ValueError('Only PointCloud, PointUndirectedGraph, '
+                         'PointDirectedGraph, LabelledPointUndirectedGraph '
+                         'and TriMesh landmarks can be exported to an image '
+                         'dataset - {} provided'.format(shape_type))
+    structure['type'] = shape_type.__name__
+    return structure
+
+
+def image_dataset_exporter(images, file_handle, **kwargs):
+    r"""
+    Given a file handle to write in to (which should act like a Python `file`
+    object), write out a collection of images and their landmarks in the
+    Menpo image dataset format. No value is returned.
+
+    The format consists of every pixel array (and mask), followed by every
+    landmark points array, stored contiguously and aligned so that they can be
+    memory mapped without copying on import. The file ends with a JSON header
+    describing the location of each array and any landmark labels or
+    connectivity. As the header is written last, the images are only iterated
+    over once and so can be provided lazily (e.g. as a :map:`LazyList`).
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image`
+        The images to write out.
+    file_handle : `file`-like object
+        The file to write in to
+
+    Raises
+    ------
+    ValueError
+        If an image or landmark group is of a type that cannot be stored in
+        an image dataset.
+    """
+    writer = _BlockWriter(file_handle)
+    writer.write(_DATASET_MAGIC)
+
+    # Landmark labels and connectivity are commonly shared by every image in
+    # a dataset, so each unique structure is only stored once.
+    structures = OrderedDict()
+    entries = []
+    for image in images:
+        entry = OrderedDict()
+        entry['class'] = _image_class_name(image)
+        entry['pixels'] = writer.write_array(image.pixels)
+        if entry['class'] == 'MaskedImage':
+            entry['mask'] = writer.write_array(image.mask.pixels[0])
+        landmarks = OrderedDict()
+        if image.has_landmarks:
+            for group, lms in image.landmarks.items():
+                structure = json.dumps(_landmark_structure(lms),
+                                       sort_keys=True)
+                landmarks[group] = OrderedDict([
+                    ('points', writer.write_array(lms.points)),
+                    ('structure', structures.setdefault(structure,
+                                                        len(structures)))])
+        entry['landmarks'] = landmarks
+        path = getattr(image, 'path', None)
+        entry['path'] = None if path is None else str(path)
+        entries.append(entry)
+
+    header = OrderedDict([('version', 1),
+                          ('structures', [json.loads(s) for s in structures]),
+                          ('images', entries)])
+    header = json.dumps(header).encode('utf-8')
+    writer.align()
+    writer.write(header)
+    writer.write(np.array(len(header), dtype='<u8').tobytes())
+    writer.write(_DATASET_MAGIC)
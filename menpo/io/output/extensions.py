@@ -4,6 +4,7 @@ from .landmark import ljson_exporter, pts_exporter
 from .image import pil_exporter
 from .video import ffmpeg_video_exporter
 from .pickle import pickle_exporter
+from .dataset import image_dataset_exporter
 
 
 landmark_types = {
@@ -53,3 +54,8 @@ video_types = {
     '.wmv': ffmpeg_video_exporter,
     '.gif': partial(ffmpeg_video_exporter, codec=None)
 }
+
+
+image_dataset_types = {
+    '.mds': image_dataset_exporter
+}
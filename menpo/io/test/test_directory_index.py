@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+
+from menpo.io.input import DirectoryIndex
+
+
+def _touch(directory, name):
+    open(os.path.join(directory, name), 'w').close()
+
+
+def test_directory_index_paths_with_stem():
+    d = tempfile.mkdtemp()
+    try:
+        for name in ['a.jpg', 'a.pts', 'a.b.pkl.gz', 'ab.pts']:
+            _touch(d, name)
+        os.mkdir(os.path.join(d, 'a.dir'))
+        index = DirectoryIndex()
+        assert sorted(index.paths_with_stem(d, 'a').keys()) == [
+            '.b.pkl.gz', '.jpg', '.pts']
+        assert sorted(index.paths_with_stem(d, 'a.b').keys()) == ['.pkl.gz']
+        assert index.paths_with_stem(d, 'a')['.pts'].name == 'a.pts'
+        assert index.paths_with_stem(d, 'b') == {}
+    finally:
+        shutil.rmtree(d)
+
+
+def test_directory_index_missing_directory():
+    assert DirectoryIndex().paths_with_stem('/a/directory/that/is/missing',
+                                            'a') == {}
+
+
+def test_directory_index_invalidate():
+    d = tempfile.mkdtemp()
+    try:
+        _touch(d, 'a.jpg')
+        index = DirectoryIndex()
+        assert list(index.paths_with_stem(d, 'a').keys()) == ['.jpg']
+        _touch(d, 'a.pts')
+        index.invalidate(d)
+        assert sorted(index.paths_with_stem(d, 'a').keys()) == ['.jpg', '.pts']
+    finally:
+        shutil.rmtree(d)
+
+
+def test_directory_index_disk_cache():
+    d = tempfile.mkdtemp()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        _touch(d, 'a.jpg')
+        DirectoryIndex(cache_dir=cache_dir).paths_with_stem(d, 'a')
+        assert len(os.listdir(cache_dir)) == 1
+        index = DirectoryIndex(cache_dir=cache_dir)
+        assert list(index.paths_with_stem(d, 'a').keys()) == ['.jpg']
+    finally:
+        shutil.rmtree(d)
+        shutil.rmtree(cache_dir)
+
+
+def test_same_name_index_disk_cache():
+    from functools import partial
+    import menpo.io as mio
+    from menpo.io.input import same_name
+    d = tempfile.mkdtemp()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        for name in ['takeo.ppm', 'takeo.pts']:
+            shutil.copy(str(mio.data_path_to(name)), d)
+        resolver = partial(same_name,
+                           index=DirectoryIndex(cache_dir=cache_dir))
+        images = mio.import_images(d, landmark_resolver=resolver)
+        assert list(images[0].landmarks.keys()) == ['PTS']
+        assert len(os.listdir(cache_dir)) == 1
+    finally:
+        shutil.rmtree(d)
+        shutil.rmtree(cache_dir)
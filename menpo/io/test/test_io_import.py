@@ -512,6 +512,29 @@ def test_import_as_generator():
     assert isinstance(gen, types.GeneratorType)
 
 
+def test_import_as_generator_n_workers_preserves_order():
+    serial = list(mio.import_images(mio.data_dir_path()))
+    parallel = list(mio.import_images(mio.data_dir_path(), as_generator=True,
+                                      n_workers=2))
+    assert [i.path for i in parallel] == [i.path for i in serial]
+    assert all(np.all(a.pixels == b.pixels) for a, b in zip(serial, parallel))
+    assert ([sorted(i.landmarks.keys()) for i in parallel] ==
+            [sorted(i.landmarks.keys()) for i in serial])
+
+
+def test_import_landmark_files_n_workers():
+    serial = list(mio.import_landmark_files(mio.data_dir_path()))
+    parallel = list(mio.import_landmark_files(mio.data_dir_path(),
+                                              as_generator=True, n_workers=2))
+    assert ([sorted(l.keys()) for l in parallel] ==
+            [sorted(l.keys()) for l in serial])
+
+
+def test_import_n_workers_lazy_list_raises_value_error():
+    with raises(ValueError):
+        mio.import_images(mio.data_dir_path(), n_workers=2)
+
+
 def test_import_lazy_list():
     from menpo.base import LazyList
     data_path = mio.data_dir_path()
@@ -758,3 +781,86 @@ def test_register_no_leading_period():
     mio.input.base._register_importer(ext_map, 'foo', lambda x: x)
     assert '.foo' in ext_map
     assert 'foo' not in ext_map
+
+
+def test_import_image_dataset_round_trip():
+    import os
+    import shutil
+    import tempfile
+    from menpo.image import MaskedImage
+    images = [mio.import_builtin_asset.breakingbad_jpg(),
+              mio.import_builtin_asset.takeo_ppm().as_masked()]
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'dataset.mds')
+        mio.export_image_dataset(images, path)
+        imported = mio.import_image_dataset(path)
+        assert len(imported) == 2
+        for image, imported_image in zip(images, imported):
+            assert isinstance(imported_image.pixels, np.memmap)
+            assert type(imported_image) == type(image)
+            assert np.all(imported_image.pixels == image.pixels)
+            assert imported_image.path == image.path
+            assert (list(imported_image.landmarks.keys()) ==
+                    list(image.landmarks.keys()))
+            for group in image.landmarks:
+                assert np.all(imported_image.landmarks[group].points ==
+                              image.landmarks[group].points)
+        assert isinstance(imported[1], MaskedImage)
+        assert np.all(imported[1].mask.pixels == images[1].mask.pixels)
+    finally:
+        shutil.rmtree(d)
+
+
+def test_import_image_dataset_landmark_shape_types_round_trip():
+    import os
+    import shutil
+    import tempfile
+    from menpo.image import Image
+    from menpo.shape import (PointCloud, PointUndirectedGraph,
+                             PointDirectedGraph, TriMesh, TexturedTriMesh)
+    points = np.random.rand(4, 2) * 10
+    edges = np.array([[0, 1], [1, 2], [2, 3]])
+    image = Image.init_blank((10, 10))
+    image.landmarks['cloud'] = PointCloud(points)
+    image.landmarks['undirected'] = PointUndirectedGraph.init_from_edges(
+        points, edges)
+    image.landmarks['directed'] = PointDirectedGraph.init_from_edges(
+        points, edges)
+    image.landmarks['mesh'] = TriMesh(points)
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'dataset.mds')
+        mio.export_image_dataset([image], path)
+        imported = mio.import_image_dataset(path)[0]
+        for group, lms in image.landmarks.items():
+            imported_lms = imported.landmarks[group]
+            assert type(imported_lms) == type(lms)
+            assert np.all(imported_lms.points == lms.points)
+        for group in ['undirected', 'directed']:
+            assert np.all(imported.landmarks[group].edges ==
+                          image.landmarks[group].edges)
+        assert np.all(imported.landmarks['mesh'].trilist ==
+                      image.landmarks['mesh'].trilist)
+
+        image.landmarks['textured'] = TexturedTriMesh(
+            points, np.random.rand(4, 2), Image.init_blank((2, 2)))
+        with raises(ValueError):
+            mio.export_image_dataset([image], path, overwrite=True)
+    finally:
+        shutil.rmtree(d)
+
+
+def test_import_image_dataset_not_a_dataset_raises_value_error():
+    import os
+    import shutil
+    import tempfile
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'dataset.mds')
+        with open(path, 'wb') as f:
+            f.write(b'0' * 100)
+        with raises(ValueError):
+            mio.import_image_dataset(path)
+    finally:
+        shutil.rmtree(d)
@@ -9,6 +9,12 @@ except ImportError:
     DEVNULL = open(os.devnull, 'wb')
 
 
+# Menpo image dataset (.mds) files begin and end with this magic string and
+# every array they contain starts at a multiple of the alignment (in bytes).
+_DATASET_MAGIC = b'MENPODS\x00'
+_DATASET_ALIGNMENT = 64
+
+
 def _norm_path(filepath):
     r"""
     Uses all the tricks in the book to expand a path out to an absolute one.
@@ -1,10 +1,12 @@
 from __future__ import division
+from numbers import Integral
+
 import numpy as np
 from scipy.sparse import issparse
 from .linalg import dot_inplace_right
 
 
-def eigenvalue_decomposition(C, is_inverse=False, eps=1e-10):
+def eigenvalue_decomposition(C, is_inverse=False, eps=1e-10, dtype=None):
     r"""
     Eigenvalue decomposition of a given covariance (or scatter) matrix.
 
@@ -27,6 +29,13 @@ def eigenvalue_decomposition(C, is_inverse=False, eps=1e-10):
 
             limit = np.max(np.abs(eigenvalues)) * eps
 
+    dtype : `numpy.dtype`, optional
+        The data type of the returned eigenvectors and eigenvalues. If
+        provided, the decomposition itself is always performed in double
+        precision, so that single precision results can be requested without
+        losing accuracy in the decomposition. If ``None``, the decomposition
+        is performed in the precision of `C`.
+
     Returns
     -------
     pos_eigenvectors : ``(N, p)`` `ndarray`
@@ -34,6 +43,9 @@ def eigenvalue_decomposition(C, is_inverse=False, eps=1e-10):
     pos_eigenvalues : ``(p,)`` `ndarray`
         The array of positive eigenvalues.
     """
+    if dtype is not None:
+        C = C.astype(np.promote_types(C.dtype, np.float64))
+
     # compute eigenvalue decomposition
     if issparse(C):
         from scipy.sparse.linalg import eigsh
@@ -64,16 +76,99 @@ def eigenvalue_decomposition(C, is_inverse=False, eps=1e-10):
         pos_eigenvalues = pos_eigenvalues[::-1] ** -1
         pos_eigenvectors = pos_eigenvectors[:, ::-1]
 
+    if dtype is not None:
+        pos_eigenvectors = pos_eigenvectors.astype(dtype)
+        pos_eigenvalues = pos_eigenvalues.astype(dtype)
+
     return pos_eigenvectors, pos_eigenvalues
 
 
-def pca(X, centre=True, inplace=False, eps=1e-10):
+def _gram_matrix(X, chunk_size=2 ** 22):
+    r"""
+    The Gram matrix ``X X^H`` accumulated in (at least) double precision. The
+    columns of `X` are converted in chunks of about `chunk_size` elements, so
+    a single precision `X` is never copied in full.
+    """
+    dtype = np.promote_types(X.dtype, np.float64)
+    if X.dtype == dtype:
+        return np.dot(X, X.conj().T)
+    n = X.shape[0]
+    G = np.zeros((n, n), dtype=dtype)
+    step = max(1, chunk_size // n)
+    for j in range(0, X.shape[1], step):
+        chunk = X[:, j:j + step].astype(dtype)
+        G += np.dot(chunk, chunk.conj().T)
+    return G
+
+
+def _truncate_eigenvalues(U, l, eps):
+    # sort from largest to smallest and discard the eigenvalues (and the
+    # corresponding eigenvectors) that are not positive within tolerance, as
+    # eigenvalue_decomposition does for the full solver
+    index = np.argsort(l)[::-1]
+    l, U = l[index], U[index]
+    if l.size == 0:
+        return U, l
+    keep = l > max(np.max(np.abs(l)) * eps, 0.0)
+    return U[keep], l[keep]
+
+
+def _randomized_pca(X, n_components, n_oversamples=10, n_iter=4,
+                    random_state=0):
+    r"""
+    The leading eigenvectors/eigenvalues of the scatter matrix of the (already
+    centred) data matrix `X`, by randomized SVD [1]. Only products of `X` with
+    tall, thin matrices are ever formed, so neither the ``d x d`` nor the
+    ``n x n`` scatter matrix is ever built.
+
+    References
+    ----------
+    .. [1] N. Halko, P. G. Martinsson, J. A. Tropp. "Finding structure with
+       randomness: Probabilistic algorithms for constructing approximate
+       matrix decompositions". SIAM Review, 2011.
+    """
+    n, d = X.shape
+    n_random = min(n_components + n_oversamples, n, d)
+    rng = np.random.RandomState(random_state)
+    # Q: n x n_random - orthonormal basis for the range of X
+    Q = np.linalg.qr(np.dot(X, rng.normal(size=(d, n_random)).astype(
+        X.dtype)))[0]
+    # power iterations sharpen the decay of the spectrum, re-orthonormalizing
+    # at every step to preserve the small singular values
+    for _ in range(n_iter):
+        Q = np.linalg.qr(np.dot(X.conj().T, Q))[0]
+        Q = np.linalg.qr(np.dot(X, Q))[0]
+    # B: n_random x d - the projection of X onto the basis is small enough to
+    # decompose exactly
+    B = np.dot(Q.conj().T, X)
+    s, V = np.linalg.svd(B, full_matrices=False)[1:]
+    return V[:n_components], s[:n_components] ** 2 / (n - 1)
+
+
+def _arpack_pca(X, n_components):
+    r"""
+    The leading eigenvectors/eigenvalues of the scatter matrix of the (already
+    centred) data matrix `X`, by the implicitly restarted Lanczos method of
+    ARPACK. Only matrix-vector products with `X` are required.
+    """
+    from scipy.sparse.linalg import svds
+    n = X.shape[0]
+    s, V = svds(X, k=n_components)[1:]
+    return V, s ** 2 / (n - 1)
+
+
+def pca(X, centre=True, inplace=False, eps=1e-10, n_components=None,
+        solver='full', dtype=None):
     r"""
     Apply Principal Component Analysis (PCA) on the data matrix `X`. In the case
     where the data matrix is very large, it is advisable to set
     ``inplace = True``. However, note this destructively edits the data matrix
     by subtracting the mean inplace.
 
+    If only the leading `n_components` are required, the ``'randomized'`` and
+    ``'arpack'`` solvers avoid forming and decomposing the full scatter matrix
+    and are much faster (and lighter on memory) for large data matrices.
+
     Parameters
     ----------
     X : ``(n_samples, n_dims)`` `ndarray`
@@ -87,6 +182,36 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         Tolerance value for positive eigenvalue. Those eigenvalues smaller
         than the specified eps value, together with their corresponding
         eigenvectors, will be automatically discarded.
+    n_components : `int`, optional
+        The number of leading components to compute. If ``None``, all the
+        components are computed. Note that the ``'full'`` solver always
+        computes all the components.
+    solver : ``{'auto', 'full', 'randomized', 'arpack'}``, optional
+        The method used to compute the components:
+
+        ============== =====================================================
+        Solver         Method
+        ============== =====================================================
+        ``full``       Eigenvalue decomposition of the covariance (or Gram)
+                       matrix - exact, all the components are computed
+        ``randomized`` Randomized SVD of the data matrix - approximate,
+                       only the top `n_components` are computed
+        ``arpack``     Lanczos SVD of the data matrix - exact up to
+                       convergence, only the top `n_components` are computed
+        ``auto``       ``randomized`` if `n_components` is less than 80% of
+                       the smallest dimension of a data matrix with more
+                       than 500 samples or features, else ``full``
+        ============== =====================================================
+
+        The default is ``full``, so that the results are exact unless an
+        approximate solver is explicitly requested.
+    dtype : `numpy.dtype`, optional
+        The data type of the returned eigenvectors, eigenvalues and mean. If
+        `X` is of a different type it is converted first (and so `inplace` has
+        no effect). The mean and the scatter matrix are accumulated, and the
+        scatter matrix is decomposed, in double precision, so ``np.float32``
+        halves the memory of the result without compromising the
+        decomposition. If ``None``, the type of `X` is used.
 
     Returns
     -------
@@ -96,13 +221,26 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         Positive eigenvalues of the data matrix.
     m (mean vector) : ``(n_dimensions,)`` `ndarray`
         Mean that was subtracted from the data matrix.
+
+    Raises
+    ------
+    ValueError
+        If `solver` is not one of the above or if a truncated solver is
+        requested without a valid integer `n_components`.
     """
     n, d = X.shape
+    solver = _pca_solver(solver, n_components, n, d)
+    if dtype is not None:
+        X = X.astype(dtype, copy=False)
 
     if centre:
         # centre data
         # m (mean vector): d
-        m = np.mean(X, axis=0)
+        if dtype is not None:
+            # accumulate in double precision
+            m = np.mean(X, axis=0, dtype=np.float64).astype(dtype)
+        else:
+            m = np.mean(X, axis=0)
     else:
         m = np.zeros(d, dtype=X.dtype)
 
@@ -112,10 +250,18 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
     else:
         X = X - m
 
-    if d < n:
+    if solver == 'randomized':
+        U, l = _truncate_eigenvalues(*_randomized_pca(X, n_components),
+                                     eps=eps)
+    elif solver == 'arpack':
+        U, l = _truncate_eigenvalues(*_arpack_pca(X, n_components), eps=eps)
+    elif d < n:
         # compute covariance matrix
         # C (covariance): d x d
-        C = np.dot(X.conj().T, X) / (n - 1)
+        if dtype is not None:
+            C = _gram_matrix(X.conj().T) / (n - 1)
+        else:
+            C = np.dot(X.conj().T, X) / (n - 1)
         # C should be perfectly symmetrical, but numerical error can creep
         # in. Enforce symmetry here to avoid creating complex eigenvectors
         C = (C + C.conj().T) / 2.0
@@ -123,7 +269,8 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         # perform eigenvalue decomposition
         # U (eigenvectors): d x n
         # s (eigenvalues):  n
-        U, l = eigenvalue_decomposition(C, is_inverse=False, eps=eps)
+        U, l = eigenvalue_decomposition(C, is_inverse=False, eps=eps,
+                                        dtype=dtype)
 
         # transpose U
         # U: n x d
@@ -133,7 +280,10 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         # d > n
         # compute small covariance matrix
         # C (covariance): n x n
-        C = np.dot(X, X.conj().T) / (n - 1)
+        if dtype is not None:
+            C = _gram_matrix(X) / (n - 1)
+        else:
+            C = np.dot(X, X.conj().T) / (n - 1)
         # C should be perfectly symmetrical, but numerical error can creep
         # in. Enforce symmetry here to avoid creating complex eigenvectors
         C = (C + C.conj().T) / 2.0
@@ -141,7 +291,8 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         # perform eigenvalue decomposition
         # V (eigenvectors): n x n
         # s (eigenvalues):  n
-        V, l = eigenvalue_decomposition(C, is_inverse=False, eps=eps)
+        V, l = eigenvalue_decomposition(C, is_inverse=False, eps=eps,
+                                        dtype=dtype)
 
         # compute final eigenvectors
         # U: n x d
@@ -150,9 +301,38 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         U = dot(V.conj().T, X)
         U *= w[:, None]
 
+    if dtype is not None:
+        U, l = U.astype(dtype, copy=False), l.astype(dtype, copy=False)
+
     return U, l, m
 
 
+def _pca_solver(solver, n_components, n_samples, n_features):
+    r"""
+    Validate the requested PCA solver and resolve ``'auto'`` to a concrete
+    solver for a data matrix of the given size.
+    """
+    if solver not in {'auto', 'full', 'randomized', 'arpack'}:
+        raise ValueError("solver must be one of 'auto', 'full', 'randomized' "
+                         "or 'arpack' (got '{}')".format(solver))
+    min_dim = min(n_samples, n_features)
+    if solver == 'auto':
+        if (isinstance(n_components, Integral) and
+                max(n_samples, n_features) > 500 and
+                n_components < 0.8 * min_dim):
+            return 'randomized'
+        return 'full'
+    if solver != 'full':
+        if not isinstance(n_components, Integral) or n_components < 1:
+            raise ValueError("The '{}' solver requires n_components to be a "
+                             "positive integer".format(solver))
+        # ARPACK can only find strictly fewer than min_dim singular values -
+        # if all of them are wanted the full solver is faster anyway
+        if n_components >= min_dim:
+            return 'full'
+    return solver
+
+
 # The default value of eps tolerance is set to 1e-5 (instead of 1e-10 that used
 # to be). This is done in order for pcacov to work for inverse single precision C
 # i.e. is_inverse=True and dtype=np.float32. 1e-10 works perfectly when the
@@ -207,7 +387,7 @@ def pcacov(C, is_inverse=False, eps=1e-5):
     return U, l
 
 
-def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10):
+def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10, dtype=None):
     r"""
     Perform Incremental PCA on the eigenvectors ``U_a``, eigenvalues ``l_a`` and
     mean vector ``m_a`` (if present) given a new data matrix ``B``.
@@ -235,6 +415,11 @@ def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10):
         Tolerance value for positive eigenvalue. Those eigenvalues smaller
         than the specified eps value, together with their corresponding
         eigenvectors, will be automatically discarded.
+    dtype : `numpy.dtype`, optional
+        The data type of the returned eigenvectors, eigenvalues and mean. If
+        provided, `B` is converted to it and the small SVD at the heart of the
+        update is performed in double precision. If ``None``, the types of
+        the inputs are used.
 
     Returns
     -------
@@ -250,6 +435,10 @@ def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10):
     .. [1] David Ross, Jongwoo Lim, Ruei-Sung Lin, Ming-Hsuan Yang.
        "Incremental Learning for Robust Visual Tracking". IJCV, 2007.
     """
+    if dtype is not None:
+        B = B.astype(dtype, copy=False)
+        U_a = U_a.astype(dtype, copy=False)
+
     # multiply current eigenvalues by total number of samples and square
     # root them to obtain singular values of the original data.
     s_a = np.sqrt((n_a - 1) * l_a)
@@ -287,13 +476,20 @@ def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10):
                               PB.dot(B_tilde.T)))))
 
     # compute SVD of R
+    if dtype is not None:
+        R = R.astype(np.promote_types(R.dtype, np.float64))
     U_tilde, s_tilde, Vt_tilde = np.linalg.svd(R)
+    if dtype is not None:
+        s_tilde, Vt_tilde = s_tilde.astype(dtype), Vt_tilde.astype(dtype)
 
     # compute new eigenvalues
     l = s_tilde ** 2 / (n - 1)
     # keep only positive eigenvalues within tolerance
     l = l[l > eps]
 
-    U = Vt_tilde.dot(np.vstack((U_a, B_tilde)))[:len(l), :]
+    U = Vt_tilde[:len(l)].dot(np.vstack((U_a, B_tilde)))
+
+    if dtype is not None:
+        m = m.astype(dtype, copy=False)
 
     return U, l, m
@@ -82,13 +82,20 @@ def dot_inplace_right(a, b, block_size=1000):
     return b[:n_small]
 
 
-def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
+def _as_vector(vectorizable):
+    return vectorizable.as_vector()
+
+
+def as_matrix(vectorizables, length=None, return_template=False, verbose=False,
+              dtype=None, out=None, n_workers=None):
     r"""
     Create a matrix from a list/generator of :map:`Vectorizable` objects.
     All the objects in the list **must** be the same size when vectorized.
 
     Consider using a generator if the matrix you are creating is large and
-    passing the length of the generator explicitly.
+    passing the length of the generator explicitly. If the matrix is too
+    large to fit in memory, pass a path as ``out`` so that the matrix is
+    built inside a memory mapped file.
 
     Parameters
     ----------
@@ -103,6 +110,21 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
         If ``True``, will return the first element of the list/generator, which
         was used as the template. Useful if you need to map back from the
         matrix to a list of vectorizable objects.
+    dtype : `numpy.dtype`, optional
+        The data type of the matrix. Each vector is cast to this type as it
+        is written, so a ``float32`` matrix never requires a ``float64`` copy
+        of the data. If ``out`` is an `ndarray`, its data type is always
+        used, so ``dtype`` must either be ``None`` or match it. Otherwise, if
+        ``None``, the data type of the template's vector is used.
+    out : ``(length, n_features)`` `ndarray` or `str` or `pathlib.Path`, optional
+        If an `ndarray` (e.g. an ``np.memmap``), the matrix is written into it.
+        If a path, a new ``np.memmap`` is created at the path and the matrix is
+        written into it. If ``None``, a new `ndarray` is allocated.
+    n_workers : `int`, optional
+        If not ``None``, ``vectorizables`` must be a :map:`LazyList` and its
+        items are evaluated and vectorized concurrently by this number of
+        threads (see :map:`LazyList.prefetch`). Rows are always written in
+        the order of the list.
 
     Returns
     -------
@@ -116,7 +138,20 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     ------
     ValueError
         ``vectorizables`` terminates in fewer than ``length`` iterations
+    ValueError
+        ``out`` is an `ndarray` that is not of shape ``(length, n_features)``
+    ValueError
+        ``out`` is an `ndarray` and ``dtype`` is provided but is not the data
+        type of ``out``
+    ValueError
+        ``n_workers`` is provided and ``vectorizables`` is not a
+        :map:`LazyList`
     """
+    from menpo.base import LazyList
+    if n_workers is not None and not isinstance(vectorizables, LazyList):
+        raise ValueError('n_workers is only supported when vectorizables is a '
+                         'LazyList ({} provided)'.format(type(vectorizables)))
+
     # get the first element as the template and use it to configure the
     # data matrix
     if length is None:
@@ -130,27 +165,49 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     n_features = template.n_parameters
     template_vector = template.as_vector()
 
-    data = np.zeros((length, n_features), dtype=template_vector.dtype)
-    if verbose:
-        print('Allocated data matrix of size {} '
-              '({} samples)'.format(bytes_str(data.nbytes), length))
+    if isinstance(out, np.ndarray):
+        if out.shape != (length, n_features):
+            raise ValueError('out must be of shape {} '
+                             '({} provided)'.format((length, n_features),
+                                                    out.shape))
+        if dtype is not None and np.dtype(dtype) != out.dtype:
+            raise ValueError('dtype ({}) does not match the dtype of out '
+                             '({})'.format(np.dtype(dtype), out.dtype))
+        data = out
+    else:
+        if dtype is None:
+            dtype = template_vector.dtype
+        if out is None:
+            data = np.zeros((length, n_features), dtype=dtype)
+        else:
+            data = np.memmap(str(out), dtype=dtype, mode='w+',
+                             shape=(length, n_features))
+        if verbose:
+            print('Allocated data matrix of size {} '
+                  '({} samples)'.format(bytes_str(data.nbytes), length))
 
     # now we can fill in the first element from the template
     data[0] = template_vector
     del template_vector
 
-    # ensure we take at most the remaining length - 1 elements
-    vectorizables = islice(vectorizables, length - 1)
+    if n_workers is not None:
+        # vectorize concurrently - note that the LazyList has been sliced
+        # above so the template is not evaluated twice
+        vectors = vectorizables[:length - 1].map(_as_vector).prefetch(
+            n_workers=n_workers)
+    else:
+        # ensure we take at most the remaining length - 1 elements
+        vectors = (v.as_vector() for v in islice(vectorizables, length - 1))
 
     if verbose:
-        vectorizables = print_progress(vectorizables, n_items=length, offset=1,
-                                       prefix='Building data matrix',
-                                       end_with_newline=False)
+        vectors = print_progress(vectors, n_items=length, offset=1,
+                                 prefix='Building data matrix',
+                                 end_with_newline=False)
 
     # 1-based as we have the template vector set already
     i = 0
-    for i, sample in enumerate(vectorizables, 1):
-        data[i] = sample.as_vector()
+    for i, vector in enumerate(vectors, 1):
+        data[i] = vector
 
     # we have exhausted the iterable, but did we get enough items?
     if i != length - 1:  # -1
@@ -1,5 +1,6 @@
 import numpy as np
 from numpy.testing import assert_almost_equal
+from pytest import raises
 from menpo.math import eigenvalue_decomposition, pca, ipca
 
 # Positive semi-definite matrix
@@ -169,3 +170,77 @@ def test_ipca_features_nocentre():
     assert_almost_equal(np.abs(i_U), np.abs(b_U))
     assert_almost_equal(i_l, b_l)
     assert_almost_equal(i_m, b_m)
+
+
+def _low_rank_data_matrix(n_samples, n_features, rank=5, seed=0):
+    rng = np.random.RandomState(seed)
+    return (rng.randn(n_samples, rank).dot(rng.randn(rank, n_features)) +
+            0.01 * rng.randn(n_samples, n_features))
+
+
+def test_pca_randomized_matches_full():
+    X = _low_rank_data_matrix(60, 40)
+    U, l, m = pca(X, solver='full')
+    r_U, r_l, r_m = pca(X, n_components=5, solver='randomized')
+
+    assert r_U.shape == (5, 40)
+    assert_almost_equal(r_l, l[:5])
+    assert_almost_equal(np.abs(r_U), np.abs(U[:5]))
+    assert_almost_equal(r_m, m)
+
+
+def test_pca_arpack_matches_full():
+    X = _low_rank_data_matrix(40, 60)
+    U, l, m = pca(X, solver='full')
+    a_U, a_l, a_m = pca(X, n_components=5, solver='arpack')
+
+    assert a_U.shape == (5, 60)
+    assert_almost_equal(a_l, l[:5])
+    assert_almost_equal(np.abs(a_U), np.abs(U[:5]))
+
+
+def test_pca_truncated_solver_all_components_is_full():
+    U, l, m = pca(large_samples_data_matrix, n_components=2,
+                  solver='arpack')
+
+    assert_almost_equal(l, eigenvalues_centered_s)
+
+
+def test_pca_invalid_solver():
+    with raises(ValueError):
+        pca(large_samples_data_matrix, solver='svd')
+
+
+def test_pca_truncated_solver_requires_n_components():
+    with raises(ValueError):
+        pca(large_samples_data_matrix, solver='randomized')
+
+
+def test_pca_float32():
+    U, l, m = pca(large_samples_data_matrix.T, dtype=np.float32)
+
+    assert U.dtype == np.float32
+    assert l.dtype == np.float32
+    assert m.dtype == np.float32
+    assert_almost_equal(l, eigenvalues_centered_f, decimal=5)
+    assert_almost_equal(m, mean_vector_f, decimal=5)
+
+
+def test_ipca_float32():
+    n_a = large_samples_data_matrix.shape[0] // 2
+    U_a, l_a, m_a = pca(large_samples_data_matrix[:n_a], dtype=np.float32)
+    i_U, i_l, i_m = ipca(large_samples_data_matrix[n_a:], U_a, l_a, n_a,
+                         m_a=m_a, dtype=np.float32)
+
+    assert i_U.dtype == np.float32
+    assert i_l.dtype == np.float32
+    assert i_m.dtype == np.float32
+    assert_almost_equal(i_l, eigenvalues_centered_s, decimal=5)
+
+
+def test_eigenvalue_decomposition_dtype():
+    pos_eigenvectors, pos_eigenvalues = eigenvalue_decomposition(
+        cov_matrix, dtype=np.float32)
+
+    assert pos_eigenvectors.dtype == np.float32
+    assert_almost_equal(pos_eigenvalues, [4.0, 2.0])
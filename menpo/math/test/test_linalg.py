@@ -92,6 +92,62 @@ def test_as_matrix_return_template():
     assert_equal(t.shape, image_shape)
 
 
+def test_as_matrix_dtype():
+    data = as_matrix([template.copy() for _ in range(n_images)],
+                     dtype=np.float32)
+    assert data.dtype == np.float32
+
+
+def test_as_matrix_out():
+    out = np.empty((n_images, 20), dtype=np.float32)
+    data = as_matrix([template.copy() for _ in range(n_images)], out=out)
+    assert data is out
+
+
+def test_as_matrix_out_mismatched_dtype_raises_value_error():
+    out = np.empty((n_images, 20), dtype=np.float32)
+    with raises(ValueError):
+        as_matrix([template.copy() for _ in range(n_images)], out=out,
+                  dtype=np.float64)
+    data = as_matrix([template.copy() for _ in range(n_images)], out=out,
+                     dtype=np.float32)
+    assert data is out
+
+
+def test_as_matrix_out_wrong_shape_raises_value_error():
+    with raises(ValueError):
+        as_matrix([template.copy() for _ in range(n_images)],
+                  out=np.empty((n_images, 21)))
+
+
+def test_as_matrix_out_memmap_path():
+    import os
+    import shutil
+    import tempfile
+    d = tempfile.mkdtemp()
+    try:
+        data = as_matrix([template.copy() for _ in range(n_images)],
+                         out=os.path.join(d, 'data.dat'))
+        assert isinstance(data, np.memmap)
+        assert_equal(data.shape, (n_images, 20))
+        del data
+    finally:
+        shutil.rmtree(d)
+
+
+def test_as_matrix_n_workers():
+    from menpo.base import LazyList
+    images = [template.from_vector(np.full(20, i, dtype=np.float))
+              for i in range(n_images)]
+    data = as_matrix(LazyList.init_from_iterable(images), n_workers=2)
+    assert_equal(data, as_matrix(images))
+
+
+def test_as_matrix_n_workers_not_lazy_list_raises_value_error():
+    with raises(ValueError):
+        as_matrix([template.copy() for _ in range(n_images)], n_workers=2)
+
+
 def test_from_matrix():
     images = from_matrix(matrix, template)
     assert isinstance(next(images), MaskedImage)
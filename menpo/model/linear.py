@@ -259,7 +259,7 @@ class LinearVectorModel(Copyable):
         both mutually orthonormal.
 
         Both models keep its number of components unchanged or else a value
-        error is raised.
+        error is raised. Both models also keep their data type.
 
         Parameters
         ----------
@@ -282,9 +282,11 @@ class LinearVectorModel(Copyable):
         Q = (np.linalg.qr(np.hstack((linear_model._components.T,
                                      self._components.T)))[0]).T
         # set the orthonormalized components of the model being passed
-        linear_model.components = Q[:linear_model.n_components, :]
+        linear_model.components = Q[:linear_model.n_components, :].astype(
+            linear_model._components.dtype, copy=False)
         # set the orthonormalized components of this model
-        self.components = Q[linear_model.n_components:, :]
+        self.components = Q[linear_model.n_components:, :].astype(
+            self._components.dtype, copy=False)
 
 
 class MeanLinearVectorModel(LinearVectorModel):
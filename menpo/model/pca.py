@@ -1,12 +1,39 @@
 from __future__ import division
+from itertools import islice
 import numpy as np
 
 from menpo.base import doc_inherit, name_of_callable
 from menpo.math import pca, pcacov, ipca, as_matrix
+from menpo.math.decomposition import _pca_solver
+from menpo.visualize import print_progress, print_dynamic
 from .linear import MeanLinearVectorModel
 from .vectorizable import VectorizableBackedModel
 
 
+def _batches(iterable, batch_size):
+    r"""
+    Consume an iterable in lists of (at most) `batch_size` items.
+    """
+    iterator = iter(iterable)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
+
+def _total_variance(X, mean, chunk_size=1024):
+    r"""
+    The total variance (trace of the covariance matrix) of the data matrix `X`
+    about `mean`, accumulated over chunks of rows so that no centred copy of
+    `X` is ever formed.
+    """
+    sum_of_squares = 0.0
+    for i in range(0, X.shape[0], chunk_size):
+        chunk = X[i:i + chunk_size] - mean
+        sum_of_squares += np.einsum('ij,ij->', chunk, chunk, dtype=np.float64)
+    return sum_of_squares / (X.shape[0] - 1)
+
+
 class PCAVectorModel(MeanLinearVectorModel):
     r"""
     A :map:`MeanLinearModel` where components are Principal Components.
@@ -34,20 +61,45 @@ class PCAVectorModel(MeanLinearVectorModel):
     inplace : `bool`, optional
         If ``True`` the data matrix is modified in place. Otherwise, the data
         matrix is copied.
+    solver : ``{'auto', 'full', 'randomized', 'arpack'}``, optional
+        The PCA solver. The ``'randomized'`` and ``'arpack'`` solvers only
+        compute the top `max_n_components` components, which is far cheaper
+        than the ``'full'`` eigendecomposition for large data matrices. The
+        variance of the components that are not computed is still accounted
+        for, so :meth:`noise_variance` and :meth:`original_variance` are
+        unaffected. The default, ``'full'``, is exact; the other solvers must
+        be requested explicitly. See :map:`pca` for details.
+    dtype : `numpy.dtype`, optional
+        The data type of the components, eigenvalues and mean of the model,
+        e.g. ``np.float32`` to halve the memory of a large model. If ``None``,
+        the type of the data is used.
     """
     def __init__(self, samples, centre=True, n_samples=None,
-                 max_n_components=None, inplace=True):
+                 max_n_components=None, inplace=True, solver='full',
+                 dtype=None):
         # Generate data matrix
         data, self.n_samples = self._data_to_matrix(samples, n_samples)
+        if dtype is not None:
+            data = data.astype(dtype, copy=False)
+        solver = _pca_solver(solver, max_n_components, *data.shape)
 
         # Compute pca
-        e_vectors, e_values, mean = pca(data, centre=centre, inplace=inplace)
+        e_vectors, e_values, mean = pca(data, centre=centre, inplace=inplace,
+                                        n_components=max_n_components,
+                                        solver=solver, dtype=dtype)
 
         # The call to __init__ of MeanLinearModel is done in here
         self._constructor_helper(
             eigenvalues=e_values, eigenvectors=e_vectors, mean=mean,
             centred=centre, max_n_components=max_n_components)
 
+        if solver != 'full':
+            # The truncated solvers do not compute the trailing eigenvalues.
+            # If the data was centred in place then it is already mean-free.
+            self._set_residual_variance(
+                _total_variance(data, 0 if inplace else mean),
+                min(data.shape[0] - int(centre), data.shape[1]))
+
     @classmethod
     def init_from_covariance_matrix(cls, C, mean, n_samples, centred=True,
                                     is_inverse=False, max_n_components=None):
@@ -137,10 +189,24 @@ class PCAVectorModel(MeanLinearVectorModel):
         self._eigenvalues = eigenvalues
         # start the active components as all the components
         self._n_active_components = int(self.n_components)
-        self._trimmed_eigenvalues = np.array([])
+        self._trimmed_eigenvalues = np.array([], dtype=eigenvalues.dtype)
         if max_n_components is not None:
             self.trim_components(max_n_components)
 
+    def _set_residual_variance(self, total_variance, rank):
+        # The eigenvalues of the (rank - n_known) components that were never
+        # computed are unknown, but their sum is not - spread it evenly across
+        # them so that the original and noise variances remain correct.
+        n_missing = (rank - self._eigenvalues.size -
+                     self._trimmed_eigenvalues.size)
+        if n_missing > 0:
+            residual = max(total_variance - self._eigenvalues.sum() -
+                           self._trimmed_eigenvalues.sum(), 0.0)
+            self._trimmed_eigenvalues = np.hstack(
+                (self._trimmed_eigenvalues,
+                 np.repeat(residual / n_missing, n_missing).astype(
+                     self._eigenvalues.dtype)))
+
     def _data_to_matrix(self, data, n_samples):
         # build a data matrix from all the samples
         if n_samples is None:
@@ -612,6 +678,9 @@ class PCAVectorModel(MeanLinearVectorModel):
         If trimming is performed, `n_components` and `n_available_components`
         would be altered - see :meth:`trim_components` for details.
 
+        Both models keep their data type, so a single precision model can be
+        orthonormalized against a double precision one.
+
         Parameters
         ----------
         linear_model : :map:`LinearModel`
@@ -622,7 +691,8 @@ class PCAVectorModel(MeanLinearVectorModel):
                                      self._components.T)))[0]).T
         # the model passed to us went first, so all it's components will
         # survive. Pull them off, and update the other model.
-        linear_model.components = Q[:linear_model.n_components, :]
+        linear_model.components = Q[:linear_model.n_components, :].astype(
+            linear_model._components.dtype, copy=False)
         # it's possible that all of our components didn't survive due to
         # degeneracy. We need to trim our components down before replacing
         # them to ensure the number of components is consistent (otherwise
@@ -643,13 +713,15 @@ class PCAVectorModel(MeanLinearVectorModel):
                 self.n_active_components = n_active_components
 
         # now we can set our own components with the updated orthogonal ones
-        self.components = Q[linear_model.n_components:, :]
+        self.components = Q[linear_model.n_components:, :].astype(
+            self._components.dtype, copy=False)
 
     def increment(self, data, n_samples=None, forgetting_factor=1.0,
                   verbose=False):
         r"""
         Update the eigenvectors, eigenvalues and mean vector of this model
-        by performing incremental PCA on the given samples.
+        by performing incremental PCA on the given samples. The samples are
+        converted to the data type of the model, which is preserved.
 
         Parameters
         ----------
@@ -676,7 +748,8 @@ class PCAVectorModel(MeanLinearVectorModel):
         # compute incremental pca
         e_vectors, e_values, m_vector = ipca(
             data, self._components, self._eigenvalues, self.n_samples,
-            m_a=self._mean, f=forgetting_factor)
+            m_a=self._mean, f=forgetting_factor,
+            dtype=self._components.dtype)
 
         # if the number of active components is the same as the total number
         # of components so it will be after this method is executed
@@ -1190,18 +1263,29 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
         matrix is copied.
     verbose : `bool`, optional
         Whether to print building information or not.
+    solver : ``{'auto', 'full', 'randomized', 'arpack'}``, optional
+        The PCA solver. The ``'randomized'`` and ``'arpack'`` solvers only
+        compute the top `max_n_components` components. See
+        :map:`PCAVectorModel` for details.
+    dtype : `numpy.dtype`, optional
+        The data type of the data matrix and of the components, eigenvalues
+        and mean of the model, e.g. ``np.float32`` to halve the memory
+        required. If ``None``, the type of the vectorized samples is used.
      """
 
     def __init__(self, samples, centre=True, n_samples=None,
-                 max_n_components=None, inplace=True, verbose=False):
+                 max_n_components=None, inplace=True, verbose=False,
+                 solver='full', dtype=None):
         # build a data matrix from all the samples
         data, template = as_matrix(samples, length=n_samples,
-                                   return_template=True, verbose=verbose)
+                                   return_template=True, verbose=verbose,
+                                   dtype=dtype)
         n_samples = data.shape[0]
 
         PCAVectorModel.__init__(self, data, centre=centre,
                                 max_n_components=max_n_components,
-                                n_samples=n_samples, inplace=inplace)
+                                n_samples=n_samples, inplace=inplace,
+                                solver=solver, dtype=dtype)
         VectorizableBackedModel.__init__(self, template)
 
     @classmethod
@@ -1286,6 +1370,121 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
         VectorizableBackedModel.__init__(self_model, mean)
         return self_model
 
+    @classmethod
+    def init_from_stream(cls, samples, batch_size, max_n_components=None,
+                         centre=True, n_samples=None, verbose=False,
+                         dtype=None):
+        r"""
+        Build the Principal Component Analysis (PCA) from a stream of samples
+        that is consumed batch by batch, so that only one batch of samples is
+        ever held in memory. The model is initialized by batch PCA on the
+        first batch and then updated by incremental PCA (see :map:`ipca`)
+        with each subsequent batch.
+
+        After each update the model is trimmed back down to
+        `max_n_components`, so the memory used is bounded by
+        ``(max_n_components + batch_size) * n_features`` regardless of the
+        number of samples. The total variance of the samples is tracked
+        exactly, so the variance of the discarded components is still
+        accounted for in :meth:`noise_variance`.
+
+        Parameters
+        ----------
+        samples : `iterable` of :map:`Vectorizable`
+            The samples to build the model from, e.g. a :map:`LazyList` or a
+            generator.
+        batch_size : `int` >= ``2``
+            The number of samples that are vectorized and processed at once.
+        max_n_components : `int`, optional
+            The maximum number of components to keep in the model. If
+            ``None``, all the components are kept, which bounds the memory
+            used only by the number of samples.
+        centre : `bool`, optional
+            When ``True`` (default) PCA is performed after mean centering the
+            data. If ``False`` the data is assumed to be centred, and the mean
+            will be ``0``.
+        n_samples : `int`, optional
+            If provided, only the first ``n_samples`` samples are consumed.
+            Also allows the progress to be reported for a generator.
+        verbose : `bool`, optional
+            Whether to print building information or not.
+        dtype : `numpy.dtype`, optional
+            The data type of the batches and of the model. If ``None``, the
+            type of the vectorized samples is used.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            The PCA model built from all the samples.
+
+        Raises
+        ------
+        ValueError
+            If ``batch_size < 2`` or fewer than ``2`` samples are provided.
+        """
+        if batch_size < 2:
+            raise ValueError('batch_size must be at least 2 '
+                             '(got {})'.format(batch_size))
+        if n_samples is None and hasattr(samples, '__len__'):
+            n_samples = len(samples)
+        if n_samples is not None:
+            samples = islice(samples, n_samples)
+            if verbose:
+                samples = print_progress(samples, n_items=n_samples,
+                                         prefix='Building model')
+        batches = _batches(samples, batch_size)
+
+        # Batch PCA on the first batch initializes the model
+        first_batch = next(batches, [])
+        if len(first_batch) < 2:
+            raise ValueError('At least 2 samples are required to build a '
+                             'PCA model')
+        data, template = as_matrix(first_batch, return_template=True,
+                                   dtype=dtype)
+        del first_batch
+        n = data.shape[0]
+        self_model = PCAVectorModel.__new__(cls)
+        PCAVectorModel.__init__(self_model, data, centre=centre,
+                                max_n_components=max_n_components,
+                                solver='full', dtype=dtype)
+        VectorizableBackedModel.__init__(self_model, template)
+        # The sum of squared deviations from the mean (i.e. the trace of the
+        # scatter matrix) - the data is now centred in place
+        sum_of_squares = _total_variance(data, 0) * (n - 1)
+        self_model._trimmed_eigenvalues = np.array(
+            [], dtype=self_model._eigenvalues.dtype)
+        del data
+
+        for batch in batches:
+            data = as_matrix(batch, dtype=self_model._components.dtype)
+            n_b = data.shape[0]
+            # merge the scatter of this batch (Chan et al.)
+            if centre:
+                m_b = np.mean(data, axis=0)
+                d_m = m_b - self_model._mean
+                sum_of_squares += (_total_variance(data, m_b) * (n_b - 1) +
+                                   d_m.dot(d_m) * n * n_b / (n + n_b))
+            else:
+                sum_of_squares += np.einsum('ij,ij->', data, data,
+                                            dtype=np.float64)
+            PCAVectorModel.increment(self_model, data, n_samples=n_b)
+            n += n_b
+            if max_n_components is not None:
+                self_model.trim_components(max_n_components)
+                # the trimmed eigenvalues are superseded by the next update
+                self_model._trimmed_eigenvalues = np.array(
+                    [], dtype=self_model._eigenvalues.dtype)
+            if verbose and n_samples is None:
+                print_dynamic('Building model: {} samples '
+                              'processed'.format(n))
+
+        if verbose and n_samples is None:
+            print('')
+        self_model._set_residual_variance(
+            sum_of_squares / (n - 1),
+            min(n - int(centre), self_model.n_features))
+        return self_model
+
     def mean(self):
         r"""
         Return the mean of the model.
@@ -1381,6 +1580,84 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
         v = self.instance_vector(weights, normalized_weights=normalized_weights)
         return self.template_instance.from_vector(v)
 
+    def instances(self, weights, normalized_weights=False):
+        """
+        Creates new instances of the model using the first ``n_weights``
+        components in a particular weighting. All the instance vectors are
+        generated with a single matrix product.
+
+        Parameters
+        ----------
+        weights : ``(n_instances, n_weights)`` `ndarray` or `list` of `lists`
+            ``weights[i, j]`` is the linear contribution of the j'th principal
+            component to the i'th instance produced.
+        normalized_weights : `bool`, optional
+            If ``True``, the weights are assumed to be normalized w.r.t the
+            eigenvalues. This can be easier to create unique instances by
+            making the weights more interpretable.
+
+        Raises
+        ------
+        ValueError
+            If n_weights > n_components
+
+        Returns
+        -------
+        instances : `list` of `type(self.template_instance)`
+            The instances of the model.
+        """
+        vectors = self.instance_vectors(weights,
+                                        normalized_weights=normalized_weights)
+        return [self.template_instance.from_vector(v) for v in vectors]
+
+    def project_many(self, instances):
+        """
+        Projects each of the `instances` onto the model, retrieving the
+        optimal linear weightings. The instances are vectorized into a single
+        data matrix which is projected with one matrix product, rather than
+        calling :meth:`project` on each instance in turn. Instances without a
+        length (e.g. generators) are first gathered into a `list`.
+
+        Parameters
+        ----------
+        instances : `list` or `iterable` of :map:`Vectorizable`
+            The novel instances.
+
+        Returns
+        -------
+        projected : ``(n_instances, n_active_components)`` `ndarray`
+            The optimal linear weightings of each instance.
+        """
+        # as_matrix needs to know the number of instances up front
+        if not hasattr(instances, '__len__'):
+            instances = list(instances)
+        return self.project_vectors(as_matrix(instances))
+
+    def reconstruct_many(self, instances):
+        """
+        Projects each of the `instances` onto the linear space and rebuilds
+        them from the weights found. Equivalent to calling
+        :meth:`reconstruct` on each instance, but with one matrix product for
+        each of the projection and the reconstruction.
+
+        Parameters
+        ----------
+        instances : `list` or `iterable` of :map:`Vectorizable`
+            The novel instances.
+
+        Returns
+        -------
+        reconstructed : `list` of :map:`Vectorizable`
+            The reconstructed objects, each of the same type as the
+            corresponding instance.
+        """
+        # the instances are needed again to rebuild the reconstructions, so
+        # make sure that generators and lazy lists are only consumed once
+        instances = list(instances)
+        weights = self.project_many(instances)
+        vectors = self._instance_vectors_for_full_weights(weights)
+        return [i.from_vector(v) for i, v in zip(instances, vectors)]
+
     def project_whitened(self, instance):
         """
         Projects the `instance` onto the whitened components, retrieving the 
@@ -1402,7 +1679,8 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
                   verbose=False):
         r"""
         Update the eigenvectors, eigenvalues and mean vector of this model
-        by performing incremental PCA on the given samples.
+        by performing incremental PCA on the given samples. The samples are
+        converted to the data type of the model, which is preserved.
 
         Parameters
         ----------
@@ -1425,7 +1703,8 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
            "Incremental Learning for Robust Visual Tracking". IJCV, 2007.
         """
         # build a data matrix from the new samples
-        data = as_matrix(samples, length=n_samples, verbose=verbose)
+        data = as_matrix(samples, length=n_samples, verbose=verbose,
+                         dtype=self._components.dtype)
         n_new_samples = data.shape[0]
         PCAVectorModel.increment(self, data, n_samples=n_new_samples,
                                  forgetting_factor=forgetting_factor,
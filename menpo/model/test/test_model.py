@@ -176,6 +176,74 @@ def test_pca_variance_after_trim():
     assert(model.inverse_noise_variance() == 1 / model.noise_variance())
 
 
+def test_pca_randomized_solver():
+    rng = np.random.RandomState(0)
+    samples = rng.randn(100, 5).dot(rng.randn(5, 30))
+    full = PCAVectorModel(samples, max_n_components=3, inplace=False,
+                          solver='full')
+    model = PCAVectorModel(samples, max_n_components=3, solver='randomized')
+    assert_equal(model.n_components, 3)
+    assert_almost_equal(model.eigenvalues, full.eigenvalues)
+    assert_almost_equal(np.abs(model.components), np.abs(full.components))
+    # the variance of the components that were never computed is retained
+    assert_almost_equal(model.original_variance(), full.original_variance())
+    assert_almost_equal(model.variance_ratio(), full.variance_ratio())
+
+
+def test_pca_default_solver_is_exact():
+    rng = np.random.RandomState(0)
+    samples = rng.randn(600, 40)
+    full = PCAVectorModel(samples, max_n_components=5, inplace=False,
+                          solver='full')
+    model = PCAVectorModel(samples, max_n_components=5, inplace=False)
+    assert_equal(model.eigenvalues, full.eigenvalues)
+    assert_equal(model.components, full.components)
+
+
+def test_pca_model_arpack_solver():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(30)]
+    full = PCAModel(samples, max_n_components=4, inplace=False,
+                    solver='full')
+    model = PCAModel(samples, max_n_components=4, solver='arpack')
+    assert_almost_equal(model.eigenvalues, full.eigenvalues)
+    assert_almost_equal(model.noise_variance(), full.noise_variance())
+
+
+def test_pca_init_from_stream():
+    samples = [PointCloud(np.random.randn(8, 2)) for _ in range(25)]
+    model = PCAModel(samples, inplace=False)
+    streamed = PCAModel.init_from_stream(iter(samples), batch_size=6)
+    assert_equal(streamed.n_samples, 25)
+    assert_almost_equal(streamed.mean().points, model.mean().points)
+    assert_almost_equal(streamed.eigenvalues, model.eigenvalues)
+    assert_almost_equal(np.abs(streamed.components), np.abs(model.components))
+
+
+def test_pca_init_from_stream_max_n_components():
+    rng = np.random.RandomState(0)
+    basis = rng.randn(3, 20)
+    samples = [PointCloud(rng.randn(3).dot(basis).reshape(-1, 2))
+               for _ in range(40)]
+    model = PCAModel(samples, max_n_components=3)
+    streamed = PCAModel.init_from_stream(samples, batch_size=7,
+                                         max_n_components=3, n_samples=30)
+    assert_equal(streamed.n_samples, 30)
+    assert_equal(streamed.n_components, 3)
+    streamed = PCAModel.init_from_stream(samples, batch_size=7,
+                                         max_n_components=3)
+    assert_almost_equal(streamed.eigenvalues, model.eigenvalues)
+    assert_almost_equal(streamed.original_variance(),
+                        model.original_variance())
+
+
+def test_pca_init_from_stream_too_few_samples():
+    samples = [PointCloud(np.random.randn(8, 2))]
+    with raises(ValueError):
+        PCAModel.init_from_stream(samples, batch_size=5)
+    with raises(ValueError):
+        PCAModel.init_from_stream(samples * 5, batch_size=1)
+
+
 def test_pca_orthogonalize_against():
     pca_samples = np.random.randn(10, 10)
     pca_model = PCAVectorModel(pca_samples)
@@ -335,3 +403,60 @@ def test_pca_project():
     pca_model = PCAModel(pca_samples)
     projected = pca_model.project(pca_samples[0])
     assert projected.shape[0] == 9
+
+
+def test_pca_project_many():
+    pca_samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    pca_model = PCAModel(pca_samples)
+    pca_model.n_active_components = 5
+    projected = pca_model.project_many(pca_samples[:3])
+    assert projected.shape == (3, 5)
+    assert_almost_equal(projected[1], pca_model.project(pca_samples[1]))
+    projected = pca_model.project_many(s for s in pca_samples[:3])
+    assert projected.shape == (3, 5)
+    assert_almost_equal(projected[1], pca_model.project(pca_samples[1]))
+
+
+def test_pca_reconstruct_many():
+    pca_samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    pca_model = PCAModel(pca_samples)
+    pca_model.n_active_components = 5
+    novel = [PointCloud(np.random.randn(10, 2)) for _ in range(3)]
+    reconstructed = pca_model.reconstruct_many(iter(novel))
+    assert len(reconstructed) == 3
+    for r, n in zip(reconstructed, novel):
+        assert type(r) == PointCloud
+        assert_almost_equal(r.points, pca_model.reconstruct(n).points)
+
+
+def test_pca_instances():
+    pca_samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    pca_model = PCAModel(pca_samples)
+    weights = np.random.randn(4, 3)
+    instances = pca_model.instances(weights, normalized_weights=True)
+    assert len(instances) == 4
+    assert_almost_equal(
+        instances[2].points,
+        pca_model.instance(weights[2], normalized_weights=True).points)
+
+
+def test_pca_float32():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples, dtype=np.float32)
+    model64 = PCAModel(samples)
+    assert model.components.dtype == np.float32
+    assert model.eigenvalues.dtype == np.float32
+    assert model.mean_vector.dtype == np.float32
+    assert_allclose(model.eigenvalues, model64.eigenvalues, rtol=1e-4)
+    model.increment(samples[:4])
+    assert model.components.dtype == np.float32
+    assert model.mean_vector.dtype == np.float32
+
+
+def test_pca_float32_orthonormalize_against():
+    model = PCAVectorModel(np.random.randn(10, 10), dtype=np.float32)
+    lm = LinearVectorModel(np.random.randn(2, 10))
+    model.orthonormalize_against_inplace(lm)
+    assert model.components.dtype == np.float32
+    assert lm.components.dtype == np.float64
+    assert_allclose(np.dot(lm.components, model.components.T), 0, atol=1e-5)
@@ -172,3 +172,84 @@ def test_lazylist_slice_with_ndarray():
     l = LazyList.init_from_iterable(['a', 'b', 'c', 'd', 'e'])
     l_indexed = l[index]
     assert list(l_indexed) == ['b', 'a', 'd']
+
+
+def test_lazylist_prefetch_preserves_order():
+    ll = LazyList.init_from_iterable(range(20))
+    assert list(ll.prefetch(n_workers=4)) == list(range(20))
+
+
+def test_lazylist_prefetch_process_backend():
+    ll = LazyList.init_from_iterable(range(5), f=abs)
+    assert list(ll.prefetch(n_workers=2, backend='process')) == list(range(5))
+
+
+def test_lazylist_prefetch_bounded_lookahead():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func] * 10)
+    prefetcher = ll.prefetch(n_workers=1, lookahead=2)
+    mock_func.assert_not_called()
+    next(prefetcher)
+    assert mock_func.call_count <= 3
+    prefetcher.close()
+
+
+def test_lazylist_prefetch_invalid_backend_raises_value_error():
+    with raises(ValueError):
+        LazyList([]).prefetch(backend='foo')
+
+
+def test_lazylist_prefetch_non_positive_lookahead_raises_value_error():
+    with raises(ValueError):
+        LazyList([]).prefetch(lookahead=0)
+
+
+def test_lazylist_cached_calls_once():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func]).cached()
+    assert ll[0] == 1
+    assert ll[0] == 1
+    assert mock_func.call_count == 1
+    assert ll.cache.hits == 1
+    assert ll.cache.misses == 1
+
+
+def test_lazylist_cached_max_items_evicts_least_recently_used():
+    a = Mock()
+    a.return_value = 1
+    b = Mock()
+    b.return_value = 2
+    ll = LazyList([a, b]).cached(max_items=1)
+    ll[0]
+    ll[1]
+    ll[0]
+    assert a.call_count == 2
+    assert b.call_count == 1
+    assert ll.cache.n_items == 1
+
+
+def test_lazylist_cached_max_bytes_evicts():
+    ll = LazyList.init_from_iterable([np.zeros(10), np.zeros(10)]).cached(
+        max_bytes=100)
+    ll[0]
+    ll[1]
+    assert ll.cache.n_items == 1
+    assert ll.cache.n_bytes == 80
+
+
+def test_lazylist_cached_item_larger_than_max_bytes_not_cached():
+    ll = LazyList.init_from_iterable([np.zeros(100)]).cached(max_bytes=100)
+    ll[0]
+    assert ll.cache.n_items == 0
+
+
+def test_lazylist_cached_shared_by_slices():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func] * 2).cached()
+    ll[0]
+    ll[:1][0]
+    assert mock_func.call_count == 1
+    assert ll.cache.hits == 1
@@ -1,13 +1,11 @@
 import numpy as np
 
-from ..homogeneous import AlignmentSimilarity
+from ..homogeneous import AlignmentSimilarity, procrustes_alignment_batch
 from .base import MultipleAlignment
 
 
 avoid_circular = None      # to avoid circular imports
-mean_pointcloud = None     # to avoid circular imports
 PointCloud = None          # to avoid circular imports
-scale_about_centre = None  # to avoid circular imports
 
 
 class GeneralizedProcrustesAnalysis(MultipleAlignment):
@@ -37,13 +35,17 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
         super(GeneralizedProcrustesAnalysis, self).__init__(sources,
                                                             target=target)
         initial_target = self.target
-        self.transforms = [AlignmentSimilarity(source, self.target,
-                                               allow_mirror=allow_mirror)
-                           for source in self.sources]
+        self.allow_mirror = allow_mirror
         self.initial_target_scale = self.target.norm()
         self.n_iterations = 1
         self.max_iterations = 100
+        # Every iteration aligns all the sources at once, only the final
+        # alignments are built as individual transforms
+        self._source_points = np.array([s.points for s in self.sources])
         self.converged = self._recursive_procrustes()
+        self.transforms = [AlignmentSimilarity(source, self.target,
+                                               allow_mirror=allow_mirror)
+                           for source in self.sources]
         if target is not None:
             self.target = initial_target
 
@@ -51,30 +53,32 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
         r"""
         Recursively calculates a procrustes alignment.
         """
-        global mean_pointcloud, PointCloud, scale_about_centre, avoid_circular
+        global PointCloud, avoid_circular
         if avoid_circular is None:
-            from menpo.shape import mean_pointcloud, PointCloud
-            from ..compositions import scale_about_centre
+            from menpo.shape import PointCloud
             avoid_circular = True
 
         if self.n_iterations > self.max_iterations:
             return False
-        new_tgt = mean_pointcloud([PointCloud(t.aligned_source().points,
-                                              copy=False)
-                                   for t in self.transforms])
+        transforms, _ = procrustes_alignment_batch(
+            self._source_points, self.target.points,
+            allow_mirror=self.allow_mirror)
+        aligned = transforms.apply(self._source_points)
+        new_tgt_points = aligned.mean(axis=0)
         # rescale the new_target to be the same size as the original about
         # it's centre
-        rescale = scale_about_centre(new_tgt,
-                                     self.initial_target_scale / new_tgt.norm())
-        rescale._apply_inplace(new_tgt)
+        centre = new_tgt_points.mean(axis=0)
+        new_tgt_points -= centre
+        new_tgt_points *= (self.initial_target_scale /
+                           np.linalg.norm(new_tgt_points))
+        new_tgt_points += centre
+        new_tgt = PointCloud(new_tgt_points, copy=False)
         # check to see if we have converged yet
         delta_target = np.linalg.norm(self.target.points - new_tgt.points)
         if delta_target < 1e-6:
             return True
         else:
             self.n_iterations += 1
-            for t in self.transforms:
-                t.set_target(new_tgt)
             self.target = new_tgt
             return self._recursive_procrustes()
 
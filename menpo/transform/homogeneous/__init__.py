@@ -4,3 +4,5 @@ from .similarity import Similarity, AlignmentSimilarity
 from .rotation import Rotation, AlignmentRotation
 from .translation import Translation, AlignmentTranslation
 from .scale import Scale, NonUniformScale, UniformScale, AlignmentUniformScale
+from .batch import (HomogeneousBatch, procrustes_alignment_batch,
+                    rotation_alignment_batch, affine_alignment_batch)
@@ -0,0 +1,592 @@
+import numpy as np
+
+from menpo.base import Copyable
+
+from .base import Homogeneous
+from .affine import Affine
+from .similarity import Similarity
+
+
+# The families of transform that a batch can be made of, from the most to
+# the least specific. Each can be rebuilt from its h_matrix alone.
+_BATCH_FAMILIES = (Similarity, Affine, Homogeneous)
+
+
+def _common_family(*transform_types):
+    r"""
+    The most specific of :data:`_BATCH_FAMILIES` that all the given types of
+    transform belong to.
+    """
+    for family in _BATCH_FAMILIES:
+        if all(issubclass(t, family) for t in transform_types):
+            return family
+    raise ValueError('Only Homogeneous transforms can be batched')
+
+
+class HomogeneousBatch(Copyable):
+    r"""
+    A batch of ``n_transforms`` homogeneous transforms of the same
+    dimensionality, stored as a single stack of homogeneous matrices. Every
+    operation (applying, composing, inverting and vectorizing) is computed
+    over the whole batch at once, rather than through one
+    :map:`Homogeneous` per transform.
+
+    Parameters
+    ----------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The homogeneous matrix of each transform.
+    transform_cls : ``{Homogeneous, Affine, Similarity}``, optional
+        The family of the transforms. It determines the parametrisation used
+        by :meth:`as_vectors` and :meth:`from_vectors`, and the type of the
+        transforms produced by :meth:`to_transforms`.
+    copy : `bool`, optional
+        If ``False``, avoid copying ``h_matrices``. Useful for performance.
+
+    Raises
+    ------
+    ValueError
+        If ``h_matrices`` is not a stack of square matrices or
+        ``transform_cls`` is not one of the supported families.
+    """
+    def __init__(self, h_matrices, transform_cls=Homogeneous, copy=True):
+        h_matrices = np.array(h_matrices, copy=copy)
+        if h_matrices.ndim != 3 or h_matrices.shape[1] != h_matrices.shape[2]:
+            raise ValueError('h_matrices must be of shape '
+                             '(n_transforms, n_dims + 1, n_dims + 1)')
+        if transform_cls not in _BATCH_FAMILIES:
+            raise ValueError('transform_cls must be one of Homogeneous, '
+                             'Affine or Similarity')
+        self._h_matrices = h_matrices
+        self.transform_cls = transform_cls
+
+    @classmethod
+    def init_identity(cls, n_transforms, n_dims, transform_cls=Homogeneous):
+        r"""
+        Creates a batch of identity transforms.
+
+        Parameters
+        ----------
+        n_transforms : `int`
+            The number of transforms.
+        n_dims : `int`
+            The number of dimensions.
+        transform_cls : ``{Homogeneous, Affine, Similarity}``, optional
+            The family of the transforms.
+
+        Returns
+        -------
+        identity : :map:`HomogeneousBatch`
+            The batch of identity transforms.
+        """
+        h_matrices = np.tile(np.eye(n_dims + 1), (n_transforms, 1, 1))
+        return cls(h_matrices, transform_cls=transform_cls, copy=False)
+
+    @classmethod
+    def init_from_transforms(cls, transforms):
+        r"""
+        Creates a batch from a list of homogeneous transforms. The family of
+        the batch is the most specific of :map:`Similarity`, :map:`Affine`
+        and :map:`Homogeneous` that all the transforms belong to.
+
+        Parameters
+        ----------
+        transforms : `list` of :map:`Homogeneous`
+            The transforms, which must all have the same dimensionality.
+
+        Returns
+        -------
+        batch : :map:`HomogeneousBatch`
+            The batch of transforms.
+
+        Raises
+        ------
+        ValueError
+            If ``transforms`` is empty or not all of the transforms are
+            :map:`Homogeneous`.
+        """
+        if len(transforms) == 0:
+            raise ValueError('At least one transform is required')
+        transform_cls = _common_family(*[type(t) for t in transforms])
+        return cls(np.array([t.h_matrix for t in transforms]),
+                   transform_cls=transform_cls, copy=False)
+
+    @property
+    def h_matrices(self):
+        r"""
+        The homogeneous matrix of each transform.
+
+        :type: ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        """
+        return self._h_matrices
+
+    @property
+    def n_transforms(self):
+        r"""
+        The number of transforms in the batch.
+
+        :type: `int`
+        """
+        return self._h_matrices.shape[0]
+
+    @property
+    def n_dims(self):
+        r"""
+        The dimensionality of the data the transforms operate on.
+
+        :type: `int`
+        """
+        return self._h_matrices.shape[2] - 1
+
+    def copy(self):
+        r"""
+        Generate an efficient copy of this :map:`HomogeneousBatch`.
+
+        Returns
+        -------
+        new_batch : :map:`HomogeneousBatch`
+            A copy of this object
+        """
+        return HomogeneousBatch(self._h_matrices,
+                                transform_cls=self.transform_cls)
+
+    def __len__(self):
+        return self.n_transforms
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return HomogeneousBatch(self._h_matrices[index],
+                                    transform_cls=self.transform_cls)
+        return self.transform_cls(self._h_matrices[index], skip_checks=True)
+
+    def __str__(self):
+        return '{} {} transforms of {}D data'.format(
+            self.n_transforms, self.transform_cls.__name__, self.n_dims)
+
+    def to_transforms(self):
+        r"""
+        The transforms of the batch as a list of individual transforms of
+        type :attr:`transform_cls`.
+
+        :type: `list` of :map:`Homogeneous`
+        """
+        return [self.transform_cls(h, skip_checks=True)
+                for h in self._h_matrices]
+
+    def apply(self, x):
+        r"""
+        Applies each transform to the corresponding set of points, with a
+        single batched matrix product.
+
+        Parameters
+        ----------
+        x : ``(n_transforms, n_points, n_dims)`` `ndarray`
+            The sets of points. Set ``i`` is transformed by transform ``i``.
+
+        Returns
+        -------
+        transformed : ``(n_transforms, n_points, n_dims)`` `ndarray`
+            The transformed sets of points.
+
+        Raises
+        ------
+        ValueError
+            If ``x`` is not of shape ``(n_transforms, n_points, n_dims)``.
+        """
+        x = np.asarray(x)
+        if (x.ndim != 3 or x.shape[0] != self.n_transforms or
+                x.shape[2] != self.n_dims):
+            raise ValueError('Points must be of shape (n_transforms, '
+                             'n_points, n_dims) = ({}, n_points, '
+                             '{})'.format(self.n_transforms, self.n_dims))
+        if issubclass(self.transform_cls, Affine):
+            # The homogeneous coordinate of an affine transform is always 1,
+            # so only the linear and translation components are needed
+            rows = self._h_matrices[:, :-1]
+        else:
+            rows = self._h_matrices
+        y = np.matmul(x, rows[:, :, :-1].transpose(0, 2, 1))
+        y += rows[:, None, :, -1]
+        if rows is self._h_matrices:
+            return y[..., :-1] / y[..., -1:]
+        return y
+
+    def _as_batch(self, transform):
+        if isinstance(transform, HomogeneousBatch):
+            if transform.n_transforms != self.n_transforms:
+                raise ValueError('Batches of {} and {} transforms cannot be '
+                                 'composed'.format(self.n_transforms,
+                                                   transform.n_transforms))
+            return transform._h_matrices, transform.transform_cls
+        elif isinstance(transform, Homogeneous):
+            return transform.h_matrix, type(transform)
+        raise ValueError('A HomogeneousBatch can only be composed with '
+                         'another HomogeneousBatch or a Homogeneous '
+                         'transform')
+
+    def compose_before(self, transform):
+        r"""
+        Composes each transform of this batch **before** a transform::
+
+            c = a.compose_before(b)
+            c.apply(p) == b.apply(a.apply(p))
+
+        Parameters
+        ----------
+        transform : :map:`HomogeneousBatch` or :map:`Homogeneous`
+            Either a batch of the same number of transforms, composed
+            element-wise, or a single transform that is composed with every
+            transform of this batch.
+
+        Returns
+        -------
+        composed : :map:`HomogeneousBatch`
+            The batch of composed transforms, whose family is the first that
+            is common to both operands.
+        """
+        h_matrices, transform_cls = self._as_batch(transform)
+        return HomogeneousBatch(
+            np.matmul(h_matrices, self._h_matrices),
+            transform_cls=_common_family(self.transform_cls, transform_cls),
+            copy=False)
+
+    def compose_after(self, transform):
+        r"""
+        Composes each transform of this batch **after** a transform::
+
+            c = a.compose_after(b)
+            c.apply(p) == a.apply(b.apply(p))
+
+        Parameters
+        ----------
+        transform : :map:`HomogeneousBatch` or :map:`Homogeneous`
+            Either a batch of the same number of transforms, composed
+            element-wise, or a single transform that is composed with every
+            transform of this batch.
+
+        Returns
+        -------
+        composed : :map:`HomogeneousBatch`
+            The batch of composed transforms, whose family is the first that
+            is common to both operands.
+        """
+        h_matrices, transform_cls = self._as_batch(transform)
+        return HomogeneousBatch(
+            np.matmul(self._h_matrices, h_matrices),
+            transform_cls=_common_family(self.transform_cls, transform_cls),
+            copy=False)
+
+    def pseudoinverse(self):
+        r"""
+        The inverse of every transform of the batch.
+
+        :type: :map:`HomogeneousBatch`
+        """
+        return HomogeneousBatch(np.linalg.inv(self._h_matrices),
+                                transform_cls=self.transform_cls, copy=False)
+
+    def _check_similarity_is_2d(self):
+        if self.n_dims != 2:
+            raise NotImplementedError('Only 2D Similarity transforms can be '
+                                      'vectorized.')
+
+    @property
+    def n_parameters(self):
+        r"""
+        The number of parameters of each transform, as
+        :attr:`Homogeneous.n_parameters` for the family of the batch.
+
+        :type: `int`
+        """
+        d = self.n_dims
+        if self.transform_cls is Similarity:
+            self._check_similarity_is_2d()
+            return 4
+        elif self.transform_cls is Affine:
+            return d * (d + 1)
+        return (d + 1) ** 2
+
+    def as_vectors(self):
+        r"""
+        The parameters of every transform, in the same order as
+        :meth:`Homogeneous.as_vector` for the family of the batch.
+
+        Returns
+        -------
+        vectors : ``(n_transforms, n_parameters)`` `ndarray`
+            The parameters of each transform.
+        """
+        d = self.n_dims
+        n = self.n_transforms
+        if self.transform_cls is Homogeneous:
+            return self._h_matrices.reshape(n, -1).copy()
+        # Deltas from the identity of the non-homogeneous rows, in Fortran
+        # order - see Affine.as_vector
+        params = self._h_matrices[:, :d, :] - np.eye(d + 1)[:d]
+        params = params.transpose(0, 2, 1).reshape(n, -1)
+        if self.transform_cls is Similarity:
+            # [a, b, tx, ty] - see Similarity.as_vector
+            self._check_similarity_is_2d()
+            return params[:, [0, 1, 4, 5]]
+        return params
+
+    def from_vectors(self, vectors):
+        r"""
+        Build a new batch of the same family from the parameters of every
+        transform.
+
+        Parameters
+        ----------
+        vectors : ``(n_vectors, n_parameters)`` `ndarray`
+            The parameters of each transform, as :meth:`as_vectors`. The
+            number of transforms of the new batch is ``n_vectors``.
+
+        Returns
+        -------
+        batch : :map:`HomogeneousBatch`
+            The new batch of transforms.
+
+        Raises
+        ------
+        ValueError
+            If ``vectors`` is not of shape ``(n_vectors, n_parameters)``.
+        """
+        vectors = np.asarray(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.n_parameters:
+            raise ValueError('Vectors must be of shape (n_vectors, '
+                             '{})'.format(self.n_parameters))
+        d = self.n_dims
+        n = vectors.shape[0]
+        if self.transform_cls is Homogeneous:
+            h_matrices = vectors.reshape(n, d + 1, d + 1).astype(np.float64)
+        else:
+            h_matrices = np.tile(np.eye(d + 1), (n, 1, 1))
+            if self.transform_cls is Similarity:
+                a, b, tx, ty = vectors.T
+                h_matrices[:, 0, 0] += a
+                h_matrices[:, 1, 1] += a
+                h_matrices[:, 0, 1] = -b
+                h_matrices[:, 1, 0] = b
+                h_matrices[:, 0, 2] = tx
+                h_matrices[:, 1, 2] = ty
+            else:
+                h_matrices[:, :d, :] += vectors.reshape(
+                    n, d + 1, d).transpose(0, 2, 1)
+        return HomogeneousBatch(h_matrices, transform_cls=self.transform_cls,
+                                copy=False)
+
+
+def _points_stack(pointclouds, name):
+    r"""
+    The points of a `list` of :map:`PointCloud` (or an `ndarray`) as a single
+    ``(n, n_points, n_dims)`` floating point `ndarray`.
+    """
+    if isinstance(pointclouds, np.ndarray):
+        points = pointclouds
+    else:
+        points = np.array([getattr(pc, 'points', pc) for pc in pointclouds])
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 3:
+        raise ValueError('{} must be of shape (n, n_points, '
+                         'n_dims)'.format(name))
+    return points
+
+
+def _sources_and_targets(sources, targets):
+    r"""
+    Stacks of sources and targets of the same shape, where a single target
+    is broadcast against every source.
+    """
+    sources = _points_stack(sources, 'sources')
+    targets = getattr(targets, 'points', targets)
+    if isinstance(targets, np.ndarray) and targets.ndim == 2:
+        targets = targets[None]
+    targets = _points_stack(targets, 'targets')
+    if targets.shape[0] == 1:
+        targets = np.broadcast_to(targets, sources.shape)
+    if targets.shape != sources.shape:
+        raise ValueError('There must be one target, or one target per '
+                         'source, with the same shape as the sources')
+    return sources, targets
+
+
+def _alignment_errors(batch, sources, targets):
+    r"""
+    The Frobenius norm of the difference between each target and the
+    corresponding aligned source, as :meth:`Alignment.alignment_error`.
+    """
+    residuals = targets - batch.apply(sources)
+    return np.sqrt(np.einsum('nij,nij->n', residuals, residuals))
+
+
+def optimal_rotation_matrix_batch(sources, targets, allow_mirror=False):
+    r"""
+    The optimal rotation between each source and target, as
+    :func:`optimal_rotation_matrix`, computed with a single batched SVD.
+
+    Parameters
+    ----------
+    sources : ``(n_sources, n_points, n_dims)`` `ndarray`
+        The source points to be aligned.
+    targets : ``(n_sources, n_points, n_dims)`` `ndarray`
+        The target points to be aligned.
+    allow_mirror : `bool`, optional
+        If ``True``, the Kabsch algorithm check is not performed, and mirroring
+        of the Rotation matrices is permitted.
+
+    Returns
+    -------
+    rotations : ``(n_sources, n_dims, n_dims)`` `ndarray`
+        The optimal square rotation matrix of each pair.
+    """
+    correlations = np.matmul(targets.transpose(0, 2, 1), sources)
+    U, D, Vt = np.linalg.svd(correlations)
+    R = np.matmul(U, Vt)
+    if not allow_mirror:
+        # Flip the last singular vector of any reflection, so that
+        # R = U * E * Vt with E = diag(1, ..., 1, sgn(det(U * Vt)))
+        flip = np.linalg.det(R) < 0
+        if np.any(flip):
+            U[flip, :, -1] *= -1
+            R[flip] = np.matmul(U[flip], Vt[flip])
+    return R
+
+
+def procrustes_alignment_batch(sources, targets, rotation=True,
+                               allow_mirror=False):
+    r"""
+    The similarity transforms that align each source to its target, as
+    :map:`AlignmentSimilarity`, computed for all the sources at once with
+    batched array operations and a single batched SVD.
+
+    Parameters
+    ----------
+    sources : `list` of :map:`PointCloud` or ``(n_sources, n_points, n_dims)`` `ndarray`
+        The sources to align.
+    targets : :map:`PointCloud` or `list` of :map:`PointCloud` or `ndarray`
+        Either a single target, that every source is aligned to, or one
+        target per source.
+    rotation : `bool`, optional
+        If ``True``, rotation is allowed in the Procrustes calculation. If
+        ``False``, only scale and translation effects are allowed in the
+        returned transforms.
+    allow_mirror : `bool`, optional
+        If ``True``, the Kabsch algorithm check is not performed, and mirroring
+        of the Rotation matrices is permitted.
+
+    Returns
+    -------
+    transforms : :map:`HomogeneousBatch`
+        The batch of :map:`Similarity` transforms that optimally align each
+        source to its target.
+    alignment_errors : ``(n_sources,)`` `ndarray`
+        The Frobenius norm of the difference between each target and the
+        aligned source.
+
+    Raises
+    ------
+    ValueError
+        If the targets do not match the shape of the sources.
+    """
+    sources, targets = _sources_and_targets(sources, targets)
+    n, _, n_dims = sources.shape
+    src_centres = sources.mean(axis=1)
+    tgt_centres = targets.mean(axis=1)
+    centred_src = sources - src_centres[:, None]
+    centred_tgt = targets - tgt_centres[:, None]
+    # the scale that matches the norm of each source to that of its target
+    scales = (np.sqrt(np.einsum('nij,nij->n', centred_tgt, centred_tgt)) /
+              np.sqrt(np.einsum('nij,nij->n', centred_src, centred_src)))
+    if rotation:
+        linear = optimal_rotation_matrix_batch(
+            centred_src * scales[:, None, None], centred_tgt,
+            allow_mirror=allow_mirror)
+    else:
+        linear = np.tile(np.eye(n_dims), (n, 1, 1))
+    linear *= scales[:, None, None]
+    # centre the source, scale and rotate it, then translate it to the target
+    h_matrices = np.tile(np.eye(n_dims + 1), (n, 1, 1))
+    h_matrices[:, :n_dims, :n_dims] = linear
+    h_matrices[:, :n_dims, -1] = tgt_centres - np.einsum(
+        'nij,nj->ni', linear, src_centres)
+    batch = HomogeneousBatch(h_matrices, transform_cls=Similarity, copy=False)
+    return batch, _alignment_errors(batch, sources, targets)
+
+
+def rotation_alignment_batch(sources, targets, allow_mirror=False):
+    r"""
+    The rotations that align each source to its target, as
+    :map:`AlignmentRotation`, computed for all the sources at once with a
+    single batched SVD.
+
+    Parameters
+    ----------
+    sources : `list` of :map:`PointCloud` or ``(n_sources, n_points, n_dims)`` `ndarray`
+        The sources to align.
+    targets : :map:`PointCloud` or `list` of :map:`PointCloud` or `ndarray`
+        Either a single target, that every source is aligned to, or one
+        target per source.
+    allow_mirror : `bool`, optional
+        If ``True``, the Kabsch algorithm check is not performed, and mirroring
+        of the Rotation matrices is permitted.
+
+    Returns
+    -------
+    transforms : :map:`HomogeneousBatch`
+        The batch of rotations (as :map:`Similarity` transforms) that
+        optimally align each source to its target.
+    alignment_errors : ``(n_sources,)`` `ndarray`
+        The Frobenius norm of the difference between each target and the
+        aligned source.
+
+    Raises
+    ------
+    ValueError
+        If the targets do not match the shape of the sources.
+    """
+    sources, targets = _sources_and_targets(sources, targets)
+    n, _, n_dims = sources.shape
+    h_matrices = np.tile(np.eye(n_dims + 1), (n, 1, 1))
+    h_matrices[:, :n_dims, :n_dims] = optimal_rotation_matrix_batch(
+        sources, targets, allow_mirror=allow_mirror)
+    batch = HomogeneousBatch(h_matrices, transform_cls=Similarity, copy=False)
+    return batch, _alignment_errors(batch, sources, targets)
+
+
+def affine_alignment_batch(sources, targets):
+    r"""
+    The affine transforms that align each source to its target, as
+    :map:`AlignmentAffine`, computed for all the sources at once by solving
+    the batch of linear least squares problems together.
+
+    Parameters
+    ----------
+    sources : `list` of :map:`PointCloud` or ``(n_sources, n_points, n_dims)`` `ndarray`
+        The sources to align.
+    targets : :map:`PointCloud` or `list` of :map:`PointCloud` or `ndarray`
+        Either a single target, that every source is aligned to, or one
+        target per source.
+
+    Returns
+    -------
+    transforms : :map:`HomogeneousBatch`
+        The batch of :map:`Affine` transforms that optimally align each
+        source to its target.
+    alignment_errors : ``(n_sources,)`` `ndarray`
+        The Frobenius norm of the difference between each target and the
+        aligned source.
+
+    Raises
+    ------
+    ValueError
+        If the targets do not match the shape of the sources.
+    """
+    sources, targets = _sources_and_targets(sources, targets)
+    n, n_points, n_dims = sources.shape
+    ones = np.ones((n, n_points, 1))
+    a = np.concatenate([sources, ones], axis=2)
+    b = np.concatenate([targets, ones], axis=2)
+    a_t = a.transpose(0, 2, 1)
+    h_matrices = np.linalg.solve(np.matmul(a_t, a),
+                                 np.matmul(a_t, b)).transpose(0, 2, 1)
+    batch = HomogeneousBatch(h_matrices, transform_cls=Affine, copy=False)
+    return batch, _alignment_errors(batch, sources, targets)
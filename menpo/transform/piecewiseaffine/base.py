@@ -1,8 +1,6 @@
 import numpy as np
-from copy import deepcopy
-from menpo.base import Copyable
 from menpo.transform.base import Alignment, Invertible, Transform
-from .fastpwa import CLookupPWA
+from .fastpwa import CTriangleGridIndex
 # TODO View is broken for PWA (TriangleContainmentError)
 
 
@@ -223,6 +221,7 @@ class AbstractPWA(Alignment, Transform, Invertible):
             raise ValueError("source and target must be 2 "
                              "dimensional")
         self.ti, self.tij, self.tik = None, None, None
+        self._triangle_index = None
         self._rebuild_target_vectors()
 
     @property
@@ -257,10 +256,38 @@ class AbstractPWA(Alignment, Transform, Invertible):
     def _sync_state_from_target(self):
         r"""
         PWA is particularly efficient to sync from target - we don't have to
-        do much at all, just rebuild the target vectors.
+        do much at all, just rebuild the target vectors. The triangle index is
+        built over the source, so it survives changes to the target.
         """
         self._rebuild_target_vectors()
 
+    def _grid_index(self):
+        r"""
+        The spatial index over the source triangles, which is built on first
+        use.
+
+        :type: `CTriangleGridIndex`
+        """
+        # PWAs pickled before the index existed have no _triangle_index
+        if getattr(self, '_triangle_index', None) is None:
+            self._triangle_index = CTriangleGridIndex(
+                np.require(self.source.points, dtype=np.float64,
+                           requirements=['C']),
+                np.require(self.trilist, dtype=np.uint32, requirements=['C']))
+        return self._triangle_index
+
+    def _indexed_alpha_beta(self, points):
+        r"""
+        Find the containing triangle and barycentric coordinates of each point
+        with a spatial index over the source triangles. See
+        :meth:`index_alpha_beta`.
+        """
+        points_c = np.require(points, dtype=np.float64, requirements=['C'])
+        index, alpha, beta = self._grid_index().index_alpha_beta(points_c)
+        if np.any(index < 0):
+            raise TriangleContainmentError(index < 0)
+        return index, alpha, beta
+
     def _apply(self, x, **kwargs):
         """
         Applies this transform to a new set of vectors.
@@ -280,6 +307,51 @@ class AbstractPWA(Alignment, Transform, Invertible):
                 alpha[:, None] * self.tij[tri_index] +
                 beta[:, None] * self.tik[tri_index])
 
+    def _warp_pixels(self, pixels, mask, mode='constant', cval=0.):
+        r"""
+        Warp the pixels of a 2D image into the source frame of this transform
+        (the template), by scanning each source triangle over the pixels of
+        ``mask`` and sampling ``pixels`` with bilinear interpolation. This is
+        equivalent to applying this transform to the true pixels of ``mask``
+        and sampling ``pixels`` at the results with ``order=1``, but no
+        intermediate points are created.
+
+        Parameters
+        ----------
+        pixels : ``(n_channels, M, N)`` `ndarray`
+            The floating point pixels of the image to warp.
+        mask : ``(H, W)`` `bool ndarray`
+            The pixels of the template to sample.
+        mode : ``{constant, nearest}``, optional
+            Points outside the boundaries of the image are either set to
+            ``cval`` or take the value of the nearest pixel.
+        cval : `float`, optional
+            The value of points outside the image if ``mode`` is
+            ``constant``.
+
+        Returns
+        -------
+        warped : ``(n_channels, H, W)`` `ndarray`
+            The warped pixels, which are ``0`` outside of ``mask``.
+
+        Raises
+        ------
+        TriangleContainmentError
+            All the pixels of ``mask`` must be contained in a source triangle.
+        """
+        target_vectors = np.require(
+            np.hstack([self.ti, self.tij, self.tik]), dtype=np.float64,
+            requirements=['C'])
+        mask = np.require(mask, dtype=np.bool, requirements=['C'])
+        warped = np.zeros((pixels.shape[0],) + mask.shape, dtype=pixels.dtype)
+        covered = self._grid_index().warp_bilinear(
+            pixels, target_vectors, mask.view(np.uint8), warped,
+            nearest=mode == 'nearest', cval=cval)
+        outside = mask & ~covered.astype(np.bool)
+        if np.any(outside):
+            raise TriangleContainmentError(outside[mask])
+        return warped
+
     def _apply_batched(self, x, batch_size, **kwargs):
         # This is a rare case where we need to override the batched apply
         # method. In this case, we override it because we want to the
@@ -374,7 +446,11 @@ class AbstractPWA(Alignment, Transform, Invertible):
 
 
 class PythonPWA(AbstractPWA):
-
+    r"""
+    A piecewise affine transformation that finds the triangle containing each
+    point by testing every point against every triangle with numpy. This is
+    the reference implementation - it needs ``(n_points, n_tris)`` memory.
+    """
     def __init__(self, source, target):
         super(PythonPWA, self).__init__(source, target)
         si, sij, sik = barycentric_vectors(self.source.points, self.trilist)
@@ -385,17 +461,28 @@ class PythonPWA(AbstractPWA):
 
 
 class CachedPWA(PythonPWA):
-
+    r"""
+    A piecewise affine transformation that remembers the triangles and
+    barycentric coordinates of the last set of points it was applied to, so
+    that applying it repeatedly to the same points (e.g. the pixels of a
+    template as the target changes) only transforms them.
+
+    Triangles are found with a uniform grid over the source triangles, so the
+    lookup is near constant time per point regardless of the size of the
+    mesh. Integral points that densely cover their bounds (such as the
+    pixels of an image) are instead found by rasterising the triangles.
+    """
     def __init__(self, source, target):
         super(CachedPWA, self).__init__(source, target)
         self._applied_points, self._iab = None, None
 
     def index_alpha_beta(self, points):
-        if (self._applied_points is None or not
+        if (self._applied_points is None or
+                points.shape != self._applied_points.shape or not
                 np.all(points == self._applied_points)):
             # This must happen first in case index_alpha_beta throws a
             # TriangleContainmentError
-            self._iab = PythonPWA.index_alpha_beta(self, points)
+            self._iab = self._indexed_alpha_beta(points)
             self._applied_points = points
         return self._iab
 
@@ -406,7 +493,8 @@ class CythonPWA(AbstractPWA):
 
     The apply method in this case involves dotting the triangle vectors with
     the values of alpha and beta found. The calculation of alpha and beta is
-    done in C, and a hash map is used to cache lookup values.
+    done in C, with a uniform grid over the source triangles to find the
+    triangle containing each point.
 
     Parameters
     ----------
@@ -428,25 +516,5 @@ class CythonPWA(AbstractPWA):
         All points to apply must be contained in a source triangle. Check
         `error.points_outside_source_domain` to handle this case.
     """
-    def __init__(self, source, target):
-        super(CythonPWA, self).__init__(source, target)
-        # make sure the source and target satisfy the c requirements
-        source_c = np.require(self.source.points, dtype=np.float64,
-                              requirements=['C'])
-        trilist_c = np.require(self.trilist, dtype=np.uint32,
-                               requirements=['C'])
-        # build the cython wrapped C object and store it locally
-        self._fastpwa = CLookupPWA(source_c, trilist_c)
-
-    def copy(self):
-        new = Copyable.copy(self)
-        new._fastpwa = deepcopy(self._fastpwa)
-        return new
-
     def index_alpha_beta(self, points):
-        points_c = np.require(points, dtype=np.float64, requirements=['C'])
-        index, alpha, beta = self._fastpwa.index_alpha_beta(points_c)
-        if np.any(index < 0):
-            raise TriangleContainmentError(index < 0)
-        else:
-            return index, alpha, beta
+        return self._indexed_alpha_beta(points)
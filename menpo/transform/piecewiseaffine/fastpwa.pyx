@@ -1,5 +1,12 @@
 import numpy as np
 cimport numpy as cnp
+cimport cython
+from libc.math cimport floor, ceil
+
+
+ctypedef fused FLOAT_TYPES:
+    float
+    double
 
 
 cdef extern from "./fastpwa/pwa.h":
@@ -87,3 +94,391 @@ cdef class CLookupPWA:
                                      points.shape[0], &indexes[0],
                                      &alphas[0], &betas[0])
         return indexes, alphas, betas
+
+
+cdef inline bint _triangle_alpha_beta(double[:, ::1] tri_vectors,
+                                      Py_ssize_t t, double p0, double p1,
+                                      double *alpha, double *beta) nogil:
+    # tri_vectors holds, for each triangle, the vertex i, the vectors ij and
+    # ik and the dot products (jj, kk, jk) and the inverse determinant. The
+    # arithmetic mirrors menpo.transform.piecewiseaffine.base.alpha_beta
+    cdef:
+        double ip0 = p0 - tri_vectors[t, 0]
+        double ip1 = p1 - tri_vectors[t, 1]
+        double dot_pj = ip0 * tri_vectors[t, 2] + ip1 * tri_vectors[t, 3]
+        double dot_pk = ip0 * tri_vectors[t, 4] + ip1 * tri_vectors[t, 5]
+    alpha[0] = (tri_vectors[t, 7] * dot_pj -
+                tri_vectors[t, 8] * dot_pk) * tri_vectors[t, 9]
+    beta[0] = (tri_vectors[t, 6] * dot_pk -
+               tri_vectors[t, 8] * dot_pj) * tri_vectors[t, 9]
+    return alpha[0] >= 0 and beta[0] >= 0 and alpha[0] + beta[0] <= 1
+
+
+cdef class CTriangleGridIndex:
+    r"""
+    A uniform grid over a 2D triangulation that finds the triangle containing
+    each of a set of points, along with the barycentric coordinates (alpha
+    and beta) of the point within it.
+
+    Each cell of the grid lists the triangles whose bounding box overlaps it,
+    so a query only tests the few triangles of the point's cell. If the
+    query points are integral and densely cover their bounding box (as the
+    pixels of an image or a mask do), the triangles are instead rasterised
+    directly, row by row, over the points' bounding box.
+
+    If a point lies in more than one triangle (i.e. on a shared edge), the
+    triangle with the largest index is returned, which matches
+    :func:`menpo.transform.piecewiseaffine.base.index_alpha_beta`.
+    """
+    cdef double[:, ::1] tri_vectors
+    cdef double[:, ::1] tri_bounds
+    cdef double origin0, origin1, cell_size
+    cdef Py_ssize_t n_rows, n_cols
+    cdef int[::1] cell_start
+    cdef int[::1] cell_tris
+    cdef object points
+    cdef object trilist
+
+    def __cinit__(self,
+                  double[:, ::1] points not None,
+                  unsigned[:, ::1] trilist not None):
+        if points.shape[1] != 2:
+            raise ValueError('Only 2D triangulations are supported')
+        self.points = points
+        self.trilist = trilist
+        p = np.asarray(points)
+        t = p[np.asarray(trilist)]
+        i, ij, ik = t[:, 0], t[:, 1] - t[:, 0], t[:, 2] - t[:, 0]
+        dot_jj = np.einsum('td, td -> t', ij, ij)
+        dot_kk = np.einsum('td, td -> t', ik, ik)
+        dot_jk = np.einsum('td, td -> t', ij, ik)
+        d = 1.0 / (dot_jj * dot_kk - dot_jk * dot_jk)
+        self.tri_vectors = np.ascontiguousarray(np.column_stack(
+            [i, ij, ik, dot_jj, dot_kk, dot_jk, d]))
+        # The bounds are padded slightly, so that points deemed to be inside
+        # a triangle by rounding error still fall within its bounds
+        t_min, t_max = t.min(axis=1), t.max(axis=1)
+        pad = 1e-9 * max(np.abs(p).max() if p.size else 1., 1.)
+        self.tri_bounds = np.ascontiguousarray(
+            np.hstack([t_min - pad, t_max + pad]))
+        self._build_grid()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def _build_grid(self):
+        cdef Py_ssize_t n_tris = self.tri_bounds.shape[0]
+        bounds = np.asarray(self.tri_bounds)
+        if n_tris == 0:
+            origin, extent, cell_size = np.zeros(2), np.zeros(2), 1.
+        else:
+            origin = bounds[:, :2].min(axis=0)
+            extent = bounds[:, 2:].max(axis=0) - origin
+            # Cells roughly the size of the average triangle, so that each
+            # cell overlaps a handful of triangles
+            cell_size = np.mean(np.max(bounds[:, 2:] - bounds[:, :2], axis=1))
+            cell_size = max(cell_size, extent.max() / 4096., 1e-12)
+        self.origin0, self.origin1 = origin
+        self.cell_size = cell_size
+        self.n_rows = int(extent[0] / cell_size) + 1
+        self.n_cols = int(extent[1] / cell_size) + 1
+
+        cdef:
+            Py_ssize_t t, r, c, n_cells = self.n_rows * self.n_cols
+            Py_ssize_t r0, r1, c0, c1
+            int[::1] cell_start = np.zeros(n_cells + 1, dtype=np.int32)
+            int[::1] cell_fill
+            int[::1] cell_tris
+        # Count the triangles overlapping each cell, then fill them in so
+        # that each cell lists its triangles in ascending order
+        for t in range(n_tris):
+            self._cell_range(t, &r0, &r1, &c0, &c1)
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    cell_start[r * self.n_cols + c + 1] += 1
+        for c in range(n_cells):
+            cell_start[c + 1] += cell_start[c]
+        cell_fill = np.array(cell_start[:n_cells], dtype=np.int32)
+        cell_tris = np.empty(cell_start[n_cells], dtype=np.int32)
+        for t in range(n_tris):
+            self._cell_range(t, &r0, &r1, &c0, &c1)
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    cell_tris[cell_fill[r * self.n_cols + c]] = t
+                    cell_fill[r * self.n_cols + c] += 1
+        self.cell_start = cell_start
+        self.cell_tris = cell_tris
+
+    cdef inline Py_ssize_t _cell(self, double x, double origin,
+                                 Py_ssize_t n) nogil:
+        cdef Py_ssize_t i = <Py_ssize_t> ((x - origin) / self.cell_size)
+        return 0 if i < 0 else (n - 1 if i >= n else i)
+
+    cdef inline void _cell_range(self, Py_ssize_t t, Py_ssize_t *r0,
+                                 Py_ssize_t *r1, Py_ssize_t *c0,
+                                 Py_ssize_t *c1) nogil:
+        r0[0] = self._cell(self.tri_bounds[t, 0], self.origin0, self.n_rows)
+        c0[0] = self._cell(self.tri_bounds[t, 1], self.origin1, self.n_cols)
+        r1[0] = self._cell(self.tri_bounds[t, 2], self.origin0, self.n_rows)
+        c1[0] = self._cell(self.tri_bounds[t, 3], self.origin1, self.n_cols)
+
+    def __reduce__(self):
+        r"""
+        Implement the reduction protocol so this object is copyable/picklable
+        """
+        return self.__class__, (np.asarray(self.points),
+                                np.asarray(self.trilist))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _query(self, double[:, ::1] points, int[::1] indexes,
+                     double[::1] alphas, double[::1] betas) nogil:
+        cdef:
+            Py_ssize_t n, k, t, cell
+            double p0, p1, alpha, beta
+        for n in range(points.shape[0]):
+            indexes[n] = -1
+            p0 = points[n, 0]
+            p1 = points[n, 1]
+            if (p0 < self.origin0 or p1 < self.origin1 or
+                    p0 > self.origin0 + self.n_rows * self.cell_size or
+                    p1 > self.origin1 + self.n_cols * self.cell_size):
+                continue
+            cell = (self._cell(p0, self.origin0, self.n_rows) * self.n_cols +
+                    self._cell(p1, self.origin1, self.n_cols))
+            for k in range(self.cell_start[cell], self.cell_start[cell + 1]):
+                t = self.cell_tris[k]
+                if (p0 < self.tri_bounds[t, 0] or p1 < self.tri_bounds[t, 1] or
+                        p0 > self.tri_bounds[t, 2] or
+                        p1 > self.tri_bounds[t, 3]):
+                    continue
+                if _triangle_alpha_beta(self.tri_vectors, t, p0, p1,
+                                        &alpha, &beta):
+                    indexes[n] = t
+                    alphas[n] = alpha
+                    betas[n] = beta
+
+    cdef inline void _rows(self, Py_ssize_t t, Py_ssize_t min0, Py_ssize_t h,
+                           Py_ssize_t *y0, Py_ssize_t *y1) nogil:
+        # The rows (offset by min0 and clipped to [0, h)) that triangle t spans
+        y0[0] = max(<Py_ssize_t> ceil(self.tri_bounds[t, 0]) - min0, 0)
+        y1[0] = min(<Py_ssize_t> floor(self.tri_bounds[t, 2]) - min0, h - 1)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void _row_span(self, Py_ssize_t t, double y, Py_ssize_t min1,
+                        Py_ssize_t w, Py_ssize_t *x0, Py_ssize_t *x1) nogil:
+        # The columns (offset by min1 and clipped to [0, w)) where row y
+        # crosses triangle t, plus a pixel either side to absorb rounding
+        cdef:
+            Py_ssize_t e
+            double a0, a1, b0, b1, lo, hi, cross
+            double v[3][2]
+        v[0][0] = self.tri_vectors[t, 0]
+        v[0][1] = self.tri_vectors[t, 1]
+        v[1][0] = v[0][0] + self.tri_vectors[t, 2]
+        v[1][1] = v[0][1] + self.tri_vectors[t, 3]
+        v[2][0] = v[0][0] + self.tri_vectors[t, 4]
+        v[2][1] = v[0][1] + self.tri_vectors[t, 5]
+        lo = self.tri_bounds[t, 3]
+        hi = self.tri_bounds[t, 1]
+        for e in range(3):
+            a0, a1 = v[e][0], v[e][1]
+            b0, b1 = v[(e + 1) % 3][0], v[(e + 1) % 3][1]
+            if a0 == b0:
+                if a0 == y:
+                    lo = min(lo, min(a1, b1))
+                    hi = max(hi, max(a1, b1))
+            elif min(a0, b0) <= y <= max(a0, b0):
+                cross = a1 + (y - a0) * (b1 - a1) / (b0 - a0)
+                lo = min(lo, cross)
+                hi = max(hi, cross)
+        if lo > hi:
+            # Rounding placed the row just outside every edge
+            lo = self.tri_bounds[t, 1]
+            hi = self.tri_bounds[t, 3]
+        x0[0] = max(<Py_ssize_t> floor(lo) - 1 - min1, 0)
+        x1[0] = min(<Py_ssize_t> ceil(hi) + 1 - min1, w - 1)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _rasterise(self, Py_ssize_t min0, Py_ssize_t min1,
+                         int[:, ::1] labels, double[:, ::1] label_alphas,
+                         double[:, ::1] label_betas) nogil:
+        # Visit the triangles in ascending order, so that the last triangle
+        # containing a pixel wins. Each row of a triangle's bounding box is
+        # limited to the span of the triangle, and each pixel in the span is
+        # tested exactly.
+        cdef:
+            Py_ssize_t t, y, x, y0, y1, x0, x1
+            Py_ssize_t h = labels.shape[0], w = labels.shape[1]
+            double alpha, beta
+        for t in range(self.tri_vectors.shape[0]):
+            self._rows(t, min0, h, &y0, &y1)
+            for y in range(y0, y1 + 1):
+                self._row_span(t, y + min0, min1, w, &x0, &x1)
+                for x in range(x0, x1 + 1):
+                    if _triangle_alpha_beta(self.tri_vectors, t, y + min0,
+                                            x + min1, &alpha, &beta):
+                        labels[y, x] = t
+                        label_alphas[y, x] = alpha
+                        label_betas[y, x] = beta
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def warp_bilinear(self, FLOAT_TYPES[:, :, :] pixels not None,
+                      double[:, ::1] target_vectors not None,
+                      cnp.uint8_t[:, ::1] mask not None,
+                      FLOAT_TYPES[:, :, ::1] out not None,
+                      bint nearest=False, double cval=0.):
+        r"""
+        Warp an image into the frame of the triangulation by scanning the
+        triangles over the pixels of ``mask``. Each pixel is mapped by the
+        affine transform of its triangle to the image, which is sampled there
+        with bilinear interpolation. The GIL is released while warping.
+
+        Parameters
+        ----------
+        pixels : ``(n_channels, M, N)`` `ndarray`
+            The image to sample.
+        target_vectors : ``(n_tris, 6)`` `ndarray`
+            The vertex ``i`` and the vectors ``ij`` and ``ik`` of each
+            triangle in the image.
+        mask : ``(H, W)`` `ndarray`
+            Non-zero for the pixels of the warp that should be sampled.
+        out : ``(n_channels, H, W)`` `ndarray`
+            The array the sampled pixels are written to.
+        nearest : `bool`, optional
+            If ``True``, points outside the image take the value of the
+            nearest pixel. Otherwise they take the value ``cval``.
+        cval : `float`, optional
+            The value of points outside the image, if not ``nearest``.
+
+        Returns
+        -------
+        covered : ``(H, W)`` `ndarray`
+            Non-zero for every pixel that lies in a triangle (and has
+            therefore been written).
+        """
+        cdef:
+            Py_ssize_t t, y, x, c, y0, y1, x0, x1, r0, r1, c0, c1
+            Py_ssize_t h = mask.shape[0], w = mask.shape[1]
+            Py_ssize_t n_channels = pixels.shape[0]
+            Py_ssize_t max0 = pixels.shape[1] - 1, max1 = pixels.shape[2] - 1
+            double alpha, beta, p0, p1, w0, w1
+            cnp.uint8_t[:, ::1] covered = np.zeros((h, w), dtype=np.uint8)
+
+        if (out.shape[0] != n_channels or out.shape[1] != h or
+                out.shape[2] != w):
+            raise ValueError('The output must be of shape '
+                             '(n_channels, mask.shape[0], mask.shape[1]).')
+        if (target_vectors.shape[0] != self.tri_vectors.shape[0] or
+                target_vectors.shape[1] != 6):
+            raise ValueError('The target vectors must be of shape '
+                             '(n_tris, 6).')
+
+        with nogil:
+            for t in range(self.tri_vectors.shape[0]):
+                self._rows(t, 0, h, &y0, &y1)
+                for y in range(y0, y1 + 1):
+                    self._row_span(t, y, 0, w, &x0, &x1)
+                    for x in range(x0, x1 + 1):
+                        if not mask[y, x]:
+                            continue
+                        if not _triangle_alpha_beta(self.tri_vectors, t, y, x,
+                                                    &alpha, &beta):
+                            continue
+                        covered[y, x] = 1
+                        # Matches AbstractPWA._apply
+                        p0 = (target_vectors[t, 0] +
+                              alpha * target_vectors[t, 2] +
+                              beta * target_vectors[t, 4])
+                        p1 = (target_vectors[t, 1] +
+                              alpha * target_vectors[t, 3] +
+                              beta * target_vectors[t, 5])
+                        if nearest:
+                            p0 = min(max(p0, 0), max0)
+                            p1 = min(max(p1, 0), max1)
+                        elif p0 < 0 or p1 < 0 or p0 > max0 or p1 > max1:
+                            for c in range(n_channels):
+                                out[c, y, x] = <FLOAT_TYPES> cval
+                            continue
+                        r0 = <Py_ssize_t> p0
+                        c0 = <Py_ssize_t> p1
+                        r1 = min(r0 + 1, max0)
+                        c1 = min(c0 + 1, max1)
+                        w0 = p0 - r0
+                        w1 = p1 - c0
+                        for c in range(n_channels):
+                            out[c, y, x] = <FLOAT_TYPES> (
+                                (pixels[c, r0, c0] * (1 - w1) +
+                                 pixels[c, r0, c1] * w1) * (1 - w0) +
+                                (pixels[c, r1, c0] * (1 - w1) +
+                                 pixels[c, r1, c1] * w1) * w0)
+        return np.asarray(covered)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def index_alpha_beta(self, double[:, ::1] points not None):
+        r"""
+        Find the triangle containing each point and the point's barycentric
+        coordinates within it.
+
+        Parameters
+        ----------
+        points : ``(n_points, 2)`` `ndarray`
+            The points to find the triangles of.
+
+        Returns
+        -------
+        indexes : ``(n_points,)`` `ndarray`
+            The index of the triangle containing each point, or ``-1`` if the
+            point is not contained in any triangle.
+        alphas : ``(n_points,)`` `ndarray`
+            The alpha of each point in its triangle.
+        betas : ``(n_points,)`` `ndarray`
+            The beta of each point in its triangle.
+        """
+        cdef:
+            Py_ssize_t n, n_points = points.shape[0]
+            Py_ssize_t y, x, min0 = 0, min1 = 0, max0 = 0, max1 = 0
+            bint integral = n_points > 0
+            int[::1] indexes = np.full(n_points, -1, dtype=np.int32)
+            double[::1] alphas = np.zeros(n_points)
+            double[::1] betas = np.zeros(n_points)
+            int[:, ::1] labels
+            double[:, ::1] label_alphas, label_betas
+
+        with nogil:
+            for n in range(n_points):
+                if (points[n, 0] != floor(points[n, 0]) or
+                        points[n, 1] != floor(points[n, 1])):
+                    integral = False
+                    break
+                y = <Py_ssize_t> points[n, 0]
+                x = <Py_ssize_t> points[n, 1]
+                if n == 0:
+                    min0, max0, min1, max1 = y, y, x, x
+                else:
+                    min0, max0 = min(min0, y), max(max0, y)
+                    min1, max1 = min(min1, x), max(max1, x)
+
+        # Rasterising pays off when the points densely cover their bounds
+        if (integral and
+                (max0 - min0 + 1) * (max1 - min1 + 1) <= 4 * n_points):
+            labels = np.full((max0 - min0 + 1, max1 - min1 + 1), -1,
+                             dtype=np.int32)
+            label_alphas = np.zeros((labels.shape[0], labels.shape[1]))
+            label_betas = np.zeros((labels.shape[0], labels.shape[1]))
+            with nogil:
+                self._rasterise(min0, min1, labels, label_alphas, label_betas)
+                for n in range(n_points):
+                    y = <Py_ssize_t> points[n, 0] - min0
+                    x = <Py_ssize_t> points[n, 1] - min1
+                    indexes[n] = labels[y, x]
+                    alphas[n] = label_alphas[y, x]
+                    betas[n] = label_betas[y, x]
+        else:
+            with nogil:
+                self._query(points, indexes, alphas, betas)
+        return np.asarray(indexes), np.asarray(alphas), np.asarray(betas)
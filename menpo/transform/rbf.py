@@ -1,8 +1,33 @@
 import numpy as np
-from scipy.spatial.distance import cdist
 from .base import Transform
 
 
+def _squared_distances(x, c):
+    r"""
+    The squared euclidean distance between every point of ``x`` and every
+    centre of ``c``, accumulated one dimension at a time in double precision.
+    """
+    r2 = np.zeros((x.shape[0], c.shape[0]))
+    diff = np.empty_like(r2)
+    for d in range(c.shape[1]):
+        np.subtract(x[:, d, None], c[None, :, d], out=diff)
+        diff *= diff
+        r2 += diff
+    return r2
+
+
+def _r2_log_r2(r2):
+    r"""
+    :math:`r^2 \log{r^2}` of the given squared distances, computed in place,
+    which is ``0`` where the distance is ``0``.
+    """
+    mask = r2 > 0
+    log_r2 = np.zeros_like(r2)
+    np.log(r2, out=log_r2, where=mask)
+    r2 *= log_r2
+    return r2
+
+
 class RadialBasisFunction(Transform):
     r"""
     Radial Basis Functions are a class of transform that is used by
@@ -86,14 +111,7 @@ class R2LogR2RBF(RadialBasisFunction):
             The basis function applied to each distance,
             :math:`\lVert x - c \rVert`.
         """
-        euclidean_distance = cdist(x, self.c)
-        mask = euclidean_distance == 0
-        with np.errstate(divide='ignore', invalid='ignore'):
-            u = (euclidean_distance ** 2 *
-                 (2 * np.log(euclidean_distance)))
-        # reset singularities to 0
-        u[mask] = 0
-        return u
+        return _r2_log_r2(_squared_distances(x, self.c))
 
 
 class R2LogRRBF(RadialBasisFunction):
@@ -130,10 +148,7 @@ class R2LogRRBF(RadialBasisFunction):
             The basis function applied to each distance,
             :math:`\lVert points - c \rVert`.
         """
-        euclidean_distance = cdist(points, self.c)
-        mask = euclidean_distance == 0
-        with np.errstate(divide='ignore', invalid='ignore'):
-            u = euclidean_distance ** 2 * np.log(euclidean_distance)
-        # reset singularities to 0
-        u[mask] = 0
+        # r^2 log(r) == 0.5 * r^2 log(r^2)
+        u = _r2_log_r2(_squared_distances(points, self.c))
+        u *= 0.5
         return u
@@ -0,0 +1,141 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from pytest import raises
+
+from menpo.shape import PointCloud
+from menpo.transform import (Affine, Similarity, Homogeneous, Rotation,
+                             Translation, UniformScale, HomogeneousBatch,
+                             AlignmentSimilarity, AlignmentRotation,
+                             AlignmentAffine, procrustes_alignment_batch,
+                             rotation_alignment_batch, affine_alignment_batch)
+
+
+def _random_similarities(n):
+    return [UniformScale(s, 2).compose_before(
+                Rotation.init_from_2d_ccw_angle(a)).compose_before(
+                Translation(t))
+            for s, a, t in zip(np.random.rand(n) + 0.5,
+                               np.random.rand(n) * 360,
+                               np.random.randn(n, 2))]
+
+
+def _random_homogeneous(n):
+    h = np.tile(np.eye(3), (n, 1, 1)) + np.random.randn(n, 3, 3) * 0.1
+    return [Homogeneous(m) for m in h]
+
+
+def test_homogeneous_batch_apply_matches_transforms():
+    points = np.random.randn(5, 7, 2)
+    for transforms in [_random_similarities(5), _random_homogeneous(5)]:
+        batch = HomogeneousBatch.init_from_transforms(transforms)
+        expected = np.array([t.apply(p) for t, p in zip(transforms, points)])
+        assert_allclose(batch.apply(points), expected)
+
+
+def test_homogeneous_batch_family():
+    similarities = _random_similarities(3)
+    affines = [Affine(t.h_matrix) for t in similarities]
+    assert (HomogeneousBatch.init_from_transforms(similarities).transform_cls
+            is Similarity)
+    assert (HomogeneousBatch.init_from_transforms(
+        similarities + affines).transform_cls is Affine)
+    assert (HomogeneousBatch.init_from_transforms(
+        affines + _random_homogeneous(1)).transform_cls is Homogeneous)
+
+
+def test_homogeneous_batch_compose():
+    a, b = _random_similarities(4), _random_similarities(4)
+    batch_a = HomogeneousBatch.init_from_transforms(a)
+    batch_b = HomogeneousBatch.init_from_transforms(b)
+    before = batch_a.compose_before(batch_b).to_transforms()
+    after = batch_a.compose_after(b[0])
+    for i in range(4):
+        assert type(before[i]) is Similarity
+        assert_allclose(before[i].h_matrix, a[i].compose_before(b[i]).h_matrix)
+        assert_allclose(after[i].h_matrix, a[i].compose_after(b[0]).h_matrix)
+
+
+def test_homogeneous_batch_pseudoinverse():
+    transforms = _random_homogeneous(4)
+    inverse = HomogeneousBatch.init_from_transforms(transforms).pseudoinverse()
+    for t, t_inv in zip(transforms, inverse.to_transforms()):
+        assert_allclose(t_inv.h_matrix, t.pseudoinverse().h_matrix)
+
+
+def test_homogeneous_batch_vectors_round_trip():
+    similarities = _random_similarities(4)
+    for transforms in [similarities,
+                       [Affine(t.h_matrix) for t in similarities],
+                       _random_homogeneous(4)]:
+        batch = HomogeneousBatch.init_from_transforms(transforms)
+        vectors = batch.as_vectors()
+        assert_allclose(vectors, [t.as_vector() for t in transforms])
+        rebuilt = batch.from_vectors(vectors)
+        assert rebuilt.transform_cls is batch.transform_cls
+        assert_allclose(rebuilt.h_matrices, batch.h_matrices)
+
+
+def test_homogeneous_batch_invalid():
+    batch = HomogeneousBatch.init_identity(3, 2)
+    with raises(ValueError):
+        batch.apply(np.zeros((2, 5, 2)))
+    with raises(ValueError):
+        batch.compose_before(HomogeneousBatch.init_identity(2, 2))
+    with raises(ValueError):
+        HomogeneousBatch(np.eye(3))
+
+
+def _assert_alignments_match(batch, errors, alignments, targets):
+    for h, error, alignment, target in zip(batch.h_matrices, errors,
+                                           alignments, targets):
+        assert_allclose(h, alignment.h_matrix, atol=1e-10)
+        # compare to the given target, which some alignments overwrite
+        assert_allclose(error, np.linalg.norm(
+            target.points - alignment.apply(alignment.source).points))
+
+
+def test_procrustes_alignment_batch():
+    sources = [PointCloud(p) for p in np.random.randn(6, 10, 2)]
+    # include a mirrored source to exercise the Kabsch check
+    sources[0] = PointCloud(sources[1].points * [1, -1])
+    target = PointCloud(np.random.randn(10, 2))
+    for allow_mirror in [False, True]:
+        batch, errors = procrustes_alignment_batch(sources, target,
+                                                   allow_mirror=allow_mirror)
+        assert batch.transform_cls is Similarity
+        _assert_alignments_match(
+            batch, errors, [AlignmentSimilarity(s, target,
+                                                allow_mirror=allow_mirror)
+                            for s in sources], [target] * len(sources))
+
+
+def test_procrustes_alignment_batch_no_rotation():
+    sources = np.random.randn(4, 10, 2)
+    targets = np.random.randn(4, 10, 2)
+    batch, errors = procrustes_alignment_batch(sources, targets,
+                                               rotation=False)
+    pairs = [(PointCloud(s), PointCloud(t)) for s, t in zip(sources, targets)]
+    alignments = [AlignmentSimilarity(s, t, rotation=False) for s, t in pairs]
+    _assert_alignments_match(batch, errors, alignments,
+                             [t for _, t in pairs])
+
+
+def test_rotation_and_affine_alignment_batch():
+    sources = np.random.randn(4, 10, 3)
+    targets = np.random.randn(4, 10, 3)
+    pairs = [(PointCloud(s), PointCloud(t)) for s, t in zip(sources, targets)]
+    batch, errors = rotation_alignment_batch(sources, targets)
+    _assert_alignments_match(batch, errors,
+                             [AlignmentRotation(s, t) for s, t in pairs],
+                             [t for _, t in pairs])
+    batch, errors = affine_alignment_batch(sources, targets)
+    assert batch.transform_cls is Affine
+    _assert_alignments_match(batch, errors,
+                             [AlignmentAffine(s, t) for s, t in pairs],
+                             [t for _, t in pairs])
+
+
+def test_alignment_batch_invalid_targets():
+    with raises(ValueError):
+        procrustes_alignment_batch(np.random.randn(4, 10, 2),
+                                   np.random.randn(3, 10, 2))
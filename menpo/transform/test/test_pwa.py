@@ -1,7 +1,15 @@
-import menpo
+import pickle
+
+import numpy as np
 from numpy.testing import assert_equal
+from pytest import raises
+
+import menpo
+from menpo.image.base import indices_for_image_of_shape
+from menpo.shape import TriMesh
 from menpo.transform.piecewiseaffine.base import (CythonPWA, CachedPWA,
-                                                  PythonPWA)
+                                                  PythonPWA,
+                                                  TriangleContainmentError)
 
 b = menpo.io.import_builtin_asset('breakingbad.jpg').as_masked()
 b = b.crop_to_landmarks_proportion(0.1)
@@ -52,3 +60,49 @@ def test_cached_pwa_forgets_cache():
     # should clear cache and be fine
     r2 = cached_pwa.apply(points)
     assert_equal(r1, r2)
+
+
+def _jittered_mesh():
+    # A dense mesh of ~1000 triangles with irregular interior vertices
+    rs = np.random.RandomState(0)
+    points = np.mgrid[0:100:4, 0:80:4].reshape([2, -1]).T.astype(np.float)
+    interior = np.all((points > 0) & (points < [96, 76]), axis=1)
+    points[interior] += rs.uniform(-1.5, 1.5, size=(interior.sum(), 2))
+    return TriMesh(points)
+
+
+def test_indexed_pwa_same_as_python_pwa_random_points():
+    mesh = _jittered_mesh()
+    points = np.random.RandomState(1).uniform(0, 76, size=(2000, 2))
+    python = PythonPWA(mesh, mesh).index_alpha_beta(points)
+    for pwa in [CachedPWA(mesh, mesh), CythonPWA(mesh, mesh)]:
+        for expected, result in zip(python, pwa.index_alpha_beta(points)):
+            assert_equal(result, expected)
+
+
+def test_indexed_pwa_same_as_python_pwa_pixel_grid():
+    mesh = _jittered_mesh()
+    # Exclude the top and left borders, where rounding places some pixels
+    # outside of the mesh
+    points = indices_for_image_of_shape((95, 75)) + 1.
+    python = PythonPWA(mesh, mesh).index_alpha_beta(points)
+    cached = CachedPWA(mesh, mesh).index_alpha_beta(points)
+    for expected, result in zip(python, cached):
+        assert_equal(result, expected)
+
+
+def test_indexed_pwa_containment_error():
+    mesh = _jittered_mesh()
+    points = np.array([[10., 10.], [-5., 10.], [10., 200.]])
+    with raises(TriangleContainmentError) as e:
+        CachedPWA(mesh, mesh).apply(points)
+    assert_equal(e.value.points_outside_source_domain, [False, True, True])
+
+
+def test_indexed_pwa_copy_and_pickle():
+    mesh = _jittered_mesh()
+    pwa = CythonPWA(mesh, mesh)
+    points = np.array([[10.5, 20.25], [50., 40.]])
+    expected = pwa.apply(points)
+    assert_equal(pwa.copy().apply(points), expected)
+    assert_equal(pickle.loads(pickle.dumps(pwa)).apply(points), expected)
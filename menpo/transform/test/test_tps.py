@@ -67,3 +67,35 @@ def test_tps_apply_batched():
     result = tps.apply(pts, batch_size=2)
     expected = np.array([[-0.2, -2.], [-1., 2.], [4.2, -5.]])
     assert_allclose(result.points, expected)
+
+
+def test_tps_cached_kernel_matches_apply():
+    tps = ThinPlateSplines(src, tgt_perturbed)
+    pts = np.random.rand(50, 2) * 2 - 1
+    tps.cache_kernel(pts)
+    tps.set_target(tgt)
+    cached = tps.apply(pts)
+    tps.cache_kernel(None)
+    assert_allclose(cached, tps.apply(pts))
+
+
+def test_tps_apply_float32():
+    # pixel scale coordinates, where the kernel values are large
+    np.random.seed(0)
+    src = PointCloud(np.random.rand(68, 2) * 800 + 100)
+    tgt = PointCloud(src.points + np.random.randn(68, 2) * 5)
+    tps = ThinPlateSplines(src, tgt)
+    pts = np.indices((100, 100)).reshape(2, -1).T * 10.
+    expected = tps.apply(pts)
+    result = tps.apply(pts.astype(np.float32))
+    assert result.dtype == np.float32
+    assert_allclose(result, expected, rtol=0, atol=1e-3)
+    tps.cache_kernel(pts)
+    assert_allclose(tps.apply(pts), expected, rtol=0, atol=1e-8)
+
+
+def test_tps_set_target_reuses_factorisation():
+    tps = ThinPlateSplines(src, tgt_perturbed)
+    tps.set_target(tgt)
+    expected = ThinPlateSplines(src, tgt)
+    assert_allclose(tps.coefficients, expected.coefficients, atol=1e-12)
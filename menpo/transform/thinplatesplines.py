@@ -3,6 +3,10 @@ from .base import Transform, Alignment, Invertible
 from .rbf import R2LogR2RBF
 
 
+# The maximum number of kernel values evaluated at once by ThinPlateSplines
+_KERNEL_CHUNK_ELEMENTS = 2 ** 21
+
+
 # Note we inherit from Alignment first to get it's n_dims behavior
 class ThinPlateSplines(Alignment, Transform, Invertible):
     r"""
@@ -50,29 +54,91 @@ class ThinPlateSplines(Alignment, Transform, Invertible):
         bot_l = np.concatenate([self.p.T, o], axis=1)
         self.l = np.concatenate([top_l, bot_l], axis=0)
         self.v, self.y, self.coefficients = None, None, None
+        self._inv_l = None
+        self._kernel_cache = None
         self._build_coefficients()
 
-    def _build_coefficients(self):
-        self.v = self.target.points.T.copy()
-        self.y = np.hstack([self.v, np.zeros([2, 3])])
-
+    def _build_inv_l(self):
         # If two points are coincident, or very close to being so, then the
         # matrix is rank deficient and thus not-invertible. Therefore,
         # only take the inverse on the full-rank set of indices.
         _u, _s, _v = np.linalg.svd(self.l)
         keep = _s.shape[0] - sum(_s < self.min_singular_val)
-        inv_l = _u[:, :keep].dot(1.0 / _s[:keep, None] * _v[:keep, :])
-        self.coefficients = inv_l.dot(self.y.T)
+        return _u[:, :keep].dot(1.0 / _s[:keep, None] * _v[:keep, :])
+
+    def _build_coefficients(self):
+        self.v = self.target.points.T.copy()
+        self.y = np.hstack([self.v, np.zeros([2, 3])])
+        # l only depends on the source, so it is factorised once and a new
+        # target only changes the right hand side. TPS pickled before the
+        # factorisation was stored have no _inv_l.
+        if getattr(self, '_inv_l', None) is None:
+            self._inv_l = self._build_inv_l()
+        self.coefficients = self._inv_l.dot(self.y.T)
 
     def _sync_state_from_target(self):
         # now the target is updated, we only have to rebuild the
         # coefficients.
         self._build_coefficients()
 
+    def cache_kernel(self, points):
+        r"""
+        Compute and store the kernel between the given points and the
+        `source`, so that applying this transform to the same points again
+        (for instance, the pixels of a fixed template while the `target`
+        changes during fitting) only requires a matrix product. Only the
+        kernel of the most recent points is stored.
+
+        Parameters
+        ----------
+        points : ``(n_points, 2)`` `ndarray` or ``None``
+            The points that this transform will be repeatedly applied to. If
+            ``None``, any stored kernel is discarded.
+
+        Notes
+        -----
+        The kernel is always stored in double precision. The weights of the
+        kernel sum to zero, so its large values cancel in the product and a
+        single precision kernel loses several pixels of accuracy on image
+        coordinates.
+        """
+        if points is None:
+            self._kernel_cache = None
+            return
+        points = np.array(points, copy=True)
+        kernel = np.empty((points.shape[0], self.n_points))
+        for lo, hi in self._chunks(points.shape[0]):
+            kernel[lo:hi] = self.kernel.apply(points[lo:hi])
+        # The cache is a tuple so that copies of this transform share it
+        self._kernel_cache = (points, kernel)
+
+    def _cached_kernel(self, points):
+        cache = getattr(self, '_kernel_cache', None)
+        if cache is not None:
+            cached_points, kernel = cache
+            if (points is cached_points or
+                    (points.shape == cached_points.shape and
+                     np.array_equal(points, cached_points))):
+                return kernel
+        return None
+
+    def _chunks(self, n_points):
+        # Bound the size of the (chunk, n_centres) kernel evaluated at once
+        chunk_size = max(1, _KERNEL_CHUNK_ELEMENTS // max(1, self.n_points))
+        for lo in range(0, n_points, chunk_size):
+            yield lo, min(lo + chunk_size, n_points)
+
     def _apply(self, points, **kwargs):
         r"""
         Performs a TPS transform on the given points.
 
+        The kernel between the points and the `source` is evaluated in
+        chunks, so that the memory required is bounded regardless of the
+        number of points, unless it has been stored by :meth:`cache_kernel`.
+        The kernel and its product are always computed in double precision,
+        as their large terms cancel, but single precision points produce
+        single precision results.
+
         Parameters
         ----------
         points : ``(N, D)`` `ndarray`
@@ -90,23 +156,28 @@ class ThinPlateSplines(Alignment, Transform, Invertible):
         """
         if points.shape[1] != self.n_dims:
             raise ValueError('TPS can only be applied to 2D data.')
-        x = points[..., 0][:, None]
-        y = points[..., 1][:, None]
-        # calculate the affine coefficients of the warp
-        # (C = Constant component, then X, Y respectively)
-        c_affine_c = self.coefficients[-3]
-        c_affine_x = self.coefficients[-2]
-        c_affine_y = self.coefficients[-1]
-        # the affine warp component
-        f_affine = c_affine_c + c_affine_x * x + c_affine_y * y
-        # calculate a distance matrix (for L2 Norm) between every source
-        # and the target
-        kernel_dist = self.kernel.apply(points)
-        # grab the affine free components of the warp
+        # the affine free (C = Constant component, then X, Y respectively)
+        # and affine coefficients of the warp
         c_affine_free = self.coefficients[:-3]
-        # build the affine free warp component
-        f_affine_free = kernel_dist.dot(c_affine_free)
-        return f_affine + f_affine_free
+        c_affine = self.coefficients[-3:]
+        f = np.empty((points.shape[0], self.n_dims))
+        kernel_dist = self._cached_kernel(points)
+        if kernel_dist is not None:
+            np.dot(kernel_dist, c_affine_free, out=f)
+        else:
+            # calculate a distance matrix (for L2 Norm) between every source
+            # and a chunk of the points at a time
+            for lo, hi in self._chunks(points.shape[0]):
+                kernel_dist = self.kernel.apply(
+                    points[lo:hi].astype(np.float64, copy=False))
+                np.dot(kernel_dist, c_affine_free, out=f[lo:hi])
+        # add the affine warp component
+        f += c_affine[0]
+        f += points[:, :1] * c_affine[1]
+        f += points[:, 1:2] * c_affine[2]
+        if points.dtype == np.float32:
+            f = f.astype(np.float32)
+        return f
 
     @property
     def has_true_inverse(self):
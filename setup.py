@@ -93,6 +93,7 @@ cython_modules = [
                              'menpo/feature/cpp/LBP.cpp']),
     build_extension_from_pyx('menpo/feature/_gradient.pyx'),
     build_extension_from_pyx('menpo/image/patches.pyx'),
+    build_extension_from_pyx('menpo/image/_pyramid.pyx'),
     build_extension_from_pyx('menpo/shape/mesh/normals.pyx')
 ]
 cython_exts = cythonize(cython_modules, quiet=True)